@@ -0,0 +1,51 @@
+"""Add geocoding_cache table for caching geocoded addresses
+
+Revision ID: 20251120_0900
+Revises: 348bc9f930d7
+Create Date: 2025-11-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251120_0900'
+down_revision: Union[str, None] = '348bc9f930d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create geocoding_cache table
+    op.create_table(
+        'geocoding_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('normalized_address', sa.Text(), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=False),
+        sa.Column('longitude', sa.Float(), nullable=False),
+        sa.Column('formatted_address', sa.Text(), nullable=False),
+        sa.Column('place_id', sa.String(length=255), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    # Create indexes
+    op.create_index(op.f('ix_geocoding_cache_id'), 'geocoding_cache', ['id'], unique=False)
+    op.create_index(op.f('ix_geocoding_cache_cache_key'), 'geocoding_cache', ['cache_key'], unique=True)
+    op.create_index(op.f('ix_geocoding_cache_expires_at'), 'geocoding_cache', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    # Drop indexes
+    op.drop_index(op.f('ix_geocoding_cache_expires_at'), table_name='geocoding_cache')
+    op.drop_index(op.f('ix_geocoding_cache_cache_key'), table_name='geocoding_cache')
+    op.drop_index(op.f('ix_geocoding_cache_id'), table_name='geocoding_cache')
+
+    # Drop table
+    op.drop_table('geocoding_cache')
@@ -0,0 +1,36 @@
+"""Replace the B-tree index on location_logs.timestamp with a BRIN index
+
+Revision ID: 20251121_0900
+Revises: 20251120_0900
+Create Date: 2025-11-21 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251121_0900'
+down_revision: Union[str, None] = '20251120_0900'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Pings are appended in timestamp order, so a BRIN index covers the
+    # retention cleanup and recent-ping range scans at a fraction of the size
+    op.drop_index(op.f('ix_location_logs_timestamp'), table_name='location_logs')
+    op.create_index(
+        'ix_location_logs_timestamp_brin',
+        'location_logs',
+        ['timestamp'],
+        unique=False,
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 32}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_location_logs_timestamp_brin', table_name='location_logs', postgresql_using='brin')
+    op.create_index(op.f('ix_location_logs_timestamp'), 'location_logs', ['timestamp'], unique=False)
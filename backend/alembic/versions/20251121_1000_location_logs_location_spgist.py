@@ -0,0 +1,44 @@
+"""Index location_logs.location with SP-GiST instead of GiST
+
+Revision ID: 20251121_1000
+Revises: 20251121_0900
+Create Date: 2025-11-21 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251121_1000'
+down_revision: Union[str, None] = '20251121_0900'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SP-GiST suits a table of overlapping points and is smaller than GiST.
+    # It needs PostGIS >= 3.0 for geography; older servers keep the GiST index.
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1
+                FROM pg_opclass c
+                JOIN pg_am a ON a.oid = c.opcmethod
+                WHERE a.amname = 'spgist' AND c.opcintype = 'geography'::regtype
+            ) THEN
+                CREATE INDEX IF NOT EXISTS ix_location_logs_location_spgist
+                    ON location_logs USING spgist (location);
+                DROP INDEX IF EXISTS idx_location_logs_location;
+            END IF;
+        END
+        $$;
+    """)
+    op.execute("ANALYZE location_logs")
+
+
+def downgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS idx_location_logs_location ON location_logs USING gist (location)")
+    op.execute("DROP INDEX IF EXISTS ix_location_logs_location_spgist")
@@ -0,0 +1,35 @@
+"""Add stored latitude/longitude generated columns to location_logs
+
+Revision ID: 20251121_1100
+Revises: 20251121_1000
+Create Date: 2025-11-21 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251121_1100'
+down_revision: Union[str, None] = '20251121_1000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Computed once on write, so reads fetch plain floats instead of calling ST_X/ST_Y
+    op.add_column(
+        'location_logs',
+        sa.Column('latitude', sa.Float(), sa.Computed('ST_Y(location::geometry)', persisted=True), nullable=True)
+    )
+    op.add_column(
+        'location_logs',
+        sa.Column('longitude', sa.Float(), sa.Computed('ST_X(location::geometry)', persisted=True), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('location_logs', 'longitude')
+    op.drop_column('location_logs', 'latitude')
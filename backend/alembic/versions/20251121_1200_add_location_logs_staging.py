@@ -0,0 +1,39 @@
+"""Add unlogged location_logs_staging table for batched ping ingestion
+
+Revision ID: 20251121_1200
+Revises: 20251121_1100
+Create Date: 2025-11-21 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import geoalchemy2
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251121_1200'
+down_revision: Union[str, None] = '20251121_1100'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Unlogged and without indexes: pings land here cheaply and are moved
+    # into location_logs in large batches by the location log writer
+    op.create_table(
+        'location_logs_staging',
+        sa.Column('vehicle_id', sa.Integer(), nullable=False),
+        sa.Column('location', geoalchemy2.types.Geography(geometry_type='POINT', srid=4326, spatial_index=False), nullable=False),
+        sa.Column('timestamp', sa.DateTime(), nullable=False),
+        sa.Column('speed_kmh', sa.Float(), nullable=True),
+        sa.Column('heading_degrees', sa.Float(), nullable=True),
+        sa.Column('accuracy_meters', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        prefixes=['UNLOGGED']
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('location_logs_staging')
@@ -0,0 +1,158 @@
+"""Partition location_logs by day on timestamp
+
+Revision ID: 20251121_1300
+Revises: 20251121_1200
+Create Date: 2025-11-21 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251121_1300'
+down_revision: Union[str, None] = '20251121_1200'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with LocationTracker.RETENTION_DAYS / PARTITION_PREMAKE_DAYS
+RETENTION_DAYS = 90
+PREMAKE_DAYS = 7
+
+COLUMNS = "id, vehicle_id, location, timestamp, speed_kmh, heading_degrees, accuracy_meters, created_at, updated_at"
+
+
+def _create_indexes() -> None:
+    """Create the location_logs indexes (cascaded to every partition)"""
+    op.create_index('idx_location_logs_vehicle_timestamp', 'location_logs', ['vehicle_id', 'timestamp'], unique=False)
+    op.create_index(op.f('ix_location_logs_id'), 'location_logs', ['id'], unique=False)
+    op.create_index(
+        'ix_location_logs_timestamp_brin',
+        'location_logs',
+        ['timestamp'],
+        unique=False,
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 32}
+    )
+    # Same SP-GiST/GiST choice as 20251121_1000
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1
+                FROM pg_opclass c
+                JOIN pg_am a ON a.oid = c.opcmethod
+                WHERE a.amname = 'spgist' AND c.opcintype = 'geography'::regtype
+            ) THEN
+                CREATE INDEX ix_location_logs_location_spgist ON location_logs USING spgist (location);
+            ELSE
+                CREATE INDEX idx_location_logs_location ON location_logs USING gist (location);
+            END IF;
+        END
+        $$;
+    """)
+
+
+def _detach_old_table() -> None:
+    """Rename location_logs out of the way, freeing its index names and sequence"""
+    op.execute("ALTER TABLE location_logs RENAME TO location_logs_old")
+    op.execute("ALTER TABLE location_logs_old RENAME CONSTRAINT location_logs_pkey TO location_logs_old_pkey")
+    for index_name in (
+        'idx_location_logs_vehicle_timestamp',
+        'ix_location_logs_id',
+        'ix_location_logs_timestamp_brin',
+        'ix_location_logs_location_spgist',
+        'idx_location_logs_location',
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
+    # The id sequence would otherwise be dropped together with the old table
+    op.execute("ALTER SEQUENCE location_logs_id_seq OWNED BY NONE")
+
+
+def upgrade() -> None:
+    # Daily range partitions: retention becomes DROP TABLE of whole days and
+    # time-bounded queries only scan the matching partitions.
+    _detach_old_table()
+
+    # Primary keys of partitioned tables must include the partition key
+    op.execute("""
+        CREATE TABLE location_logs (
+            id integer NOT NULL DEFAULT nextval('location_logs_id_seq'),
+            vehicle_id integer NOT NULL REFERENCES vehicles (id),
+            location geography(POINT, 4326) NOT NULL,
+            timestamp timestamp without time zone NOT NULL,
+            speed_kmh double precision,
+            heading_degrees double precision,
+            accuracy_meters double precision,
+            created_at timestamp without time zone NOT NULL,
+            updated_at timestamp without time zone NOT NULL,
+            latitude double precision GENERATED ALWAYS AS (ST_Y(location::geometry)) STORED,
+            longitude double precision GENERATED ALWAYS AS (ST_X(location::geometry)) STORED,
+            CONSTRAINT location_logs_pkey PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute("ALTER SEQUENCE location_logs_id_seq OWNED BY location_logs.id")
+
+    # Catches rows outside the daily partitions (out-of-retention backfills,
+    # days missed by maintenance) so inserts never fail for a missing day.
+    # Pings too far in the future are rejected by the tracker instead.
+    op.execute("CREATE TABLE location_logs_default PARTITION OF location_logs DEFAULT")
+
+    op.execute(f"""
+        DO $$
+        DECLARE
+            first_day date;
+            partition_day date;
+        BEGIN
+            SELECT GREATEST(
+                COALESCE(MIN(timestamp)::date, current_date),
+                current_date - {RETENTION_DAYS}
+            ) INTO first_day FROM location_logs_old;
+
+            FOR partition_day IN
+                SELECT generate_series(first_day, current_date + {PREMAKE_DAYS}, interval '1 day')::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF location_logs FOR VALUES FROM (%L) TO (%L)',
+                    'location_logs_' || to_char(partition_day, 'YYYYMMDD'), partition_day, partition_day + 1
+                );
+            END LOOP;
+        END
+        $$;
+    """)
+
+    _create_indexes()
+
+    op.execute(f"INSERT INTO location_logs ({COLUMNS}) SELECT {COLUMNS} FROM location_logs_old")
+    op.execute("DROP TABLE location_logs_old")
+    op.execute("ANALYZE location_logs")
+
+
+def downgrade() -> None:
+    _detach_old_table()
+
+    op.execute("""
+        CREATE TABLE location_logs (
+            id integer NOT NULL DEFAULT nextval('location_logs_id_seq'),
+            vehicle_id integer NOT NULL REFERENCES vehicles (id),
+            location geography(POINT, 4326) NOT NULL,
+            timestamp timestamp without time zone NOT NULL,
+            speed_kmh double precision,
+            heading_degrees double precision,
+            accuracy_meters double precision,
+            created_at timestamp without time zone NOT NULL,
+            updated_at timestamp without time zone NOT NULL,
+            latitude double precision GENERATED ALWAYS AS (ST_Y(location::geometry)) STORED,
+            longitude double precision GENERATED ALWAYS AS (ST_X(location::geometry)) STORED,
+            CONSTRAINT location_logs_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute("ALTER SEQUENCE location_logs_id_seq OWNED BY location_logs.id")
+
+    op.execute(f"INSERT INTO location_logs ({COLUMNS}) SELECT {COLUMNS} FROM location_logs_old")
+    # Dropping the partitioned parent drops every partition with it
+    op.execute("DROP TABLE location_logs_old")
+
+    _create_indexes()
+    op.execute("ANALYZE location_logs")
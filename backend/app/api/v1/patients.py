@@ -19,7 +19,7 @@ from app.schemas.patient import (
 )
 from app.schemas.common import MessageResponse
 from app.services.patient_service import PatientService
-from app.services.geocoding.geocoding_service import GeocodingService
+from app.services.geocoding.geocoding_service import GeocodingService, get_geocoding_service
 
 router = APIRouter(prefix="/patients", tags=["patients"])
 
@@ -27,7 +27,8 @@ router = APIRouter(prefix="/patients", tags=["patients"])
 @router.post("/geocode-preview", response_model=GeocodePreviewResponse)
 async def geocode_address_preview(
     request: GeocodePreviewRequest,
-    current_user: User = Depends(require_admin_or_clinical)
+    current_user: User = Depends(require_admin_or_clinical),
+    geocoding_service: GeocodingService = Depends(get_geocoding_service)
 ):
     """
     Preview geocoding results for an address without saving
@@ -37,8 +38,6 @@ async def geocode_address_preview(
 
     Requires: Admin or Clinical Team role
     """
-    geocoding_service = GeocodingService()
-
     try:
         result = await geocoding_service.geocode_address(
             address=request.address,
@@ -3,6 +3,7 @@ GPS Tracking API Endpoints
 Handles location uploads, WebSocket subscriptions, and real-time updates
 """
 from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, date
@@ -32,10 +33,11 @@ from app.services.tracking import (
 from app.core.exceptions import NotFoundError, ValidationError
 
 
-router = APIRouter(prefix="/tracking", tags=["tracking"])
+# Location payloads are high-volume, so responses are encoded with orjson
+router = APIRouter(prefix="/tracking", tags=["tracking"], default_response_class=ORJSONResponse)
 
 
-@router.post("/location", response_model=LocationResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/location", response_model=LocationResponse, status_code=status.HTTP_202_ACCEPTED)
 async def upload_location(
     location: LocationUpload,
     vehicle_id: int = Query(..., description="Vehicle ID"),
@@ -45,6 +47,9 @@ async def upload_location(
     """
     Upload GPS location for a vehicle.
 
+    The ping is validated and queued for a batched insert; the returned
+    location has no id until it is written.
+
     **Rate limit:** 120 requests per minute per vehicle
 
     **Permissions:** Clinical Team members only
@@ -60,8 +65,8 @@ async def upload_location(
     tracker = LocationTracker(db)
 
     try:
-        # Record location
-        location_log = tracker.record_location(
+        # Queue location for the background writer
+        location_dict = tracker.enqueue_location(
             vehicle_id=vehicle_id,
             latitude=location.latitude,
             longitude=location.longitude,
@@ -71,9 +76,6 @@ async def upload_location(
             timestamp=location.timestamp
         )
 
-        # Convert to response format
-        location_dict = tracker.get_location_as_dict(location_log)
-
         # Broadcast to WebSocket subscribers
         await connection_manager.broadcast_location_update(
             vehicle_id=vehicle_id,
@@ -177,8 +179,12 @@ async def get_active_routes(
         vehicle_id=vehicle_id
     )
 
+    # Visit totals come from one grouped query instead of loading route.visits per route
+    visit_counts = route_tracker.get_visit_status_counts(route.id for route in routes)
+
     result = []
     for route in routes:
+        counts = visit_counts.get(route.id, {})
         result.append({
             "id": route.id,
             "vehicle_id": route.vehicle_id,
@@ -187,8 +193,8 @@ async def get_active_routes(
             "status": route.status.value,
             "total_distance_km": route.total_distance_km,
             "total_duration_minutes": route.total_duration_minutes,
-            "total_visits": len(route.visits),
-            "completed_visits": sum(1 for v in route.visits if v.status == VisitStatus.COMPLETED)
+            "total_visits": sum(counts.values()),
+            "completed_visits": counts.get(VisitStatus.COMPLETED, 0)
         })
 
     return result
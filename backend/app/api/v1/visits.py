@@ -195,8 +195,9 @@ async def get_my_upcoming_visit(
     if visit.status == VisitStatus.EN_ROUTE and route:
         try:
             eta_calculator = ETACalculator(db)
-            eta_data = await eta_calculator.calculate_eta(route.vehicle_id, visit.id)
-            eta_minutes = eta_data.get("eta_minutes")
+            eta_details = eta_calculator.calculate_eta_with_details(visit.id, route.vehicle_id)
+            if eta_details:
+                eta_minutes = round(eta_details["buffered_duration_minutes"])
         except Exception as e:
             logger.warning(f"Failed to calculate ETA for visit {visit.id}: {e}")
 
@@ -13,23 +13,38 @@ from fastapi.responses import JSONResponse
 from app.api.v1 import api_router
 from app.core.config import settings
 from app.core.exceptions import SORHDException
+from app.services.audit_service import audit_log_writer
+from app.services.geocoding.geocoding_service import get_geocoding_service
+from app.services.tracking.location_tracker import location_log_writer, partition_maintenance_task
 from app.services.tracking.websocket_manager import keep_alive_task
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events"""
-    # Startup: Start WebSocket keep-alive task
+    # Startup: Start WebSocket keep-alive and partition maintenance tasks and
+    # background audit/location writers
     task = asyncio.create_task(keep_alive_task())
+    maintenance_task = asyncio.create_task(partition_maintenance_task())
+    audit_log_writer.start()
+    location_log_writer.start()
 
     yield
 
-    # Shutdown: Cancel keep-alive task
-    task.cancel()
-    try:
-        await task
-    except asyncio.CancelledError:
-        pass
+    # Shutdown: Cancel background tasks
+    for background_task in (task, maintenance_task):
+        background_task.cancel()
+        try:
+            await background_task
+        except asyncio.CancelledError:
+            pass
+
+    # Flush queued audit entries and GPS pings before exiting
+    await asyncio.to_thread(audit_log_writer.stop)
+    await asyncio.to_thread(location_log_writer.stop)
+
+    # Close pooled geocoding connections
+    await get_geocoding_service().aclose()
 
 
 app = FastAPI(
@@ -12,6 +12,7 @@ from app.models.tracking import LocationLog
 from app.models.notification import Notification, NotificationType, NotificationChannel, NotificationStatus
 from app.models.audit import AuditLog, AuditAction
 from app.models.distance_cache import DistanceCache
+from app.models.geocoding_cache import GeocodingCache
 from app.models.optimization_metrics import OptimizationMetrics
 
 __all__ = [
@@ -55,6 +56,8 @@ __all__ = [
     "AuditAction",
     # Distance Cache
     "DistanceCache",
+    # Geocoding Cache
+    "GeocodingCache",
     # Optimization Metrics
     "OptimizationMetrics",
 ]
@@ -1,9 +1,9 @@
 """
 Case and CareType Models
 """
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum as SQLEnum, DateTime, Text, Float
-from sqlalchemy.orm import relationship
-from geoalchemy2 import Geography
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum as SQLEnum, DateTime, Text, Float, cast, func
+from sqlalchemy.orm import column_property, relationship
+from geoalchemy2 import Geography, Geometry
 import enum
 
 from app.models.base import BaseModel
@@ -80,6 +80,15 @@ class Case(BaseModel):
     notes = Column(Text, nullable=True)
     estimated_duration_minutes = Column(Integer, nullable=True)
 
+    # Coordinates computed by PostGIS; deferred so that only the ETA and delay
+    # queries, which undefer the "coordinates" group, pay for ST_X/ST_Y
+    latitude = column_property(
+        func.ST_Y(cast(location, Geometry(geometry_type="POINT", srid=4326))), deferred=True, group="coordinates"
+    )
+    longitude = column_property(
+        func.ST_X(cast(location, Geometry(geometry_type="POINT", srid=4326))), deferred=True, group="coordinates"
+    )
+
     # Relationships
     patient = relationship("Patient", back_populates="cases")
     care_type = relationship("CareType", back_populates="cases")
@@ -0,0 +1,38 @@
+"""
+Geocoding Cache Model
+"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text
+
+from .base import BaseModel
+
+
+class GeocodingCache(BaseModel):
+    """
+    Cache table for storing geocoded addresses.
+    Reduces API calls to the external geocoding provider.
+    """
+    __tablename__ = "geocoding_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(64), unique=True, nullable=False, index=True)
+
+    # Normalized address the key was derived from (kept for debugging)
+    normalized_address = Column(Text, nullable=False)
+
+    # Geocoding result
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    formatted_address = Column(Text, nullable=False)
+    place_id = Column(String(255), nullable=True)
+
+    # Metadata
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<GeocodingCache(cache_key={self.cache_key}, address={self.normalized_address})>"
+
+    @property
+    def is_expired(self) -> bool:
+        """Check if cache entry is expired."""
+        return datetime.utcnow() > self.expires_at
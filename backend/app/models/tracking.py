@@ -1,11 +1,12 @@
 """
 GPS Tracking Model
 """
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Float, Index
+from sqlalchemy import Column, Computed, Integer, ForeignKey, DateTime, Float, Index, Table
 from sqlalchemy.orm import relationship
 from geoalchemy2 import Geography
 from datetime import datetime
 
+from app.core.database import Base
 from app.models.base import BaseModel
 
 
@@ -13,21 +14,52 @@ class LocationLog(BaseModel):
     """Location log model - GPS tracking"""
     __tablename__ = "location_logs"
 
-    id = Column(Integer, primary_key=True, index=True)
+    # location_logs is range-partitioned by day on timestamp, and the primary
+    # key of a partitioned table must include the partition key
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     vehicle_id = Column(Integer, ForeignKey("vehicles.id"), nullable=False)
-    location = Column(Geography(geometry_type="POINT", srid=4326), nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    location = Column(Geography(geometry_type="POINT", srid=4326, spatial_index=False), nullable=False)
+    timestamp = Column(DateTime, primary_key=True, default=datetime.utcnow, nullable=False)
     speed_kmh = Column(Float, nullable=True)
     heading_degrees = Column(Float, nullable=True)
     accuracy_meters = Column(Float, nullable=True)
 
+    # Coordinates stored by PostgreSQL on write, so reads need no ST_X/ST_Y call
+    latitude = Column(Float, Computed("ST_Y(location::geometry)", persisted=True))
+    longitude = Column(Float, Computed("ST_X(location::geometry)", persisted=True))
+
     # Relationships
     vehicle = relationship("Vehicle")
 
     # Index for efficient geospatial queries
     __table_args__ = (
+        # SP-GiST suits many overlapping points (geography support needs PostGIS >= 3.0)
+        Index('ix_location_logs_location_spgist', 'location', postgresql_using='spgist'),
         Index('idx_location_logs_vehicle_timestamp', 'vehicle_id', 'timestamp'),
+        # Pings are appended in timestamp order, which suits a BRIN index
+        Index(
+            'ix_location_logs_timestamp_brin', 'timestamp',
+            postgresql_using='brin', postgresql_with={'pages_per_range': 32}
+        ),
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
     )
 
     def __repr__(self):
         return f"<LocationLog(id={self.id}, vehicle_id={self.vehicle_id}, timestamp={self.timestamp})>"
+
+
+# Unlogged, unindexed landing table for batched pings. LocationLogWriter
+# inserts here and periodically moves the rows into location_logs, so the
+# main table's indexes are updated in large batches off the insert path.
+location_logs_staging = Table(
+    "location_logs_staging",
+    Base.metadata,
+    Column("vehicle_id", Integer, nullable=False),
+    Column("location", Geography(geometry_type="POINT", srid=4326, spatial_index=False), nullable=False),
+    Column("timestamp", DateTime, nullable=False),
+    Column("speed_kmh", Float, nullable=True),
+    Column("heading_degrees", Float, nullable=True),
+    Column("accuracy_meters", Float, nullable=True),
+    Column("created_at", DateTime, default=datetime.utcnow, nullable=False),
+    prefixes=["UNLOGGED"],
+)
@@ -5,7 +5,7 @@ Provides common CRUD operations for all entities
 
 from typing import TypeVar, Generic, Type, Optional, List, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import select, update, delete, func
+from sqlalchemy import select, update, delete, func, text
 
 from app.models.base import Base
 
@@ -20,6 +20,9 @@ class BaseRepository(Generic[ModelType]):
     Repositories for specific entities should inherit from this class.
     """
 
+    # Below this many rows count_estimate() returns an exact count
+    ESTIMATE_COUNT_THRESHOLD = 100_000
+
     def __init__(self, model: Type[ModelType], db: Session):
         """
         Initialize repository with model class and database session
@@ -111,6 +114,28 @@ class BaseRepository(Generic[ModelType]):
         result = self.db.execute(stmt)
         return result.scalar_one()
 
+    def count_estimate(self) -> int:
+        """
+        Approximate total number of records
+
+        On PostgreSQL, reads the planner estimate from pg_class instead of
+        scanning the table. Falls back to an exact count on other databases
+        and for tables below ESTIMATE_COUNT_THRESHOLD rows (or never analyzed),
+        where the estimate is unreliable and COUNT(*) is cheap anyway.
+
+        Returns:
+            Estimated number of records
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            estimate = self.db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                {"table": self.model.__tablename__}
+            ).scalar()
+            if estimate is not None and estimate >= self.ESTIMATE_COUNT_THRESHOLD:
+                return int(estimate)
+
+        return self.count()
+
     def update(self, id: int, obj_in: Dict[str, Any]) -> Optional[ModelType]:
         """
         Update a record
@@ -124,6 +149,8 @@ class BaseRepository(Generic[ModelType]):
         """
         # Remove None values from update dict
         obj_in = {k: v for k, v in obj_in.items() if v is not None}
+        if not obj_in:
+            return self.get_by_id(id)
 
         stmt = (
             update(self.model)
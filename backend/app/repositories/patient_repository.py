@@ -2,9 +2,9 @@
 Patient Repository
 """
 
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import select, or_
+from sqlalchemy import select, insert, or_
 
 from app.repositories.base import BaseRepository
 from app.models.patient import Patient
@@ -72,3 +72,21 @@ class PatientRepository(BaseRepository[Patient]):
         stmt = select(Patient).where(Patient.email == email)
         result = self.db.execute(stmt)
         return result.scalar_one_or_none()
+
+    def bulk_create(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """
+        Insert many patients in one statement
+
+        Args:
+            rows: Dictionaries with patient attributes
+
+        Returns:
+            IDs of the created patients, in the same order as rows
+        """
+        if not rows:
+            return []
+
+        stmt = insert(Patient).returning(Patient.id, sort_by_parameter_order=True)
+        ids = list(self.db.scalars(stmt, rows).all())
+        self.db.commit()
+        return ids
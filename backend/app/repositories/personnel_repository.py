@@ -2,9 +2,10 @@
 Personnel Repository
 """
 
-from typing import Optional, List
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select
+from typing import Optional, List, Dict, Any
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import select, insert, any_, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from app.repositories.base import BaseRepository
 from app.models.personnel import Personnel, Skill, PersonnelSkill
@@ -63,7 +64,9 @@ class PersonnelRepository(BaseRepository[Personnel]):
         Returns:
             List of personnel with skills
         """
-        stmt = select(Personnel).options(joinedload(Personnel.skills))
+        # selectinload fetches all skills for the page in one extra IN query,
+        # so OFFSET/LIMIT apply to personnel rows rather than joined skill rows
+        stmt = select(Personnel).options(selectinload(Personnel.skills))
 
         # Filter by active status
         if is_active is not None:
@@ -77,6 +80,34 @@ class PersonnelRepository(BaseRepository[Personnel]):
         result = self.db.execute(stmt)
         return list(result.scalars().unique().all())
 
+    def bulk_create(self, rows: List[Dict[str, Any]], skill_ids: List[List[int]]) -> List[int]:
+        """
+        Insert many personnel and their skills with one statement each
+
+        Args:
+            rows: Dictionaries with personnel attributes
+            skill_ids: Skill IDs for each row, aligned with rows
+
+        Returns:
+            IDs of the created personnel, in the same order as rows
+        """
+        if not rows:
+            return []
+
+        stmt = insert(Personnel).returning(Personnel.id, sort_by_parameter_order=True)
+        ids = list(self.db.scalars(stmt, rows).all())
+
+        skill_rows = [
+            {"personnel_id": personnel_id, "skill_id": skill_id}
+            for personnel_id, row_skill_ids in zip(ids, skill_ids)
+            for skill_id in dict.fromkeys(row_skill_ids)
+        ]
+        if skill_rows:
+            self.db.execute(insert(PersonnelSkill), skill_rows)
+
+        self.db.commit()
+        return ids
+
     def add_skill(self, personnel_id: int, skill_id: int) -> bool:
         """
         Add a skill to personnel
@@ -139,9 +170,6 @@ class PersonnelRepository(BaseRepository[Personnel]):
             skill_ids: List of skill IDs
         """
         # Delete existing skills
-        self.db.execute(
-            select(PersonnelSkill).where(PersonnelSkill.personnel_id == personnel_id)
-        )
         self.db.query(PersonnelSkill).filter(PersonnelSkill.personnel_id == personnel_id).delete()
 
         # Add new skills
@@ -182,6 +210,12 @@ class SkillRepository(BaseRepository[Skill]):
         Returns:
             List of skills
         """
-        stmt = select(Skill).where(Skill.id.in_(skill_ids))
+        if self.db.get_bind().dialect.name == "postgresql":
+            # Bind the IDs as one array parameter so the statement text is the
+            # same for every list length (an IN list renders one placeholder per ID)
+            ids_param = bindparam("skill_ids", value=list(skill_ids), type_=ARRAY(Integer))
+            stmt = select(Skill).where(Skill.id == any_(ids_param))
+        else:
+            stmt = select(Skill).where(Skill.id.in_(skill_ids))
         result = self.db.execute(stmt)
         return list(result.scalars().all())
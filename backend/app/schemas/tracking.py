@@ -30,8 +30,8 @@ class LocationUpload(BaseModel):
 
 
 class LocationResponse(BaseModel):
-    """Schema for location response"""
-    id: int
+    """Schema for location response (id is None while the ping is queued)"""
+    id: Optional[int]
     vehicle_id: int
     latitude: float
     longitude: float
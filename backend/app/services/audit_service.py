@@ -3,12 +3,13 @@ Audit Logging Service
 Tracks all mutations (create, update, delete) for compliance and debugging
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from sqlalchemy.orm import Session
 from datetime import datetime, date
 import json
 
 from app.models.audit import AuditLog
+from app.utils.batch_writer import BatchInsertWriter
 
 
 def serialize_for_audit(obj: Any) -> Any:
@@ -34,6 +35,22 @@ def serialize_for_audit(obj: Any) -> Any:
         return obj
 
 
+class AuditLogWriter(BatchInsertWriter):
+    """
+    Background writer that batches audit log inserts off the request path.
+
+    Rows are queued by AuditService. While the writer is not running,
+    AuditService writes inline with the caller's session.
+    """
+
+    model = AuditLog
+    thread_name = "audit-log-writer"
+
+
+# Process-wide writer, started and stopped by the application lifespan
+audit_log_writer = AuditLogWriter()
+
+
 class AuditService:
     """Service for audit logging"""
 
@@ -48,10 +65,13 @@ class AuditService:
         user_id: Optional[int],
         changes: Optional[Dict[str, Any]] = None,
         ip_address: Optional[str] = None
-    ) -> AuditLog:
+    ) -> Optional[AuditLog]:
         """
         Log an audit action
 
+        When the background audit_log_writer is running the entry is queued
+        and written asynchronously; otherwise it is inserted immediately.
+
         Args:
             entity_type: Type of entity (e.g., "personnel", "vehicle")
             entity_id: ID of the entity
@@ -61,7 +81,7 @@ class AuditService:
             ip_address: IP address of the request
 
         Returns:
-            Created audit log entry
+            Created audit log entry, or None if it was queued
         """
         # Convert changes dict to JSON string, handling date/datetime objects
         changes_json = None
@@ -69,15 +89,21 @@ class AuditService:
             serialized_changes = serialize_for_audit(changes)
             changes_json = json.dumps(serialized_changes)
 
-        audit_log = AuditLog(
-            entity_type=entity_type,
-            entity_id=entity_id,
-            action=action,
-            user_id=user_id,
-            changes=changes_json,
-            ip_address=ip_address,
-            timestamp=datetime.utcnow()
-        )
+        row = {
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "action": action,
+            "user_id": user_id,
+            "changes": changes_json,
+            "ip_address": ip_address,
+            "timestamp": datetime.utcnow()
+        }
+
+        if audit_log_writer.is_running:
+            audit_log_writer.enqueue(row)
+            return None
+
+        audit_log = AuditLog(**row)
         self.db.add(audit_log)
         self.db.commit()
         self.db.refresh(audit_log)
@@ -89,10 +115,40 @@ class AuditService:
         entity_id: int,
         user_id: Optional[int],
         ip_address: Optional[str] = None
-    ) -> AuditLog:
+    ) -> Optional[AuditLog]:
         """Log a create action"""
         return self.log_action(entity_type, entity_id, "create", user_id, ip_address=ip_address)
 
+    def log_create_bulk(
+        self,
+        entity_type: str,
+        entity_ids: List[int],
+        user_id: Optional[int],
+        ip_address: Optional[str] = None
+    ) -> None:
+        """Log a create action for many entities with a single commit"""
+        timestamp = datetime.utcnow()
+        rows = [
+            {
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "action": "create",
+                "user_id": user_id,
+                "changes": None,
+                "ip_address": ip_address,
+                "timestamp": timestamp
+            }
+            for entity_id in entity_ids
+        ]
+
+        if audit_log_writer.is_running:
+            for row in rows:
+                audit_log_writer.enqueue(row)
+            return
+
+        self.db.add_all([AuditLog(**row) for row in rows])
+        self.db.commit()
+
     def log_update(
         self,
         entity_type: str,
@@ -100,7 +156,7 @@ class AuditService:
         user_id: Optional[int],
         changes: Dict[str, Any],
         ip_address: Optional[str] = None
-    ) -> AuditLog:
+    ) -> Optional[AuditLog]:
         """Log an update action"""
         return self.log_action(entity_type, entity_id, "update", user_id, changes, ip_address)
 
@@ -110,6 +166,6 @@ class AuditService:
         entity_id: int,
         user_id: Optional[int],
         ip_address: Optional[str] = None
-    ) -> AuditLog:
+    ) -> Optional[AuditLog]:
         """Log a delete action"""
         return self.log_action(entity_type, entity_id, "delete", user_id, ip_address=ip_address)
@@ -13,11 +13,12 @@ from app.schemas.common import LocationSchema
 from app.models.case import Case
 from app.core.exceptions import NotFoundException, ValidationException
 from app.services.audit_service import AuditService
+from app.services.location_mixin import LocationMixin
 from app.services.patient_service import PatientService
 from app.services.care_type_service import CareTypeService
 
 
-class CaseService:
+class CaseService(LocationMixin):
     """Service for Case business logic"""
 
     def __init__(self, db: Session):
@@ -27,15 +28,6 @@ class CaseService:
         self.care_type_service = CareTypeService(db)
         self.audit_service = AuditService(db)
 
-    def _location_to_wkt(self, location: LocationSchema) -> str:
-        """Convert LocationSchema to WKT Point"""
-        return f"POINT({location.longitude} {location.latitude})"
-
-    def _wkt_to_location(self, wkt: str) -> LocationSchema:
-        """Convert WKT Point to LocationSchema"""
-        coords = wkt.replace("POINT(", "").replace(")", "").split()
-        return LocationSchema(longitude=float(coords[0]), latitude=float(coords[1]))
-
     def create_case(
         self,
         case_in: CaseCreate,
@@ -71,7 +63,7 @@ class CaseService:
 
         # Convert location to WKT
         if isinstance(location, LocationSchema):
-            location_wkt = self._location_to_wkt(location)
+            location_wkt = self._location_to_point(location)
         else:
             # location is already WKT from patient
             location_wkt = location
@@ -217,7 +209,7 @@ class CaseService:
 
         # Convert location if provided
         if case_in.location:
-            update_dict["location"] = self._location_to_wkt(case_in.location)
+            update_dict["location"] = self._location_to_point(case_in.location)
 
         # Convert scheduled_date (date) to datetime
         if "scheduled_date" in update_dict and isinstance(update_dict["scheduled_date"], date):
@@ -156,6 +156,55 @@ class DistanceService:
         )
         return matrix.get_travel_time(0, 1)
 
+    def get_travel_times(
+        self,
+        origin: Location,
+        destinations: List[Location]
+    ) -> List[TravelTime]:
+        """
+        Estimate travel from one origin to many destinations in one pass.
+
+        Synchronous callers (ETA and delay checks) cannot await the network
+        providers, so this uses the Haversine fallback's great-circle estimate,
+        computed for all destinations at once.
+
+        Args:
+            origin: Starting location
+            destinations: Destination locations
+
+        Returns:
+            TravelTime objects aligned with destinations
+        """
+        if not destinations:
+            return []
+
+        provider = self.providers[-1]
+        distances = provider.distances_from(origin, destinations)
+        durations = distances / provider.average_speed_ms
+
+        return [
+            TravelTime(
+                origin=origin,
+                destination=destination,
+                distance_meters=float(distance),
+                duration_seconds=float(duration)
+            )
+            for destination, distance, duration in zip(destinations, distances, durations)
+        ]
+
+    def get_travel_time(self, origin: Location, destination: Location) -> TravelTime:
+        """
+        Estimate travel between two locations (see get_travel_times).
+
+        Args:
+            origin: Starting location
+            destination: Ending location
+
+        Returns:
+            TravelTime object
+        """
+        return self.get_travel_times(origin, [destination])[0]
+
     async def get_provider_status(self) -> dict:
         """
         Get status of all available providers.
@@ -1,8 +1,9 @@
 """
 Google Maps Distance Matrix API provider.
 """
+import asyncio
 import os
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 import aiohttp
 from .base import DistanceProvider
 from ..models import Location, DistanceMatrix
@@ -16,6 +17,11 @@ class GoogleMapsProvider(DistanceProvider):
 
     BASE_URL = "https://maps.googleapis.com/maps/api/distancematrix/json"
 
+    # The API accepts at most 100 elements (origins x destinations) per request,
+    # so larger matrices are requested as BLOCK_SIZE x BLOCK_SIZE blocks
+    BLOCK_SIZE = 10
+    MAX_CONCURRENT_REQUESTS = 10
+
     def __init__(self, api_key: Optional[str] = None):
         super().__init__("google_maps")
         self.api_key = api_key or os.getenv("GOOGLE_MAPS_API_KEY")
@@ -47,71 +53,20 @@ class GoogleMapsProvider(DistanceProvider):
                 provider=self.name
             )
 
-        # Format locations as "lat,lng|lat,lng|..."
-        location_str = "|".join([f"{loc.latitude},{loc.longitude}" for loc in locations])
-
         params = {
-            "origins": location_str,
-            "destinations": location_str,
             "mode": "driving",
             "key": self.api_key,
             "units": "metric"
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.BASE_URL, params=params) as response:
-                if response.status != 200:
-                    raise Exception(f"Google Maps API returned status {response.status}")
-
-                data = await response.json()
+        distances_meters, durations_seconds = await self._fetch_matrix(locations, params, use_traffic=False)
 
-                if data.get("status") != "OK":
-                    error_msg = data.get("error_message", data.get("status"))
-                    raise Exception(f"Google Maps API error: {error_msg}")
-
-                # Parse response
-                rows = data.get("rows", [])
-                if len(rows) != len(locations):
-                    raise Exception(f"Expected {len(locations)} rows, got {len(rows)}")
-
-                distances_meters = []
-                durations_seconds = []
-
-                for i, row in enumerate(rows):
-                    elements = row.get("elements", [])
-                    if len(elements) != len(locations):
-                        raise Exception(f"Expected {len(locations)} elements in row {i}, got {len(elements)}")
-
-                    dist_row = []
-                    dur_row = []
-
-                    for j, element in enumerate(elements):
-                        status = element.get("status")
-
-                        if status == "ZERO_RESULTS" and i == j:
-                            # Same origin and destination
-                            dist_row.append(0.0)
-                            dur_row.append(0.0)
-                        elif status == "OK":
-                            distance = element.get("distance", {}).get("value", 0)  # meters
-                            duration = element.get("duration", {}).get("value", 0)  # seconds
-                            dist_row.append(float(distance))
-                            dur_row.append(float(duration))
-                        else:
-                            # Handle errors (NOT_FOUND, ZERO_RESULTS, etc.)
-                            # Use a large number to indicate unreachable
-                            dist_row.append(float('inf'))
-                            dur_row.append(float('inf'))
-
-                    distances_meters.append(dist_row)
-                    durations_seconds.append(dur_row)
-
-                return DistanceMatrix(
-                    locations=locations,
-                    distances_meters=distances_meters,
-                    durations_seconds=durations_seconds,
-                    provider=self.name
-                )
+        return DistanceMatrix(
+            locations=locations,
+            distances_meters=distances_meters,
+            durations_seconds=durations_seconds,
+            provider=self.name
+        )
 
     async def calculate_with_traffic(self, locations: List[Location], departure_time: Optional[int] = None) -> DistanceMatrix:
         """
@@ -127,11 +82,7 @@ class GoogleMapsProvider(DistanceProvider):
         if not locations:
             raise ValueError("Locations list cannot be empty")
 
-        location_str = "|".join([f"{loc.latitude},{loc.longitude}" for loc in locations])
-
         params = {
-            "origins": location_str,
-            "destinations": location_str,
             "mode": "driving",
             "key": self.api_key,
             "units": "metric",
@@ -139,48 +90,118 @@ class GoogleMapsProvider(DistanceProvider):
             "traffic_model": "best_guess"
         }
 
+        distances_meters, durations_seconds = await self._fetch_matrix(locations, params, use_traffic=True)
+
+        return DistanceMatrix(
+            locations=locations,
+            distances_meters=distances_meters,
+            durations_seconds=durations_seconds,
+            provider=f"{self.name}_traffic"
+        )
+
+    async def _fetch_matrix(
+        self,
+        locations: List[Location],
+        params: Dict[str, Any],
+        use_traffic: bool
+    ) -> tuple[List[List[float]], List[List[float]]]:
+        """
+        Fetch the full matrix as concurrent BLOCK_SIZE x BLOCK_SIZE requests.
+
+        Args:
+            locations: List of Location objects (used as both origins and destinations)
+            params: Query parameters shared by every block request
+            use_traffic: Prefer duration_in_traffic over duration when present
+
+        Returns:
+            Tuple of (distances_meters, durations_seconds) n x n lists
+        """
+        n = len(locations)
+        # Format locations as "lat,lng"
+        coords = [f"{loc.latitude},{loc.longitude}" for loc in locations]
+        distances_meters = [[0.0] * n for _ in range(n)]
+        durations_seconds = [[0.0] * n for _ in range(n)]
+
+        starts = range(0, n, self.BLOCK_SIZE)
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
         async with aiohttp.ClientSession() as session:
-            async with session.get(self.BASE_URL, params=params) as response:
+            await asyncio.gather(*[
+                self._fetch_block(
+                    session, semaphore, coords, params, use_traffic,
+                    origin_start, destination_start,
+                    distances_meters, durations_seconds
+                )
+                for origin_start in starts
+                for destination_start in starts
+            ])
+
+        return distances_meters, durations_seconds
+
+    async def _fetch_block(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        coords: List[str],
+        params: Dict[str, Any],
+        use_traffic: bool,
+        origin_start: int,
+        destination_start: int,
+        distances_meters: List[List[float]],
+        durations_seconds: List[List[float]]
+    ) -> None:
+        """Request one block of the matrix and write it into the result lists in place."""
+        origins = coords[origin_start:origin_start + self.BLOCK_SIZE]
+        destinations = coords[destination_start:destination_start + self.BLOCK_SIZE]
+
+        block_params = dict(params)
+        block_params["origins"] = "|".join(origins)
+        block_params["destinations"] = "|".join(destinations)
+
+        async with semaphore:
+            async with session.get(self.BASE_URL, params=block_params) as response:
                 if response.status != 200:
                     raise Exception(f"Google Maps API returned status {response.status}")
 
                 data = await response.json()
 
-                if data.get("status") != "OK":
-                    error_msg = data.get("error_message", data.get("status"))
-                    raise Exception(f"Google Maps API error: {error_msg}")
-
-                rows = data.get("rows", [])
-                distances_meters = []
-                durations_seconds = []
-
-                for i, row in enumerate(rows):
-                    elements = row.get("elements", [])
-                    dist_row = []
-                    dur_row = []
-
-                    for j, element in enumerate(elements):
-                        status = element.get("status")
-
-                        if status == "ZERO_RESULTS" and i == j:
-                            dist_row.append(0.0)
-                            dur_row.append(0.0)
-                        elif status == "OK":
-                            distance = element.get("distance", {}).get("value", 0)
-                            # Prefer duration_in_traffic if available
-                            duration = element.get("duration_in_traffic", element.get("duration", {})).get("value", 0)
-                            dist_row.append(float(distance))
-                            dur_row.append(float(duration))
-                        else:
-                            dist_row.append(float('inf'))
-                            dur_row.append(float('inf'))
-
-                    distances_meters.append(dist_row)
-                    durations_seconds.append(dur_row)
-
-                return DistanceMatrix(
-                    locations=locations,
-                    distances_meters=distances_meters,
-                    durations_seconds=durations_seconds,
-                    provider=f"{self.name}_traffic"
-                )
+        if data.get("status") != "OK":
+            error_msg = data.get("error_message", data.get("status"))
+            raise Exception(f"Google Maps API error: {error_msg}")
+
+        # Parse response
+        rows = data.get("rows", [])
+        if len(rows) != len(origins):
+            raise Exception(f"Expected {len(origins)} rows, got {len(rows)}")
+
+        for row_offset, row in enumerate(rows):
+            i = origin_start + row_offset
+            elements = row.get("elements", [])
+            if len(elements) != len(destinations):
+                raise Exception(f"Expected {len(destinations)} elements in row {i}, got {len(elements)}")
+
+            dist_row = distances_meters[i]
+            dur_row = durations_seconds[i]
+
+            for col_offset, element in enumerate(elements):
+                j = destination_start + col_offset
+                status = element.get("status")
+
+                if status == "ZERO_RESULTS" and i == j:
+                    # Same origin and destination
+                    dist_row[j] = 0.0
+                    dur_row[j] = 0.0
+                elif status == "OK":
+                    distance = element.get("distance", {}).get("value", 0)  # meters
+                    if use_traffic:
+                        # Prefer duration_in_traffic if available
+                        duration = element.get("duration_in_traffic", element.get("duration", {})).get("value", 0)
+                    else:
+                        duration = element.get("duration", {}).get("value", 0)  # seconds
+                    dist_row[j] = float(distance)
+                    dur_row[j] = float(duration)
+                else:
+                    # Handle errors (NOT_FOUND, ZERO_RESULTS, etc.)
+                    # Use a large number to indicate unreachable
+                    dist_row[j] = float('inf')
+                    dur_row[j] = float('inf')
@@ -4,6 +4,7 @@ Uses great-circle distance formula for geographic coordinates.
 """
 import math
 from typing import List, Optional
+import numpy as np
 from .base import DistanceProvider
 from ..models import Location, DistanceMatrix
 
@@ -46,35 +47,65 @@ class HaversineProvider(DistanceProvider):
         if not locations:
             raise ValueError("Locations list cannot be empty")
 
-        n = len(locations)
-        distances_meters = []
-        durations_seconds = []
+        distances = self._haversine_matrix(locations)
+        durations = distances / self.average_speed_ms  # seconds
 
-        for i in range(n):
-            dist_row = []
-            dur_row = []
+        return DistanceMatrix(
+            locations=locations,
+            distances_meters=distances.tolist(),
+            durations_seconds=durations.tolist(),
+            provider=self.name
+        )
 
-            for j in range(n):
-                if i == j:
-                    # Same location
-                    dist_row.append(0.0)
-                    dur_row.append(0.0)
-                else:
-                    distance = self._haversine_distance(locations[i], locations[j])
-                    duration = distance / self.average_speed_ms  # seconds
+    def _haversine_matrix(self, locations: List[Location]) -> np.ndarray:
+        """
+        Calculate all pairwise great-circle distances at once using NumPy broadcasting.
 
-                    dist_row.append(distance)
-                    dur_row.append(duration)
+        Args:
+            locations: List of Location objects
 
-            distances_meters.append(dist_row)
-            durations_seconds.append(dur_row)
+        Returns:
+            n x n array of distances in meters (zero diagonal)
+        """
+        n = len(locations)
+        lats = np.radians(np.fromiter((loc.latitude for loc in locations), dtype=np.float64, count=n))
+        lons = np.radians(np.fromiter((loc.longitude for loc in locations), dtype=np.float64, count=n))
 
-        return DistanceMatrix(
-            locations=locations,
-            distances_meters=distances_meters,
-            durations_seconds=durations_seconds,
-            provider=self.name
+        # [i, j] holds the difference from location i to location j
+        dlat = lats[np.newaxis, :] - lats[:, np.newaxis]
+        dlon = lons[np.newaxis, :] - lons[:, np.newaxis]
+
+        a = (
+            np.sin(dlat / 2) ** 2 +
+            np.cos(lats)[:, np.newaxis] * np.cos(lats)[np.newaxis, :] * np.sin(dlon / 2) ** 2
         )
+        # Clamp rounding noise so arcsin stays in its domain
+        c = 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+        distances = self.EARTH_RADIUS_METERS * c
+        np.fill_diagonal(distances, 0.0)
+        return distances
+
+    def distances_from(self, origin: Location, destinations: List[Location]) -> np.ndarray:
+        """
+        Calculate great-circle distances from one origin to many destinations.
+
+        Args:
+            origin: Starting location
+            destinations: List of destination locations
+
+        Returns:
+            Array of distances in meters, aligned with destinations
+        """
+        n = len(destinations)
+        lat1 = math.radians(origin.latitude)
+        lon1 = math.radians(origin.longitude)
+        lats = np.radians(np.fromiter((loc.latitude for loc in destinations), dtype=np.float64, count=n))
+        lons = np.radians(np.fromiter((loc.longitude for loc in destinations), dtype=np.float64, count=n))
+
+        a = np.sin((lats - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lats) * np.sin((lons - lon1) / 2) ** 2
+        c = 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+        return self.EARTH_RADIUS_METERS * c
 
     def _haversine_distance(self, loc1: Location, loc2: Location) -> float:
         """
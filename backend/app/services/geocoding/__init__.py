@@ -4,7 +4,7 @@ Geocoding Module
 Address geocoding and reverse geocoding services
 """
 
-from app.services.geocoding.geocoding_service import GeocodingService
+from app.services.geocoding.geocoding_service import GeocodingService, get_geocoding_service
 from app.services.geocoding.base_geocoder import GeocodingResult
 
-__all__ = ["GeocodingService", "GeocodingResult"]
+__all__ = ["GeocodingService", "GeocodingResult", "get_geocoding_service"]
@@ -50,6 +50,10 @@ class GeocodingResult:
         }
 
 
+class GeocodingRateLimitError(Exception):
+    """Raised by providers when the geocoding API rejects a request for exceeding its rate or quota"""
+
+
 class BaseGeocoder(ABC):
     """Abstract base class for geocoding providers"""
 
@@ -95,6 +99,10 @@ class BaseGeocoder(ABC):
         """
         pass
 
+    async def aclose(self) -> None:
+        """Release provider resources such as pooled HTTP connections"""
+        pass
+
     @property
     @abstractmethod
     def provider_name(self) -> str:
@@ -0,0 +1,179 @@
+"""
+Geocoding Cache
+
+Two-tier cache for geocoded addresses: an in-process LRU in front of the
+geocoding_cache database table.
+"""
+
+import hashlib
+import logging
+import re
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.geocoding_cache import GeocodingCache as GeocodingCacheModel
+from app.services.geocoding.base_geocoder import GeocodingResult
+
+logger = logging.getLogger(__name__)
+
+
+class GeocodingCache:
+    """
+    Cache for geocoding results keyed by normalized address.
+
+    Lookups check the in-process LRU first (shared by all instances of the
+    process), then the database table, which survives restarts.
+    """
+
+    DEFAULT_TTL_DAYS = 30
+    MEMORY_MAX_ENTRIES = 10_000
+
+    # cache_key -> (expires_at, result)
+    _memory: "OrderedDict[str, Tuple[datetime, GeocodingResult]]" = OrderedDict()
+
+    def __init__(self, db: Session):
+        """
+        Initialize geocoding cache
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+        self.ttl = timedelta(days=self.DEFAULT_TTL_DAYS)
+
+    @staticmethod
+    def normalize_address(address: str, country: str = "CL") -> str:
+        """
+        Normalize an address so trivially different spellings share a key.
+
+        Lowercases, strips accents, collapses whitespace and appends the country.
+
+        Args:
+            address: Address string
+            country: Country code
+
+        Returns:
+            Normalized address string
+        """
+        decomposed = unicodedata.normalize("NFKD", address)
+        without_accents = "".join(c for c in decomposed if not unicodedata.combining(c))
+        collapsed = re.sub(r"\s+", " ", without_accents.lower()).strip()
+        return f"{collapsed}|{country.upper()}"
+
+    @staticmethod
+    def generate_cache_key(normalized_address: str) -> str:
+        """
+        Generate a cache key for a normalized address.
+
+        Args:
+            normalized_address: Output of normalize_address
+
+        Returns:
+            64-character BLAKE2b hex digest
+        """
+        return hashlib.blake2b(normalized_address.encode(), digest_size=32).hexdigest()
+
+    def get(self, address: str, country: str = "CL") -> Optional[GeocodingResult]:
+        """
+        Retrieve a cached geocoding result.
+
+        Args:
+            address: Address string
+            country: Country code
+
+        Returns:
+            GeocodingResult if found and not expired, None otherwise
+        """
+        cache_key = self.generate_cache_key(self.normalize_address(address, country))
+        now = datetime.utcnow()
+
+        entry = self._memory.get(cache_key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > now:
+                self._memory.move_to_end(cache_key)
+                return result
+            del self._memory[cache_key]
+
+        try:
+            cached = self.db.query(GeocodingCacheModel).filter(
+                GeocodingCacheModel.cache_key == cache_key,
+                GeocodingCacheModel.expires_at > now
+            ).first()
+        except Exception as e:
+            logger.warning(f"Geocoding cache lookup failed: {e}")
+            return None
+
+        if not cached:
+            return None
+
+        result = GeocodingResult(
+            latitude=cached.latitude,
+            longitude=cached.longitude,
+            formatted_address=cached.formatted_address,
+            place_id=cached.place_id
+        )
+        self._remember(cache_key, cached.expires_at, result)
+        return result
+
+    def set(self, address: str, result: GeocodingResult, country: str = "CL") -> None:
+        """
+        Store a geocoding result in both cache tiers.
+
+        Database errors are logged and swallowed: the cache must never make
+        a successful geocode fail.
+
+        Args:
+            address: Address string that was geocoded
+            result: Geocoding result
+            country: Country code
+        """
+        normalized_address = self.normalize_address(address, country)
+        cache_key = self.generate_cache_key(normalized_address)
+        expires_at = datetime.utcnow() + self.ttl
+
+        self._remember(cache_key, expires_at, result)
+
+        try:
+            cached = self.db.query(GeocodingCacheModel).filter(
+                GeocodingCacheModel.cache_key == cache_key
+            ).first()
+
+            if cached:
+                cached.latitude = result.latitude
+                cached.longitude = result.longitude
+                cached.formatted_address = result.formatted_address
+                cached.place_id = result.place_id
+                cached.expires_at = expires_at
+            else:
+                self.db.add(GeocodingCacheModel(
+                    cache_key=cache_key,
+                    normalized_address=normalized_address,
+                    latitude=result.latitude,
+                    longitude=result.longitude,
+                    formatted_address=result.formatted_address,
+                    place_id=result.place_id,
+                    expires_at=expires_at
+                ))
+
+            self.db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to store geocoding cache entry: {e}")
+            self.db.rollback()
+
+    @classmethod
+    def _remember(cls, cache_key: str, expires_at: datetime, result: GeocodingResult) -> None:
+        """Store a result in the in-process LRU, evicting the least recently used entry."""
+        cls._memory[cache_key] = (expires_at, result)
+        cls._memory.move_to_end(cache_key)
+        if len(cls._memory) > cls.MEMORY_MAX_ENTRIES:
+            cls._memory.popitem(last=False)
+
+    @classmethod
+    def clear_memory(cls) -> None:
+        """Clear the in-process tier (the database tier is left untouched)."""
+        cls._memory.clear()
@@ -4,23 +4,89 @@ Geocoding Service
 Main service for geocoding addresses to coordinates
 """
 
+import asyncio
 import logging
-from typing import Optional
+import time
+import weakref
+from functools import lru_cache
+from typing import List, Optional
 
-from app.services.geocoding.base_geocoder import BaseGeocoder, GeocodingResult
+from app.services.geocoding.base_geocoder import BaseGeocoder, GeocodingResult, GeocodingRateLimitError
 from app.services.geocoding.providers.google_geocoder import GoogleGeocoder
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+class ProviderRequestLimiter:
+    """
+    Async context manager capping provider requests for the whole process
+
+    Limits both the number of requests in flight (semaphore) and the rate at
+    which new requests start (token bucket allowing bursts of up to one
+    second's worth of requests).
+    """
+
+    def __init__(self, max_inflight: int, requests_per_second: float):
+        """
+        Initialize request limiter
+
+        Args:
+            max_inflight: Maximum number of concurrent requests
+            requests_per_second: Sustained request start rate
+        """
+        self._semaphore = asyncio.Semaphore(max_inflight)
+        self._rate = requests_per_second
+        self._capacity = max(1.0, requests_per_second)
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def _take_token(self) -> None:
+        """Wait until the token bucket allows another request to start"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+                self._updated_at = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self._rate)
+
+    async def __aenter__(self) -> "ProviderRequestLimiter":
+        await self._semaphore.acquire()
+        try:
+            await self._take_token()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._semaphore.release()
+
+
 class GeocodingService:
     """
     Service for geocoding addresses to coordinates
 
-    Uses Google Maps as primary provider
+    Uses Google Maps as primary provider. Provider requests from all
+    instances share one ProviderRequestLimiter per event loop, and requests
+    rejected for rate limiting are retried with exponential backoff.
     """
 
+    MAX_INFLIGHT_REQUESTS = 8
+    MAX_REQUESTS_PER_SECOND = 40.0
+    RATE_LIMIT_MAX_ATTEMPTS = 3
+    RATE_LIMIT_INITIAL_BACKOFF_SECONDS = 1.0
+    RATE_LIMIT_MAX_BACKOFF_SECONDS = 30.0
+
+    # asyncio primitives are bound to one event loop, so keep a limiter per loop
+    _limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ProviderRequestLimiter]" = (
+        weakref.WeakKeyDictionary()
+    )
+
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize geocoding service
@@ -31,6 +97,35 @@ class GeocodingService:
         # Initialize Google Maps provider
         self.primary_provider: BaseGeocoder = GoogleGeocoder(api_key=api_key)
 
+    @property
+    def limiter(self) -> ProviderRequestLimiter:
+        """Process-wide provider request limiter for the running event loop"""
+        loop = asyncio.get_running_loop()
+        limiter = self._limiters.get(loop)
+        if limiter is None:
+            limiter = ProviderRequestLimiter(self.MAX_INFLIGHT_REQUESTS, self.MAX_REQUESTS_PER_SECOND)
+            self._limiters[loop] = limiter
+        return limiter
+
+    async def _geocode_with_backoff(self, address: str, country: str) -> Optional[GeocodingResult]:
+        """Call the provider under the limiter, retrying rate-limit rejections"""
+        backoff = self.RATE_LIMIT_INITIAL_BACKOFF_SECONDS
+        for attempt in range(1, self.RATE_LIMIT_MAX_ATTEMPTS + 1):
+            try:
+                async with self.limiter:
+                    return await self.primary_provider.geocode(address, country)
+            except GeocodingRateLimitError:
+                if attempt == self.RATE_LIMIT_MAX_ATTEMPTS:
+                    raise
+                logger.warning(f"Geocoding provider rate limited, retrying in {backoff}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.RATE_LIMIT_MAX_BACKOFF_SECONDS)
+        return None
+
+    async def aclose(self) -> None:
+        """Release provider resources (pooled HTTP connections)"""
+        await self.primary_provider.aclose()
+
     async def geocode_address(
         self,
         address: str,
@@ -63,7 +158,7 @@ class GeocodingService:
 
         try:
             # Try primary provider (Google Maps)
-            result = await self.primary_provider.geocode(address, country)
+            result = await self._geocode_with_backoff(address, country)
 
             if result:
                 logger.info(
@@ -79,6 +174,41 @@ class GeocodingService:
             logger.error(f"Error geocoding address '{address}': {e}")
             raise
 
+    async def geocode_addresses(
+        self,
+        addresses: List[str],
+        country: str = "CL",
+        max_concurrency: int = 8
+    ) -> List[Optional[GeocodingResult]]:
+        """
+        Geocode many addresses concurrently
+
+        The provider has no batch endpoint, so requests are issued in parallel
+        (at most max_concurrency in flight). Rate-limit rejections are already
+        retried with backoff by geocode_address; addresses that still fail map
+        to None instead of raising, so one bad address does not fail the
+        whole batch.
+
+        Args:
+            addresses: Address strings to geocode
+            country: Country code (default: CL for Chile)
+            max_concurrency: Maximum number of concurrent provider requests
+
+        Returns:
+            List of GeocodingResult (or None) in the same order as addresses
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def geocode_or_none(address: str) -> Optional[GeocodingResult]:
+            try:
+                async with semaphore:
+                    return await self.geocode_address(address, country)
+            except Exception as e:
+                logger.error(f"Giving up geocoding '{address}': {e}")
+                return None
+
+        return await asyncio.gather(*[geocode_or_none(address) for address in addresses])
+
     async def reverse_geocode(
         self,
         latitude: float,
@@ -116,7 +246,8 @@ class GeocodingService:
 
         try:
             # Try primary provider (Google Maps)
-            result = await self.primary_provider.reverse_geocode(latitude, longitude)
+            async with self.limiter:
+                result = await self.primary_provider.reverse_geocode(latitude, longitude)
 
             if result:
                 logger.info(
@@ -148,3 +279,17 @@ class GeocodingService:
         except Exception as e:
             logger.error(f"Error validating address: {e}")
             return False
+
+
+@lru_cache(maxsize=None)
+def get_geocoding_service() -> GeocodingService:
+    """
+    Get the process-wide GeocodingService
+
+    Sharing one instance lets every request reuse the provider's pooled HTTP
+    connections.
+
+    Returns:
+        GeocodingService singleton configured from settings
+    """
+    return GeocodingService()
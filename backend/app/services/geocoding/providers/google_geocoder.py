@@ -4,11 +4,12 @@ Google Maps Geocoding Provider
 Uses Google Maps Geocoding API for address geocoding
 """
 
+import asyncio
 import logging
 from typing import Optional
 import httpx
 
-from app.services.geocoding.base_geocoder import BaseGeocoder, GeocodingResult
+from app.services.geocoding.base_geocoder import BaseGeocoder, GeocodingResult, GeocodingRateLimitError
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,9 @@ class GoogleGeocoder(BaseGeocoder):
     """Google Maps geocoding provider"""
 
     GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+    REQUEST_TIMEOUT_SECONDS = 10.0
+    MAX_CONNECTIONS = 20
+    MAX_KEEPALIVE_CONNECTIONS = 10
 
     def __init__(self, api_key: Optional[str] = None):
         """
@@ -27,10 +31,39 @@ class GoogleGeocoder(BaseGeocoder):
             api_key: Google Maps API key (defaults to settings.GOOGLE_MAPS_API_KEY)
         """
         self.api_key = api_key or settings.GOOGLE_MAPS_API_KEY
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
 
         if not self.api_key:
             logger.warning("Google Maps API key not configured")
 
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled HTTP client, creating it on first use
+
+        Reusing one client keeps connections (and their TLS sessions) alive
+        between requests. A new client is created if the event loop changed,
+        since pooled connections cannot move between loops.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=self.REQUEST_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=self.MAX_CONNECTIONS,
+                    max_keepalive_connections=self.MAX_KEEPALIVE_CONNECTIONS
+                )
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+
     @property
     def provider_name(self) -> str:
         """Get provider name"""
@@ -75,11 +108,10 @@ class GoogleGeocoder(BaseGeocoder):
             }
 
             # Make API request
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(self.GEOCODE_URL, params=params)
-                response.raise_for_status()
+            response = await self._get_client().get(self.GEOCODE_URL, params=params)
+            response.raise_for_status()
 
-                data = response.json()
+            data = response.json()
 
             # Check API response status
             if data.get("status") != "OK":
@@ -91,7 +123,7 @@ class GoogleGeocoder(BaseGeocoder):
                     return None
                 elif status == "OVER_QUERY_LIMIT":
                     logger.error("Google Maps API quota exceeded")
-                    raise Exception("API quota exceeded")
+                    raise GeocodingRateLimitError("API quota exceeded")
                 elif status == "REQUEST_DENIED":
                     logger.error(f"Google Maps API request denied: {error_message}")
                     raise Exception(f"API request denied: {error_message}")
@@ -156,6 +188,11 @@ class GoogleGeocoder(BaseGeocoder):
 
             return geocoding_result
 
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error during geocoding: {e}")
+            if e.response.status_code == 429:
+                raise GeocodingRateLimitError(f"Geocoding request rate limited: {str(e)}")
+            raise Exception(f"Geocoding request failed: {str(e)}")
         except httpx.HTTPError as e:
             logger.error(f"HTTP error during geocoding: {e}")
             raise Exception(f"Geocoding request failed: {str(e)}")
@@ -203,11 +240,10 @@ class GoogleGeocoder(BaseGeocoder):
             }
 
             # Make API request
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(self.GEOCODE_URL, params=params)
-                response.raise_for_status()
+            response = await self._get_client().get(self.GEOCODE_URL, params=params)
+            response.raise_for_status()
 
-                data = response.json()
+            data = response.json()
 
             # Check API response status
             if data.get("status") != "OK":
@@ -0,0 +1,41 @@
+"""
+Location Mixin
+Shared conversions between location schemas and PostGIS point columns
+"""
+
+from app.schemas.common import LocationSchema
+from app.utils.geospatial import point_ewkt, extract_coordinates
+
+
+class LocationMixin:
+    """Mixin for services that store LocationSchema values in PostGIS point columns"""
+
+    def _location_to_point(self, location: LocationSchema) -> str:
+        """
+        Convert LocationSchema to a PostGIS point (SRID 4326)
+
+        LocationSchema already enforces coordinate ranges, so the EWKT string
+        is formatted directly.
+
+        Args:
+            location: Location schema
+
+        Returns:
+            EWKT string ready to assign to a Geography/Geometry column
+        """
+        return point_ewkt(location.latitude, location.longitude)
+
+    def _point_to_location(self, geom) -> LocationSchema:
+        """
+        Convert a PostGIS point loaded from the database to LocationSchema
+
+        Decodes the WKB value with Shapely (GEOS) instead of parsing text.
+
+        Args:
+            geom: WKBElement from a Geography/Geometry column
+
+        Returns:
+            Location schema
+        """
+        latitude, longitude = extract_coordinates(geom)
+        return LocationSchema(latitude=latitude, longitude=longitude)
@@ -11,6 +11,8 @@ import math
 from typing import List, Dict, Set, Optional, Tuple
 from datetime import datetime, timedelta, time, date
 
+import numpy as np
+
 from .models import (
     OptimizationRequest,
     OptimizationResult,
@@ -152,7 +154,11 @@ class HeuristicStrategy:
     def _build_matrices(self):
         """Build distance and time matrices"""
         # Use provided matrices or create them
-        if self.request.distance_matrix:
+        if isinstance(self.request.distance_matrix, np.ndarray):
+            self.distance_matrix = {
+                (i, j): float(dist) for (i, j), dist in np.ndenumerate(self.request.distance_matrix)
+            }
+        elif self.request.distance_matrix:
             self.distance_matrix = self.request.distance_matrix
         else:
             # Build using Haversine distance
@@ -166,7 +172,11 @@ class HeuristicStrategy:
                     if i != j:
                         self.distance_matrix[(i, j)] = self._haversine_distance(loc1, loc2)
 
-        if self.request.time_matrix:
+        if isinstance(self.request.time_matrix, np.ndarray):
+            self.time_matrix = {
+                (i, j): int(minutes) for (i, j), minutes in np.ndenumerate(self.request.time_matrix)
+            }
+        elif self.request.time_matrix:
             self.time_matrix = self.request.time_matrix
         else:
             # Estimate time from distance (assume 40 km/h average)
@@ -8,9 +8,11 @@ problem space.
 
 from dataclasses import dataclass, field
 from datetime import datetime, time
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Union, FrozenSet
 from enum import Enum
 
+import numpy as np
+
 
 class ConstraintType(str, Enum):
     """Types of constraint violations"""
@@ -62,7 +64,7 @@ class Personnel:
     """Personnel information for optimization"""
     id: int
     name: str
-    skills: List[str]
+    skills: FrozenSet[str]  # Set for O(1) skill membership checks
     start_location: Location
     work_hours_start: time
     work_hours_end: time
@@ -97,7 +99,7 @@ class Case:
     special_instructions: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Visit:
     """A visit in an optimized route"""
     case: Case
@@ -109,7 +111,7 @@ class Visit:
     distance_from_previous: Optional[float] = None  # km
 
 
-@dataclass
+@dataclass(slots=True)
 class Route:
     """An optimized route for a vehicle and personnel"""
     vehicle: Vehicle
@@ -144,7 +146,7 @@ class ConstraintViolation:
     details: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class UnassignedCaseDetail:
     """Details about why a case could not be assigned"""
     case_id: int
@@ -217,8 +219,9 @@ class OptimizationRequest:
     vehicles: List[Vehicle]
     personnel: List[Personnel]
     date: datetime
-    distance_matrix: Optional[Dict[Tuple[int, int], float]] = None  # (from_idx, to_idx) -> distance in km
-    time_matrix: Optional[Dict[Tuple[int, int], int]] = None  # (from_idx, to_idx) -> time in minutes
+    # Matrices are either n x n arrays indexed [from_idx, to_idx] or dicts keyed by (from_idx, to_idx)
+    distance_matrix: Optional[Union[np.ndarray, Dict[Tuple[int, int], float]]] = None  # distance in km
+    time_matrix: Optional[Union[np.ndarray, Dict[Tuple[int, int], int]]] = None  # time in minutes
 
     # Optimization parameters
     max_optimization_time: int = 60  # seconds
@@ -317,8 +320,7 @@ def select_optimal_personnel(
                 continue
 
             # Count how many uncovered skills this person has
-            person_skills = set(person.skills)
-            coverage = len(uncovered_skills & person_skills)
+            coverage = len(uncovered_skills.intersection(person.skills))
 
             if coverage > best_coverage:
                 best_coverage = coverage
@@ -332,7 +334,7 @@ def select_optimal_personnel(
         selected_personnel.append(best_person)
 
         # Remove covered skills
-        uncovered_skills -= set(best_person.skills)
+        uncovered_skills.difference_update(best_person.skills)
 
     return selected_personnel
 
@@ -436,7 +438,7 @@ def assign_personnel_to_vehicles(
     for vehicle in sorted_vehicles:
         assigned = vehicle_assignments[vehicle.id]
         for person in assigned:
-            uncovered_skills -= set(person.skills)
+            uncovered_skills.difference_update(person.skills)
 
     if uncovered_skills:
         logger.warning(f"⚠️  UNCOVERED SKILLS across ALL vehicles: {sorted(uncovered_skills)}")
@@ -6,8 +6,11 @@ It solves the Vehicle Routing Problem with Time Windows and Skills (VRP-TWS).
 """
 
 import logging
+from collections import defaultdict
+from operator import itemgetter
 from typing import List, Dict, Tuple, Optional, Set
 from datetime import datetime, timedelta, time
+import numpy as np
 from ortools.constraint_solver import routing_enums_pb2
 from ortools.constraint_solver import pywrapcp
 
@@ -44,9 +47,12 @@ class ORToolsVRPStrategy:
         self.routing: Optional[pywrapcp.RoutingModel] = None
         self.locations: List[Location] = []  # All locations (depot + cases)
         self.location_to_case: Dict[int, Case] = {}  # Map location index to case
+        self.case_node_mask: bytearray = bytearray()  # case_node_mask[node] == 1 if node is a case location
         self.vehicle_to_personnel: Dict[int, List[Personnel]] = {}  # Map vehicle to assigned personnel
-        self.distance_matrix: List[List[float]] = []
-        self.time_matrix: List[List[int]] = []
+        self.vehicle_skills: Dict[int, Set[str]] = {}  # Map vehicle to combined skills of its personnel
+        self.case_required_skills: Dict[int, frozenset] = {}  # Map case id to its required skills
+        self.distance_matrix: np.ndarray = np.zeros((0, 0), dtype=np.float64)  # km, indexed [from, to]
+        self.time_matrix: np.ndarray = np.zeros((0, 0), dtype=np.int32)  # minutes, indexed [from, to]
 
     def optimize(self, request: OptimizationRequest) -> OptimizationResult:
         """
@@ -94,47 +100,45 @@ class ORToolsVRPStrategy:
             search_parameters = self._get_search_parameters()
 
             # Solve
-            logger.info(f"Starting OR-Tools optimization with {len(request.cases)} cases and {len(request.vehicles)} vehicles")
-            logger.info(f"  - Total locations: {len(self.locations)} (depots + cases)")
-            logger.info(f"  - Available personnel: {len(request.personnel)}")
-            logger.info(f"  - Distance matrix size: {len(self.distance_matrix)}x{len(self.distance_matrix[0]) if self.distance_matrix else 0}")
+            logger.info("Starting OR-Tools optimization with %d cases and %d vehicles", len(request.cases), len(request.vehicles))
+            logger.info("  - Total locations: %d (depots + cases)", len(self.locations))
+            logger.info("  - Available personnel: %d", len(request.personnel))
+            logger.info("  - Distance matrix size: %dx%d", *self.distance_matrix.shape)
 
             solution = self.routing.SolveWithParameters(search_parameters)
 
             # Check solution status using routing status (NOT solution object truthiness)
             # Status codes: 0=NOT_SOLVED, 1=SUCCESS, 2=NO_SOLUTION_FOUND, 3=TIME_LIMIT, 4=FAIL, etc.
             status = self.routing.status()
-            logger.info(f"OR-Tools solver status: {status} (1=SUCCESS, 2=NO_SOLUTION_FOUND, 3=TIME_LIMIT, 4=FAIL)")
+            logger.info("OR-Tools solver status: %s (1=SUCCESS, 2=NO_SOLUTION_FOUND, 3=TIME_LIMIT, 4=FAIL)", status)
 
             # Extract solution if status is SUCCESS (1) or if we have a solution even with time/solution limit reached
             # Status 1 = ROUTING_SUCCESS (optimal solution found)
             # Status 3 = TIME_LIMIT but may have found a good solution
             # Check if solution is not None (OR-Tools found at least one feasible solution)
-            print(f"🔧 OR-Tools status={status}, solution is None={solution is None}", flush=True)
+            logger.debug("OR-Tools status=%s, solution is None=%s", status, solution is None)
             if status == 1 or (solution is not None and status in [3]):  # SUCCESS or TIME_LIMIT with solution
                 if status == 1:
-                    print("✓ OR-Tools found optimal solution!", flush=True)
                     logger.info("✓ OR-Tools found optimal solution!")
                 else:
-                    print(f"✓ OR-Tools found solution (status={status}, may not be optimal but usable)", flush=True)
-                    logger.info(f"✓ OR-Tools found solution (status={status}, may not be optimal but usable)")
+                    logger.info("✓ OR-Tools found solution (status=%s, may not be optimal but usable)", status)
 
                 try:
                     result = self._extract_solution(solution)
                     optimization_time = (datetime.now() - start_time).total_seconds()
                     result.optimization_time = optimization_time
                     result.strategy_used = "ortools"
-                    logger.info(f"✓ OR-Tools optimization completed in {optimization_time:.2f}s: {result.get_summary()}")
+                    logger.info("✓ OR-Tools optimization completed in %.2fs: %s", optimization_time, result.get_summary())
                     return result
                 except Exception as extract_error:
-                    logger.error(f"✗ Failed to extract OR-Tools solution: {extract_error}", exc_info=True)
+                    logger.error("✗ Failed to extract OR-Tools solution: %s", extract_error, exc_info=True)
                     # Fall through to error case
             else:
                 # No solution found
-                logger.error(f"✗ OR-Tools could not find a solution (status={status})")
-                logger.error(f"  - Search ran for {(datetime.now() - start_time).total_seconds():.2f}s")
-                logger.error(f"  - Problem size: {len(request.cases)} cases, {len(request.vehicles)} vehicles")
-                logger.error(f"  - Try: (1) Relaxing time windows, (2) Increasing vehicle capacity, (3) Reducing cases")
+                logger.error("✗ OR-Tools could not find a solution (status=%s)", status)
+                logger.error("  - Search ran for %.2fs", (datetime.now() - start_time).total_seconds())
+                logger.error("  - Problem size: %d cases, %d vehicles", len(request.cases), len(request.vehicles))
+                logger.error("  - Try: (1) Relaxing time windows, (2) Increasing vehicle capacity, (3) Reducing cases")
                 return OptimizationResult(
                     success=False,
                     routes=[],
@@ -152,7 +156,7 @@ class ORToolsVRPStrategy:
                 )
 
         except Exception as e:
-            logger.error(f"OR-Tools optimization failed: {e}", exc_info=True)
+            logger.error("OR-Tools optimization failed: %s", e, exc_info=True)
             return OptimizationResult(
                 success=False,
                 routes=[],
@@ -195,13 +199,20 @@ class ORToolsVRPStrategy:
             cases=self.request.cases
         )
 
+        # Cache combined team skills per vehicle and required skills per case
+        self.vehicle_skills = {}
+        self.case_required_skills = {
+            case.id: frozenset(case.required_skills) for case in self.request.cases
+        }
+
         # Log personnel assignments
         for vehicle in self.request.vehicles:
             assigned = self.vehicle_to_personnel.get(vehicle.id, [])
             skills = set()
             for p in assigned:
                 skills.update(p.skills)
-            logger.info(f"  Vehicle {vehicle.identifier}: {len(assigned)} personnel with skills: {sorted(skills)}")
+            self.vehicle_skills[vehicle.id] = skills
+            logger.info("  Vehicle %s: %d personnel with skills: %s", vehicle.identifier, len(assigned), sorted(skills))
 
         # PHASE 1.5: PRE-FILTER cases that have NO valid vehicles (will be auto-unassigned)
         # This prevents OR-Tools from trying to assign them and violating constraints
@@ -221,9 +232,9 @@ class ORToolsVRPStrategy:
                 self.feasible_cases.append(case)
             else:
                 self.infeasible_cases.append(case)
-                logger.warning(f"  ⚠️  Case {case.id} has NO valid vehicles (skills: {case.required_skills}) - PRE-FILTERED OUT")
+                logger.warning("  ⚠️  Case %s has NO valid vehicles (skills: %s) - PRE-FILTERED OUT", case.id, case.required_skills)
 
-        logger.info(f"  Feasible cases: {len(self.feasible_cases)} | Infeasible cases: {len(self.infeasible_cases)}")
+        logger.info("  Feasible cases: %d | Infeasible cases: %d", len(self.feasible_cases), len(self.infeasible_cases))
 
         # Build location list: first all vehicle base locations (depots), then ONLY FEASIBLE case locations
         self.locations = []
@@ -241,6 +252,11 @@ class ORToolsVRPStrategy:
             self.locations.append(case.location)
             self.location_to_case[len(self.locations) - 1] = case
 
+        # Dense node -> is-case flags for the solver callbacks and route extraction
+        self.case_node_mask = bytearray(len(self.locations))
+        for location_idx in self.location_to_case:
+            self.case_node_mask[location_idx] = 1
+
         # Build distance and time matrices
         self._build_matrices()
 
@@ -248,32 +264,45 @@ class ORToolsVRPStrategy:
         """Build distance and time matrices"""
         n = len(self.locations)
 
-        # Initialize matrices with zeros
-        self.distance_matrix = [[0.0] * n for _ in range(n)]
-        self.time_matrix = [[0] * n for _ in range(n)]
+        # Initialize matrices with zeros (contiguous arrays, indexed as [from, to])
+        self.distance_matrix = np.zeros((n, n), dtype=np.float64)
+        self.time_matrix = np.zeros((n, n), dtype=np.int32)
 
         # If matrices provided in request, use them
-        if self.request.distance_matrix and self.request.time_matrix:
-            logger.info(f"Building matrices from provided data for {n} locations")
-
-            # The request matrices use indices: [0..num_vehicles-1] for depots, [num_vehicles..n-1] for cases
-            # self.locations uses same indexing: first num_vehicles are depots, rest are cases
-
-            for i in range(n):
-                for j in range(n):
-                    # Get distance and time from request matrices
-                    dist = self.request.distance_matrix.get((i, j), 0.0)
-                    time_val = self.request.time_matrix.get((i, j), 0)
-
-                    # If not found in request matrices, calculate using Haversine
-                    if dist == 0.0 and i != j:
-                        dist = self._haversine_distance(self.locations[i], self.locations[j])
-                        time_val = int((dist / 40.0) * 60)  # minutes at 40 km/h
-
-                    self.distance_matrix[i][j] = dist
-                    self.time_matrix[i][j] = time_val
-
-            logger.info(f"Matrix construction complete. Sample distances: {[self.distance_matrix[0][i] for i in range(min(5, n))]}")
+        if self.request.distance_matrix is not None and self.request.time_matrix is not None:
+            logger.info("Building matrices from provided data for %d locations", n)
+
+            # The request matrices use indices: [0..num_vehicles-1] for depots, [num_vehicles..] for
+            # request.cases in order. self.locations only holds FEASIBLE cases, so map each location
+            # back to its row/column in the request matrices.
+            num_vehicles = len(self.request.vehicles)
+            request_index = {case.id: num_vehicles + k for k, case in enumerate(self.request.cases)}
+            source = [
+                i if i < num_vehicles else request_index[self.location_to_case[i].id]
+                for i in range(n)
+            ]
+
+            if isinstance(self.request.distance_matrix, np.ndarray):
+                # Array matrices: gather the needed rows/columns in one step
+                rows = np.ix_(source, source)
+                self.distance_matrix = np.asarray(self.request.distance_matrix, dtype=np.float64)[rows]
+                self.time_matrix = np.asarray(self.request.time_matrix)[rows].astype(np.int32)
+            else:
+                for i in range(n):
+                    for j in range(n):
+                        # Get distance and time from request matrices
+                        self.distance_matrix[i, j] = self.request.distance_matrix.get((source[i], source[j]), 0.0)
+                        self.time_matrix[i, j] = self.request.time_matrix.get((source[i], source[j]), 0)
+
+            # If not found in request matrices, calculate using Haversine
+            missing = self.distance_matrix == 0.0
+            np.fill_diagonal(missing, False)
+            for i, j in zip(*np.nonzero(missing)):
+                dist = self._haversine_distance(self.locations[i], self.locations[j])
+                self.distance_matrix[i, j] = dist
+                self.time_matrix[i, j] = int((dist / 40.0) * 60)  # minutes at 40 km/h
+
+            logger.info("Matrix construction complete. Sample distances: %s", self.distance_matrix[0, :5].tolist() if n else [])
         else:
             # Create matrices using Haversine distance (fallback)
             logger.warning("No distance matrix provided, using Haversine distance")
@@ -282,9 +311,9 @@ class ORToolsVRPStrategy:
                 for j in range(n):
                     if i != j:
                         dist = self._haversine_distance(self.locations[i], self.locations[j])
-                        self.distance_matrix[i][j] = dist
+                        self.distance_matrix[i, j] = dist
                         # Estimate time: assume 40 km/h average speed
-                        self.time_matrix[i][j] = int((dist / 40.0) * 60)  # minutes
+                        self.time_matrix[i, j] = int((dist / 40.0) * 60)  # minutes
 
     def _haversine_distance(self, loc1: Location, loc2: Location) -> float:
         """Calculate Haversine distance between two locations in km"""
@@ -313,11 +342,11 @@ class ORToolsVRPStrategy:
         # Total locations = num vehicles (depots) + num cases
         num_locations = len(self.locations)
 
-        logger.info(f"Creating routing model:")
-        logger.info(f"  - Vehicles: {num_vehicles}")
-        logger.info(f"  - Total locations: {num_locations}")
-        logger.info(f"  - Cases to visit: {len(self.location_to_case)}")
-        logger.info(f"  - Depot indices: {depot_indices}")
+        logger.info("Creating routing model:")
+        logger.info("  - Vehicles: %d", num_vehicles)
+        logger.info("  - Total locations: %d", num_locations)
+        logger.info("  - Cases to visit: %d", len(self.location_to_case))
+        logger.info("  - Depot indices: %s", depot_indices)
 
         self.manager = pywrapcp.RoutingIndexManager(
             num_locations,
@@ -350,11 +379,15 @@ class ORToolsVRPStrategy:
                 # NOTE: SetAllowedVehiclesForIndex([]) means "ALL vehicles allowed" (OR-Tools default)
                 # We'll use penalty=0 in AddDisjunction to force these to be dropped
                 cases_with_no_valid_vehicles.append(case.id)
-                logger.warning(f"  Case {case.id} has no valid vehicles (required skills: {case.required_skills}) - will be dropped")
+                logger.warning("  Case %s has no valid vehicles (required skills: %s) - will be dropped", case.id, case.required_skills)
             else:
                 # Restrict this case to ONLY the allowed vehicles (hard constraint)
                 self.routing.SetAllowedVehiclesForIndex(allowed_vehicles, node_index)
-                logger.info(f"  Case {case.id} can be served by vehicles: {[self.request.vehicles[i].identifier for i in allowed_vehicles]}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "  Case %s can be served by vehicles: %s",
+                        case.id, [self.request.vehicles[i].identifier for i in allowed_vehicles]
+                    )
 
         # Allow dropping nodes (not visiting some cases) with differentiated penalties
         # Penalty must be in same units as distance (meters, since distance_callback multiplies by 1000)
@@ -373,11 +406,11 @@ class ORToolsVRPStrategy:
             else:
                 self.routing.AddDisjunction([index], penalty_high)
 
-        logger.info(f"  - Drop penalties: HIGH={penalty_high} (prefer assign), ZERO={penalty_zero} (always drop)")
+        logger.info("  - Drop penalties: HIGH=%d (prefer assign), ZERO=%d (always drop)", penalty_high, penalty_zero)
 
         if cases_with_no_valid_vehicles:
-            logger.warning(f"  WARNING: {len(cases_with_no_valid_vehicles)} cases have no valid vehicles and will likely be dropped")
-            logger.warning(f"           Case IDs: {sorted(cases_with_no_valid_vehicles)}")
+            logger.warning("  WARNING: %d cases have no valid vehicles and will likely be dropped", len(cases_with_no_valid_vehicles))
+            logger.warning("           Case IDs: %s", sorted(cases_with_no_valid_vehicles))
 
     def _add_distance_constraint(self):
         """Add distance dimension to the model"""
@@ -401,7 +434,7 @@ class ORToolsVRPStrategy:
                 if from_node >= len(self.distance_matrix) or to_node >= len(self.distance_matrix):
                     return 0
 
-                return int(self.distance_matrix[from_node][to_node] * 1000)  # Convert to meters
+                return int(self.distance_matrix[from_node, to_node] * 1000)  # Convert to meters
             except (OverflowError, IndexError, KeyError, Exception) as e:
                 # Return a large penalty distance for invalid transitions
                 return 999999
@@ -447,12 +480,11 @@ class ORToolsVRPStrategy:
                 if from_node >= len(self.time_matrix) or to_node >= len(self.time_matrix):
                     return 0
 
-                travel_time = self.time_matrix[from_node][to_node]
+                travel_time = int(self.time_matrix[from_node, to_node])
 
                 # Add service time if going to a case location
-                if to_node in self.location_to_case:
-                    case = self.location_to_case[to_node]
-                    travel_time += case.estimated_duration
+                if self.case_node_mask[to_node]:
+                    travel_time += self.location_to_case[to_node].estimated_duration
 
                 return travel_time
             except (OverflowError, IndexError, KeyError, Exception) as e:
@@ -503,10 +535,7 @@ class ORToolsVRPStrategy:
         # For simplicity, each case counts as 1 unit of capacity
         def demand_callback(from_index):
             """Return demand of a node"""
-            from_node = self.manager.IndexToNode(from_index)
-            if from_node in self.location_to_case:
-                return 1
-            return 0
+            return self.case_node_mask[self.manager.IndexToNode(from_index)]
 
         demand_callback_index = self.routing.RegisterUnaryTransitCallback(demand_callback)
 
@@ -523,7 +552,7 @@ class ORToolsVRPStrategy:
             for vehicle in self.request.vehicles
         ]
 
-        logger.info(f"Vehicle capacities adjusted: {vehicle_capacities} for {num_cases} cases across {num_vehicles} vehicles")
+        logger.info("Vehicle capacities adjusted: %s for %d cases across %d vehicles", vehicle_capacities, num_cases, num_vehicles)
 
         # Add capacity dimension with generous slack
         self.routing.AddDimensionWithVehicleCapacity(
@@ -561,19 +590,23 @@ class ORToolsVRPStrategy:
 
             # If no vehicles have the required skills, mark case as droppable
             if not allowed_vehicles:
-                logger.warning(f"Case {case.id} requires skills {required_skills} but NO vehicles have them")
+                logger.warning("Case %s requires skills %s but NO vehicles have them", case.id, required_skills)
                 # Make the drop penalty lower than visiting to ensure it's dropped
                 self.routing.AddDisjunction([index], 1000)  # Low penalty = prefer to drop
             else:
                 # Restrict this case to only be visited by vehicles with required skills
                 self.routing.SetAllowedVehiclesForIndex(allowed_vehicles, index)
-                logger.debug(f"Case {case.id} can be assigned to vehicles: {[self.request.vehicles[i].identifier for i in allowed_vehicles]}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Case %s can be assigned to vehicles: %s",
+                        case.id, [self.request.vehicles[i].identifier for i in allowed_vehicles]
+                    )
 
                 # Add a moderate drop penalty to prefer assigning over dropping
                 # But not too high to force infeasible solutions
                 self.routing.AddDisjunction([index], 100000)  # Higher penalty = prefer to assign
 
-        logger.info(f"Skill constraints applied for {len(self.location_to_case)} cases")
+        logger.info("Skill constraints applied for %d cases", len(self.location_to_case))
 
     def _get_search_parameters(self) -> pywrapcp.DefaultRoutingSearchParameters:
         """Configure search parameters"""
@@ -602,7 +635,7 @@ class ORToolsVRPStrategy:
         # Log search for debugging (disable for production to reduce log spam)
         search_parameters.log_search = False  # Changed to False to reduce log spam
 
-        logger.info(f"Search parameters: strategy=PARALLEL_CHEAPEST_INSERTION, time_limit={search_parameters.time_limit.seconds}s, solution_limit=50000")
+        logger.info("Search parameters: strategy=PARALLEL_CHEAPEST_INSERTION, time_limit=%ds, solution_limit=50000", search_parameters.time_limit.seconds)
 
         return search_parameters
 
@@ -642,24 +675,23 @@ class ORToolsVRPStrategy:
             ) * 100.0
 
         # If all cases assigned, return empty analysis (success!)
+        # Nothing below (coverage, demand, hiring impact) is reported without unassigned cases
         if not unassigned_cases:
             logger.info("✅ All cases assigned - no skill gaps detected")
             return analysis
 
-        # Collect all skills from all vehicles (what we have)
-        all_available_skills = set()
-        for vehicle in self.request.vehicles:
-            assigned_personnel = self.vehicle_to_personnel.get(vehicle.id, [])
-            for person in assigned_personnel:
-                all_available_skills.update(person.skills)
+        # Collect all skills from all vehicles (what we have), reusing the per-vehicle team skills
+        all_available_skills = set().union(*self.vehicle_skills.values())
 
         # 1. Analyze unassigned cases - determine missing skills
         unassigned_case_details = []
         skills_demand_counter = {}  # skill -> count of cases requiring it
+        cases_by_skill = defaultdict(list)  # skill -> [case_ids]
+
+        required_sets = self.case_required_skills
 
         for case in unassigned_cases:
-            required_skills = set(case.required_skills)
-            missing_skills = required_skills - all_available_skills
+            missing_skills = required_sets[case.id] - all_available_skills
 
             # Track demand for each missing skill
             for skill in missing_skills:
@@ -687,76 +719,167 @@ class ORToolsVRPStrategy:
 
             # Group by skill
             for skill in missing_skills:
-                if skill not in analysis.unassigned_cases_by_skill:
-                    analysis.unassigned_cases_by_skill[skill] = []
-                analysis.unassigned_cases_by_skill[skill].append(case.id)
+                cases_by_skill[skill].append(case.id)
 
+        analysis.unassigned_cases_by_skill = dict(cases_by_skill)
         analysis.unassigned_case_details = unassigned_case_details
 
         # 2. Most demanded skills (hiring priority ranking)
-        analysis.most_demanded_skills = sorted(
-            skills_demand_counter.items(),
-            key=lambda x: (-x[1], x[0])  # Sort by count descending, then by name
-        )
+        # The full ranking is returned to clients (admin planning view), not just the
+        # top 5 that get logged, so a full sort is required here (heapq.nlargest won't do).
+        # Ties are broken by name to keep the output stable across runs.
+        # Two stable sorts (name, then count descending) give the same order as a
+        # (-count, name) key without a Python-level key function per item
+        most_demanded_skills = sorted(skills_demand_counter.items(), key=itemgetter(0))
+        most_demanded_skills.sort(key=itemgetter(1), reverse=True)
+        analysis.most_demanded_skills = most_demanded_skills
 
         # 3. Skill coverage percentage
         # For each skill, calculate: (cases requiring skill that CAN be assigned) / (total cases requiring skill)
+        # Count both in a single pass over the cases using the cached required-skill sets
+        total_with_skill: Dict[str, int] = {}
+        assigned_with_skill: Dict[str, int] = {}
+        for case in all_cases:
+            is_assigned = case.id in assigned_case_ids
+            for skill in required_sets[case.id]:
+                total_with_skill[skill] = total_with_skill.get(skill, 0) + 1
+                if is_assigned:
+                    assigned_with_skill[skill] = assigned_with_skill.get(skill, 0) + 1
+
+        # Report skills in order of first appearance across the requested cases
+        skill_coverage: Dict[str, float] = {}
         for case in all_cases:
             for skill in case.required_skills:
-                if skill not in analysis.skill_coverage_percentage:
-                    # Count total cases requiring this skill
-                    total_with_skill = sum(
-                        1 for c in all_cases if skill in c.required_skills
-                    )
-                    # Count assigned cases requiring this skill
-                    assigned_with_skill = sum(
-                        1 for c in all_cases
-                        if skill in c.required_skills and c.id in assigned_case_ids
-                    )
-
-                    if total_with_skill > 0:
-                        coverage = (assigned_with_skill / total_with_skill) * 100.0
-                    else:
-                        coverage = 0.0
-
-                    analysis.skill_coverage_percentage[skill] = round(coverage, 2)
+                if skill not in skill_coverage:
+                    coverage = (assigned_with_skill.get(skill, 0) / total_with_skill[skill]) * 100.0
+                    skill_coverage[skill] = round(coverage, 2)
 
         # 4. Hiring impact simulation
         # For each missing skill, simulate adding one person with that skill
         # Count how many currently unassigned cases would become assignable
+        hiring_impact: Dict[str, int] = {}
         for skill in skills_demand_counter.keys():
             additional_assignable = 0
 
             for case in unassigned_cases:
-                missing_skills = set(case.required_skills) - all_available_skills
+                required_skills = required_sets[case.id]
+                missing_skills = required_skills - all_available_skills
 
                 # If this skill is the ONLY missing skill for this case,
                 # hiring someone with this skill would make the case assignable
                 if skill in missing_skills:
                     # Check if adding this skill would make the case fully covered
-                    would_be_covered = (set(case.required_skills) - {skill}).issubset(all_available_skills)
+                    would_be_covered = (required_skills - {skill}).issubset(all_available_skills)
                     if would_be_covered or len(missing_skills) == 1:
                         additional_assignable += 1
 
-            analysis.hiring_impact_simulation[skill] = additional_assignable
+            hiring_impact[skill] = additional_assignable
+
+        # Assign the accumulated results to the analysis once
+        analysis.skill_coverage_percentage = skill_coverage
+        analysis.hiring_impact_simulation = hiring_impact
 
         # Log summary
-        logger.info("=" * 80)
         logger.info("📊 SKILL GAP ANALYSIS:")
-        logger.info(f"  Assignment rate: {analysis.assignment_rate_percentage:.1f}% ({analysis.total_cases_assigned}/{analysis.total_cases_requested})")
-        logger.info(f"  Unassigned cases: {analysis.total_cases_unassigned}")
+        logger.info(
+            "  Assignment rate: %.1f%% (%d/%d)",
+            analysis.assignment_rate_percentage, analysis.total_cases_assigned, analysis.total_cases_requested
+        )
+        logger.info("  Unassigned cases: %d", analysis.total_cases_unassigned)
 
         if analysis.most_demanded_skills:
             logger.info("  🔥 Most demanded skills (hiring priority):")
             for skill, count in analysis.most_demanded_skills[:5]:  # Top 5
-                impact = analysis.hiring_impact_simulation.get(skill, 0)
-                coverage = analysis.skill_coverage_percentage.get(skill, 0.0)
-                logger.info(f"     - {skill}: {count} cases blocked, {coverage:.1f}% coverage, +{impact} cases if hired")
-
-        logger.info("=" * 80)
+                impact = hiring_impact.get(skill, 0)
+                coverage = skill_coverage.get(skill, 0.0)
+                logger.info("     - %s: %d cases blocked, %.1f%% coverage, +%d cases if hired", skill, count, coverage, impact)
 
         return analysis
 
+    def _collect_route_paths(self, solution) -> List[List[int]]:
+        """
+        Read the node sequence of every vehicle route from the solver.
+
+        Each step crosses into the OR-Tools C++ layer, so the walk is done once per
+        vehicle with bound methods and a plain comparison against the route's end index
+        instead of routing.IsEnd().
+
+        Args:
+            solution: Assignment returned by the routing solver
+
+        Returns:
+            One list of node indices per vehicle, from start depot to end depot
+        """
+        start = self.routing.Start
+        end = self.routing.End
+        next_var = self.routing.NextVar
+        value = solution.Value
+        index_to_node = self.manager.IndexToNode
+
+        paths = []
+        for vehicle_idx in range(len(self.request.vehicles)):
+            index = start(vehicle_idx)
+            end_index = end(vehicle_idx)
+            path = [index_to_node(index)]
+            while index != end_index:
+                index = value(next_var(index))
+                path.append(index_to_node(index))
+            paths.append(path)
+
+        return paths
+
+    def _compute_route_legs(
+        self,
+        path: List[int]
+    ) -> Tuple[List[int], List[int], List[float], List[int], float, int]:
+        """
+        Compute travel data for a route with vectorized matrix lookups.
+
+        Args:
+            path: Node indices visited by a vehicle, from start depot to end depot
+
+        Returns:
+            Tuple of (case_positions, travel_times, distances, time_offsets, route_distance, route_time):
+            - case_positions: positions in path that are case locations
+            - travel_times / distances: from the previous node to each case location
+            - time_offsets: minutes from work start until each visit (travel + service of earlier visits)
+            - route_distance: total distance of all arcs, including the return to depot (km)
+            - route_time: total travel + service time of the visits (minutes)
+        """
+        nodes = np.asarray(path, dtype=np.intp)
+        route_distance = float(self.distance_matrix[nodes[:-1], nodes[1:]].sum())
+
+        is_case_node = self.case_node_mask
+        case_positions = [pos for pos in range(1, len(path)) if is_case_node[path[pos]]]
+        if not case_positions:
+            return [], [], [], [], route_distance, 0
+
+        positions = np.asarray(case_positions, dtype=np.intp)
+        from_nodes = nodes[positions - 1]
+        to_nodes = nodes[positions]
+
+        travel_times = self.time_matrix[from_nodes, to_nodes].astype(np.int64)
+        distances = self.distance_matrix[from_nodes, to_nodes]
+        durations = np.fromiter(
+            (self.location_to_case[path[pos]].estimated_duration for pos in case_positions),
+            dtype=np.int64,
+            count=len(case_positions)
+        )
+
+        # Each visit starts after the travel + service time of all earlier visits
+        step_times = travel_times + durations
+        cumulative = np.cumsum(step_times)
+        time_offsets = cumulative - step_times
+
+        return (
+            case_positions,
+            travel_times.tolist(),
+            distances.tolist(),
+            time_offsets.tolist(),
+            route_distance,
+            int(cumulative[-1])
+        )
+
     def _extract_solution(self, solution) -> OptimizationResult:
         """Extract the solution from OR-Tools"""
         routes = []
@@ -768,58 +891,49 @@ class ORToolsVRPStrategy:
         # Track assigned cases
         assigned_case_ids = set()
 
-        # Extract route for each vehicle
-        for vehicle_idx in range(len(self.request.vehicles)):
-            vehicle = self.request.vehicles[vehicle_idx]
-            index = self.routing.Start(vehicle_idx)
+        # Work start (8:00) is the same for every vehicle - compute it once
+        work_start = datetime.combine(self.request.date.date(), time(8, 0))
 
-            route_visits = []
-            route_distance = 0.0
-            route_time = 0
-            sequence = 0
-            last_node_index = self.manager.IndexToNode(index)  # Track previous node index
-
-            while not self.routing.IsEnd(index):
-                node_index = self.manager.IndexToNode(index)
-                next_index = solution.Value(self.routing.NextVar(index))
-                next_node_index = self.manager.IndexToNode(next_index)
-
-                # If this is a case location, add to route
-                if node_index in self.location_to_case:
-                    case = self.location_to_case[node_index]
-                    assigned_case_ids.add(case.id)
-
-                    # Calculate arrival time based on accumulated route time
-                    work_start = datetime.combine(self.request.date.date(), time(8, 0))
-                    arrival_time = work_start + timedelta(minutes=route_time)
-                    start_time = arrival_time
-                    end_time = start_time + timedelta(minutes=case.estimated_duration)
-
-                    # Travel distance and time from previous to current
-                    travel_time = self.time_matrix[last_node_index][node_index]
-                    distance = self.distance_matrix[last_node_index][node_index]
-
-                    visit = Visit(
-                        case=case,
-                        sequence=sequence,
-                        arrival_time=arrival_time,
-                        start_time=start_time,
-                        end_time=end_time,
-                        travel_time_from_previous=travel_time,
-                        distance_from_previous=distance
-                    )
-                    route_visits.append(visit)
+        # Node sequence of every vehicle, read from the solver in a single sweep
+        route_paths = self._collect_route_paths(solution)
 
-                    # Update route time for next visit
-                    route_time += travel_time + case.estimated_duration
-                    sequence += 1
+        # Extract route for each vehicle
+        for vehicle, path in zip(self.request.vehicles, route_paths):
+            # All numeric work for the route (arc lookups, accumulated times) in one vectorized pass
+            case_positions, travel_times, distances, time_offsets, route_distance, route_time = (
+                self._compute_route_legs(path)
+            )
 
-                # Accumulate distance
-                route_distance += self.distance_matrix[node_index][next_node_index]
+            vehicle_skills = self.vehicle_skills.get(vehicle.id, set())
+            missing_skills_per_visit = []
 
-                # Move to next node
-                last_node_index = node_index
-                index = next_index
+            route_visits = []
+            for sequence, (position, travel_time, distance, offset) in enumerate(
+                zip(case_positions, travel_times, distances, time_offsets)
+            ):
+                case = self.location_to_case[path[position]]
+                assigned_case_ids.add(case.id)
+
+                # Check skill coverage while building the route (replaces Route.validate_skills())
+                missing = self.case_required_skills[case.id] - vehicle_skills
+                if missing:
+                    missing_skills_per_visit.append(f"Case {case.id} missing: {set(missing)}")
+
+                # Arrival time based on accumulated route time before this visit
+                arrival_time = work_start + timedelta(minutes=offset)
+                start_time = arrival_time
+                end_time = start_time + timedelta(minutes=case.estimated_duration)
+
+                visit = Visit(
+                    case=case,
+                    sequence=sequence,
+                    arrival_time=arrival_time,
+                    start_time=start_time,
+                    end_time=end_time,
+                    travel_time_from_previous=travel_time,
+                    distance_from_previous=distance
+                )
+                route_visits.append(visit)
 
             # Only create route if it has visits
             if route_visits:
@@ -835,25 +949,13 @@ class ORToolsVRPStrategy:
                     total_time=route_time
                 )
 
-                # Validate skills
+                # Skill gaps collected above
                 # NOTE: Even with pre-assignment, OR-Tools may create routes where personnel don't have
                 # ALL skills for ALL visits (business reality). Mark as WARNING, not ERROR.
-                if not route.validate_skills():
-                    # Log details for debugging
-                    all_personnel_skills = set()
-                    for person in route.personnel:
-                        all_personnel_skills.update(person.skills)
-
-                    missing_skills_per_visit = []
-                    for visit in route.visits:
-                        required = set(visit.case.required_skills)
-                        missing = required - all_personnel_skills
-                        if missing:
-                            missing_skills_per_visit.append(f"Case {visit.case.id} missing: {missing}")
-
+                if missing_skills_per_visit:
                     logger.warning(
-                        f"Route for vehicle {vehicle.identifier} has skill gaps: "
-                        f"{'; '.join(missing_skills_per_visit)}"
+                        "Route for vehicle %s has skill gaps: %s",
+                        vehicle.identifier, '; '.join(missing_skills_per_visit)
                     )
 
                     violations.append(ConstraintViolation(
@@ -863,7 +965,7 @@ class ORToolsVRPStrategy:
                         entity_type="route",
                         severity="warning",  # Business reality: not all routes will have perfect skill coverage
                         details={
-                            "vehicle_skills": list(all_personnel_skills),
+                            "vehicle_skills": list(vehicle_skills),
                             "missing_skills_details": missing_skills_per_visit
                         }
                     ))
@@ -896,9 +998,13 @@ class ORToolsVRPStrategy:
         critical_violations = [v for v in violations if v.severity == "error"]
 
         # Debug logging
-        if violations:
-            print(f"⚠️  OR-Tools violations: {[f'{v.type.value}:{v.description}' for v in violations]}", flush=True)
-        print(f"📋 OR-Tools result: {len(routes)} routes, {len(assigned_case_ids)}/{len(self.request.cases)} assigned ({skill_gap_analysis.assignment_rate_percentage:.1f}% coverage)", flush=True)
+        if violations and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("OR-Tools violations: %s", [f"{v.type.value}:{v.description}" for v in violations])
+        logger.debug(
+            "OR-Tools result: %d routes, %d/%d assigned (%.1f%% coverage)",
+            len(routes), len(assigned_case_ids), len(self.request.cases),
+            skill_gap_analysis.assignment_rate_percentage
+        )
 
         # Build message
         if len(unassigned_cases) > 0:
@@ -5,17 +5,25 @@ Main service for route optimization. Orchestrates the optimization process,
 manages strategy selection, and persists results to the database.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
+import time as time_module
 from typing import List, Optional, Dict, Tuple
-from datetime import datetime
-from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+import numpy as np
+from geoalchemy2 import Geometry
+from sqlalchemy import cast, func, insert
+from sqlalchemy.orm import Session, selectinload
 
-from app.models.case import Case as CaseModel
+from app.models.case import Case as CaseModel, CareType as CareTypeModel, CaseStatus
 from app.models.vehicle import Vehicle as VehicleModel
 from app.models.personnel import Personnel as PersonnelModel
 from app.models.route import Route as RouteModel, RouteStatus
 from app.models.route import RoutePersonnel, Visit as VisitModel, VisitStatus
 from app.models.optimization_metrics import OptimizationMetrics
+from app.services.distance.models import DistanceMatrix, Location as DistLocation
 from app.services.distance.providers import HaversineProvider
 
 from .models import (
@@ -34,6 +42,55 @@ from .heuristic_strategy import HeuristicStrategy
 
 logger = logging.getLogger(__name__)
 
+# In-process cache of Google Maps traffic matrices, keyed by locations and departure hour.
+# Re-optimizations of the same plan reuse the matrix instead of calling the paid API again.
+TRAFFIC_MATRIX_CACHE_TTL_SECONDS = 3600
+TRAFFIC_MATRIX_CACHE_MAX_ENTRIES = 128
+_traffic_matrix_cache: Dict[str, Tuple[float, DistanceMatrix]] = {}
+
+# Simulated traffic multiplier for each hour of the day (1.0 = no traffic, 1.5 = 50% slower)
+_RUSH_HOUR_MULTIPLIERS = {
+    7: 1.3,   # Morning build-up
+    8: 1.5,   # Morning rush hour
+    9: 1.4,   # Morning rush hour
+    12: 1.2,  # Lunch hour
+    13: 1.2,  # Lunch hour
+    17: 1.4,  # Evening rush start
+    18: 1.5,  # Evening rush hour
+    19: 1.4,  # Evening rush hour
+}
+TRAFFIC_MULTIPLIER_BY_HOUR: Tuple[float, ...] = tuple(
+    _RUSH_HOUR_MULTIPLIERS.get(hour, 1.1)  # Default slight traffic
+    for hour in range(24)
+)
+
+
+def _point_coordinates(column):
+    """
+    Latitude and longitude of a geography POINT column, computed by PostGIS
+
+    ST_X/ST_Y only accept geometry, and geography is never cast implicitly.
+    """
+    point = cast(column, Geometry(geometry_type="POINT", srid=4326))
+    return func.ST_Y(point), func.ST_X(point)
+
+
+def _failure_result(description: str, message: str) -> OptimizationResult:
+    """Build an unsuccessful OptimizationResult with a single infeasibility violation"""
+    return OptimizationResult(
+        success=False,
+        routes=[],
+        unassigned_cases=[],
+        constraint_violations=[
+            ConstraintViolation(
+                type=ConstraintType.INFEASIBLE,
+                description=description,
+                severity="error"
+            )
+        ],
+        message=message
+    )
+
 
 class OptimizationService:
     """
@@ -92,84 +149,86 @@ class OptimizationService:
         Returns:
             OptimizationResult with optimized routes
         """
-        print(f"🚀 OPTIMIZATION START: cases={len(case_ids)}, vehicles={len(vehicle_ids)}, use_heuristic={use_heuristic}", flush=True)
         logger.info(f"🚀 OPTIMIZATION START: cases={len(case_ids)}, vehicles={len(vehicle_ids)}, use_heuristic={use_heuristic}")
         try:
+            # Ignore repeated IDs (keeping first-seen order) so duplicates are not reported as missing
+            case_ids = list(dict.fromkeys(case_ids))
+            vehicle_ids = list(dict.fromkeys(vehicle_ids))
+
             logger.info(f"Starting route optimization for {len(case_ids)} cases and {len(vehicle_ids)} vehicles")
 
             # Fetch cases from database (allow pending or assigned cases for re-optimization)
-            cases_db = self.db.query(CaseModel).filter(
+            # Eager-load patient, care type and its skills so conversion does not lazy-load per case,
+            # and let PostGIS return coordinates as floats so no WKB is parsed in Python
+            case_rows = self.db.query(
+                CaseModel,
+                *_point_coordinates(CaseModel.location)
+            ).options(
+                selectinload(CaseModel.patient),
+                selectinload(CaseModel.care_type).selectinload(CareTypeModel.required_skills)
+            ).filter(
                 CaseModel.id.in_(case_ids),
                 CaseModel.status.in_(["pending", "assigned"])
             ).all()
+            cases_db = [case_db for case_db, _, _ in case_rows]
 
             if len(cases_db) != len(case_ids):
-                missing_count = len(case_ids) - len(cases_db)
-                return OptimizationResult(
-                    success=False,
-                    routes=[],
-                    unassigned_cases=[],
-                    constraint_violations=[
-                        ConstraintViolation(
-                            type=ConstraintType.INFEASIBLE,
-                            description=f"Some cases not found or have invalid status. Found {len(cases_db)} of {len(case_ids)} cases. Make sure cases are in 'pending' or 'assigned' status.",
-                            severity="error"
-                        )
-                    ],
-                    message="Invalid cases"
+                missing_ids = sorted(set(case_ids) - {case_db.id for case_db in cases_db})
+                return _failure_result(
+                    f"Some cases not found or have invalid status. Found {len(cases_db)} of {len(case_ids)} cases (missing IDs: {missing_ids}). Make sure cases are in 'pending' or 'assigned' status.",
+                    "Invalid cases"
                 )
 
             # Fetch vehicles from database
-            vehicles_db = self.db.query(VehicleModel).filter(
+            vehicle_rows = self.db.query(
+                VehicleModel,
+                *_point_coordinates(VehicleModel.base_location)
+            ).filter(
                 VehicleModel.id.in_(vehicle_ids),
                 VehicleModel.is_active == True
             ).all()
+            vehicles_db = [vehicle_db for vehicle_db, _, _ in vehicle_rows]
 
             if len(vehicles_db) != len(vehicle_ids):
-                return OptimizationResult(
-                    success=False,
-                    routes=[],
-                    unassigned_cases=[],
-                    constraint_violations=[
-                        ConstraintViolation(
-                            type=ConstraintType.INFEASIBLE,
-                            description="Some vehicles not found or not active",
-                            severity="error"
-                        )
-                    ],
-                    message="Invalid vehicles"
+                missing_ids = sorted(set(vehicle_ids) - {vehicle_db.id for vehicle_db in vehicles_db})
+                return _failure_result(
+                    f"Some vehicles not found or not active (missing IDs: {missing_ids})",
+                    "Invalid vehicles"
                 )
 
-            # Fetch all active personnel
-            personnel_db = self.db.query(PersonnelModel).filter(
+            # Fetch all active personnel (with skills, used by conversion)
+            personnel_rows = self.db.query(
+                PersonnelModel,
+                *_point_coordinates(PersonnelModel.start_location)
+            ).options(
+                selectinload(PersonnelModel.skills)
+            ).filter(
                 PersonnelModel.is_active == True
             ).all()
+            personnel_db = [person_db for person_db, _, _ in personnel_rows]
 
             if not personnel_db:
-                return OptimizationResult(
-                    success=False,
-                    routes=[],
-                    unassigned_cases=[],
-                    constraint_violations=[
-                        ConstraintViolation(
-                            type=ConstraintType.INFEASIBLE,
-                            description="No active personnel available",
-                            severity="error"
-                        )
-                    ],
-                    message="No personnel available"
+                return _failure_result(
+                    "No active personnel available",
+                    "No personnel available"
                 )
 
+            # Start fetching distance and time matrices (vehicle depots first, then cases)
+            # so the distance API round trip overlaps with the domain model conversion
+            coordinates = [(lat, lon) for _, lat, lon in vehicle_rows] + [(lat, lon) for _, lat, lon in case_rows]
+            matrices_task = asyncio.create_task(self._get_distance_matrices(coordinates))
+            await asyncio.sleep(0)  # Let the task issue its request before converting
+
             # Convert to optimization domain models
-            cases = self._convert_cases(cases_db)
-            vehicles = self._convert_vehicles(vehicles_db)
-            personnel = self._convert_personnel(personnel_db)
-
-            # Get distance and time matrices
-            distance_matrix, time_matrix = await self._get_distance_matrices(
-                cases,
-                vehicles
-            )
+            try:
+                cases = self._convert_cases(case_rows)
+                vehicles = self._convert_vehicles(vehicle_rows)
+                personnel = self._convert_personnel(personnel_rows)
+            except Exception:
+                matrices_task.cancel()
+                raise
+
+            distance_matrix, time_matrix = await matrices_task
 
             # Create optimization request
             request = OptimizationRequest(
@@ -186,14 +245,11 @@ class OptimizationService:
             # Execute optimization
             # ALWAYS use OR-Tools strategy (no fallback to heuristic)
             # Partial optimization (some unassigned cases) is acceptable for business
-            print(f"🔍 Strategy: OR-Tools only (use_heuristic parameter ignored, fallback disabled)", flush=True)
             logger.info(f"🔍 Using OR-Tools strategy exclusively (no heuristic fallback)")
 
-            print("✅ Using OR-Tools strategy", flush=True)
             logger.info("Using OR-Tools strategy")
             result = self.ortools_strategy.optimize(request)
 
-            print(f"📊 OR-Tools result: success={result.success}, routes={len(result.routes)}, unassigned={len(result.unassigned_cases)}", flush=True)
             logger.info(f"OR-Tools result: success={result.success}, routes={len(result.routes)}, unassigned={len(result.unassigned_cases)}, violations={len(result.constraint_violations)}")
 
             # NO FALLBACK TO HEURISTIC
@@ -209,37 +265,33 @@ class OptimizationService:
 
         except Exception as e:
             logger.error(f"Optimization service error: {e}", exc_info=True)
-            return OptimizationResult(
-                success=False,
-                routes=[],
-                unassigned_cases=[],
-                constraint_violations=[
-                    ConstraintViolation(
-                        type=ConstraintType.INFEASIBLE,
-                        description=f"Service error: {str(e)}",
-                        severity="error"
-                    )
-                ],
-                message=f"Optimization failed: {str(e)}"
+            return _failure_result(
+                f"Service error: {str(e)}",
+                f"Optimization failed: {str(e)}"
             )
 
-    def _convert_cases(self, cases_db: List[CaseModel]) -> List[Case]:
-        """Convert database Case models to optimization Case models"""
-        from geoalchemy2.shape import to_shape
-
+    def _convert_cases(self, case_rows: List[Tuple[CaseModel, float, float]]) -> List[Case]:
+        """Convert (Case, latitude, longitude) rows to optimization Case models"""
         cases = []
-        for case_db in cases_db:
-            # Extract coordinates from PostGIS Point
-            point = to_shape(case_db.location)
-            location = Location(latitude=point.y, longitude=point.x)
+        # Few care types are shared by many cases, so build each skill list once
+        skills_by_care_type: Dict[int, List[str]] = {}
+        for case_db, latitude, longitude in case_rows:
+            location = Location(latitude=latitude, longitude=longitude)
 
             # Get required skills from care type
-            required_skills = [skill.name for skill in case_db.care_type.required_skills]
+            required_skills = skills_by_care_type.get(case_db.care_type_id)
+            if required_skills is None:
+                required_skills = [skill.name for skill in case_db.care_type.required_skills]
+                skills_by_care_type[case_db.care_type_id] = required_skills
 
             # Parse time window - extract time part from datetime
-            from datetime import time as time_type
-            tw_start = case_db.time_window_start.time() if isinstance(case_db.time_window_start, datetime) else case_db.time_window_start
-            tw_end = case_db.time_window_end.time() if isinstance(case_db.time_window_end, datetime) else case_db.time_window_end
+            # (DateTime columns always load as datetime; only NULL needs handling)
+            tw_start = case_db.time_window_start
+            tw_end = case_db.time_window_end
+            if tw_start is not None:
+                tw_start = tw_start.time()
+            if tw_end is not None:
+                tw_end = tw_end.time()
 
             time_window = TimeWindow(
                 start=tw_start,
@@ -263,15 +315,11 @@ class OptimizationService:
 
         return cases
 
-    def _convert_vehicles(self, vehicles_db: List[VehicleModel]) -> List[Vehicle]:
-        """Convert database Vehicle models to optimization Vehicle models"""
-        from geoalchemy2.shape import to_shape
-
+    def _convert_vehicles(self, vehicle_rows: List[Tuple[VehicleModel, float, float]]) -> List[Vehicle]:
+        """Convert (Vehicle, latitude, longitude) rows to optimization Vehicle models"""
         vehicles = []
-        for vehicle_db in vehicles_db:
-            # Extract coordinates from PostGIS Point
-            point = to_shape(vehicle_db.base_location)
-            location = Location(latitude=point.y, longitude=point.x)
+        for vehicle_db, latitude, longitude in vehicle_rows:
+            location = Location(latitude=latitude, longitude=longitude)
 
             vehicle = Vehicle(
                 id=vehicle_db.id,
@@ -286,23 +334,23 @@ class OptimizationService:
 
         return vehicles
 
-    def _convert_personnel(self, personnel_db: List[PersonnelModel]) -> List[Personnel]:
-        """Convert database Personnel models to optimization Personnel models"""
-        from geoalchemy2.shape import to_shape
-
+    def _convert_personnel(
+        self,
+        personnel_rows: List[Tuple[PersonnelModel, Optional[float], Optional[float]]]
+    ) -> List[Personnel]:
+        """Convert (Personnel, latitude, longitude) rows to optimization Personnel models"""
         personnel_list = []
-        for person_db in personnel_db:
-            # Extract coordinates from PostGIS Point (if present)
-            # Note: start_location is optional and not used in current optimization
-            if person_db.start_location is not None:
-                point = to_shape(person_db.start_location)
-                location = Location(latitude=point.y, longitude=point.x)
+        for person_db, latitude, longitude in personnel_rows:
+            # Coordinates are NULL when the optional start_location is not set
+            # Note: start_location is not used in current optimization
+            if latitude is not None:
+                location = Location(latitude=latitude, longitude=longitude)
             else:
                 # Default location (not used in optimization, but required by domain model)
                 location = Location(latitude=0.0, longitude=0.0)
 
-            # Get skills
-            skills = [skill.name for skill in person_db.skills]
+            # Get skills (as a set: strategies only test membership and take unions)
+            skills = frozenset(skill.name for skill in person_db.skills)
 
             personnel = Personnel(
                 id=person_db.id,
@@ -319,40 +367,48 @@ class OptimizationService:
 
     async def _get_distance_matrices(
         self,
-        cases: List[Case],
-        vehicles: List[Vehicle]
-    ) -> Tuple[Dict[Tuple[int, int], float], Dict[Tuple[int, int], int]]:
+        coordinates: List[Tuple[float, float]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Get distance and time matrices for all locations with TRAFFIC consideration.
 
+        Args:
+            coordinates: (latitude, longitude) pairs, vehicle depots first, then cases
+
         Returns:
-            Tuple of (distance_matrix, time_matrix with traffic)
+            Tuple of (distance_matrix in km, time_matrix in minutes with traffic),
+            both n x n arrays indexed [from, to]
         """
-        from app.services.distance.models import Location as DistLocation
-        from datetime import time as time_type
-        import time
+        # A single depot with no cases has nothing to route between
+        n = len(coordinates)
+        if n <= 1:
+            return np.zeros((n, n), dtype=np.float64), np.zeros((n, n), dtype=np.int32)
 
-        # Collect all locations and convert to distance service format
-        opt_locations = [v.base_location for v in vehicles] + [c.location for c in cases]
+        # Convert coordinates to distance service format
         dist_locations = [
-            DistLocation(latitude=loc.latitude, longitude=loc.longitude)
-            for loc in opt_locations
+            DistLocation(latitude=latitude, longitude=longitude)
+            for latitude, longitude in coordinates
         ]
 
         # Try to use Google Maps with traffic
         if self.use_traffic and self.google_maps_provider:
             try:
                 # Calculate departure time (default to 8 AM tomorrow for rush hour simulation)
-                from datetime import datetime, timedelta
                 tomorrow_8am = datetime.now().replace(hour=8, minute=0, second=0, microsecond=0) + timedelta(days=1)
-                departure_timestamp = int(time.mktime(tomorrow_8am.timetuple()))
-
-                logger.info(f"Calculating distance matrix with TRAFFIC data (departure: {tomorrow_8am.strftime('%Y-%m-%d %H:%M')})")
-                matrix = await self.google_maps_provider.calculate_with_traffic(
-                    dist_locations,
-                    departure_time=departure_timestamp
-                )
-                logger.info("Successfully obtained traffic-aware distance matrix from Google Maps")
+                departure_timestamp = int(time_module.mktime(tomorrow_8am.timetuple()))
+
+                cache_key = self._traffic_matrix_cache_key(dist_locations, departure_timestamp)
+                matrix = self._get_cached_traffic_matrix(cache_key)
+                if matrix is not None:
+                    logger.info("Using cached traffic-aware distance matrix")
+                else:
+                    logger.info(f"Calculating distance matrix with TRAFFIC data (departure: {tomorrow_8am.strftime('%Y-%m-%d %H:%M')})")
+                    matrix = await self.google_maps_provider.calculate_with_traffic(
+                        dist_locations,
+                        departure_time=departure_timestamp
+                    )
+                    self._store_cached_traffic_matrix(cache_key, matrix)
+                    logger.info("Successfully obtained traffic-aware distance matrix from Google Maps")
             except Exception as e:
                 logger.warning(f"Failed to get traffic data from Google Maps: {e}, falling back to Haversine")
                 matrix = await self.distance_provider.calculate_matrix(dist_locations)
@@ -362,52 +418,68 @@ class OptimizationService:
             matrix = await self.distance_provider.calculate_matrix(dist_locations)
             matrix = self._apply_traffic_simulation(matrix)
 
-        # Build dictionary matrices
-        distance_matrix = {}
-        time_matrix = {}
-
-        n = len(dist_locations)
-        for i in range(n):
-            for j in range(n):
-                travel_time = matrix.get_travel_time(i, j)
-                distance_matrix[(i, j)] = travel_time.distance_km
-                time_matrix[(i, j)] = travel_time.duration_minutes
+        # Build array matrices (km as float64, whole minutes as int32) in bulk
+        distance_matrix = np.asarray(matrix.distances_meters, dtype=np.float64) / 1000.0
+        time_matrix = np.rint(
+            np.asarray(matrix.durations_seconds, dtype=np.float64) / 60.0
+        ).astype(np.int32)
 
         return distance_matrix, time_matrix
 
+    @staticmethod
+    def _traffic_matrix_cache_key(locations, departure_timestamp: int) -> str:
+        """
+        Build the cache key for a traffic matrix.
+
+        Locations keep their order (the matrix is indexed by position) and are
+        rounded to 5 decimals (~1 m); the departure time is truncated to the hour.
+        """
+        coords = [(round(loc.latitude, 5), round(loc.longitude, 5)) for loc in locations]
+        payload = json.dumps([coords, departure_timestamp // 3600])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def _get_cached_traffic_matrix(cache_key: str) -> Optional[DistanceMatrix]:
+        """Return a cached traffic matrix if present and not expired"""
+        entry = _traffic_matrix_cache.get(cache_key)
+        if entry is None:
+            return None
+
+        stored_at, matrix = entry
+        if time_module.monotonic() - stored_at > TRAFFIC_MATRIX_CACHE_TTL_SECONDS:
+            del _traffic_matrix_cache[cache_key]
+            return None
+
+        return matrix
+
+    @staticmethod
+    def _store_cached_traffic_matrix(cache_key: str, matrix: DistanceMatrix) -> None:
+        """Store a traffic matrix, evicting the oldest entry when the cache is full"""
+        if len(_traffic_matrix_cache) >= TRAFFIC_MATRIX_CACHE_MAX_ENTRIES:
+            oldest_key = min(_traffic_matrix_cache, key=lambda key: _traffic_matrix_cache[key][0])
+            del _traffic_matrix_cache[oldest_key]
+
+        _traffic_matrix_cache[cache_key] = (time_module.monotonic(), matrix)
+
     def _apply_traffic_simulation(self, matrix):
         """
         Apply traffic simulation to matrix based on typical urban traffic patterns.
         Increases travel times during rush hours.
         """
-        from datetime import datetime
-
         # Get current hour (or use 8 AM for morning rush simulation)
         current_hour = datetime.now().hour
         if current_hour < 6 or current_hour > 22:
             current_hour = 8  # Default to morning rush
 
-        # Traffic multipliers by hour (1.0 = no traffic, 1.5 = 50% slower)
-        traffic_multipliers = {
-            7: 1.3,   # Morning build-up
-            8: 1.5,   # Morning rush hour
-            9: 1.4,   # Morning rush hour
-            12: 1.2,  # Lunch hour
-            13: 1.2,  # Lunch hour
-            17: 1.4,  # Evening rush start
-            18: 1.5,  # Evening rush hour
-            19: 1.4,  # Evening rush hour
-        }
-
-        multiplier = traffic_multipliers.get(current_hour, 1.1)  # Default slight traffic
+        multiplier = TRAFFIC_MULTIPLIER_BY_HOUR[current_hour]
         logger.info(f"Applying traffic simulation: {multiplier}x multiplier for hour {current_hour}")
 
-        # Apply multiplier to duration matrix
-        n = len(matrix.durations_seconds)
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    matrix.durations_seconds[i][j] *= multiplier
+        # Apply multiplier to every off-diagonal duration in one array operation
+        durations = np.array(matrix.durations_seconds, dtype=np.float64)
+        diagonal = durations.diagonal().copy()
+        durations *= multiplier
+        np.fill_diagonal(durations, diagonal)
+        matrix.durations_seconds = durations.tolist()
 
         return matrix
 
@@ -418,24 +490,48 @@ class OptimizationService:
         vehicles_db: List[VehicleModel],
         personnel_db: List[PersonnelModel]
     ):
-        """Persist optimization results to database"""
-        import json
+        """
+        Persist optimization results to database.
 
+        The session is synchronous, so the inserts and commit run in a worker
+        thread to keep the event loop free. The call is still awaited because
+        the API reads the created routes back right after optimization.
+        """
+        await asyncio.to_thread(
+            self._persist_routes_sync,
+            result,
+            cases_db,
+            vehicles_db,
+            personnel_db
+        )
+
+    def _persist_routes_sync(
+        self,
+        result: OptimizationResult,
+        cases_db: List[CaseModel],
+        vehicles_db: List[VehicleModel],
+        personnel_db: List[PersonnelModel]
+    ):
+        """Persist optimization results to database (blocking)"""
         try:
             # Create maps for easy lookup
-            case_map = {c.id: c for c in cases_db}
             vehicle_map = {v.id: v for v in vehicles_db}
             personnel_map = {p.id: p for p in personnel_db}
 
+            # Rows for the child tables, inserted in bulk once all routes have IDs
+            route_personnel_rows = []
+            visit_rows = []
+            assigned_case_ids = set()
+
+            # Convert metadata dict to JSON string (same summary for every route)
+            metadata_str = json.dumps(result.get_summary())
+
             # Create routes
             for route in result.routes:
                 # Create route record
                 # Handle both datetime and date objects
                 route_date = route.date.date() if isinstance(route.date, datetime) else route.date
 
-                # Convert metadata dict to JSON string
-                metadata_str = json.dumps(result.get_summary())
-
                 route_db = RouteModel(
                     vehicle_id=route.vehicle.id,
                     route_date=route_date,
@@ -449,28 +545,22 @@ class OptimizationService:
 
                 # Associate personnel with route
                 for person in route.personnel:
-                    route_personnel = RoutePersonnel(
-                        route_id=route_db.id,
-                        personnel_id=person.id
-                    )
-                    self.db.add(route_personnel)
+                    route_personnel_rows.append({
+                        "route_id": route_db.id,
+                        "personnel_id": person.id
+                    })
 
                 # Create visits
                 for visit in route.visits:
-                    visit_db = VisitModel(
-                        route_id=route_db.id,
-                        case_id=visit.case.id,
-                        sequence_number=visit.sequence,
-                        estimated_arrival_time=visit.arrival_time,
-                        estimated_departure_time=visit.end_time,
-                        status=VisitStatus.PENDING
-                    )
-                    self.db.add(visit_db)
-
-                    # Update case status to assigned
-                    case_db = case_map.get(visit.case.id)
-                    if case_db:
-                        case_db.status = "assigned"
+                    visit_rows.append({
+                        "route_id": route_db.id,
+                        "case_id": visit.case.id,
+                        "sequence_number": visit.sequence,
+                        "estimated_arrival_time": visit.arrival_time,
+                        "estimated_departure_time": visit.end_time,
+                        "status": VisitStatus.PENDING
+                    })
+                    assigned_case_ids.add(visit.case.id)
 
                 # Save optimization metrics for this route
                 if result.skill_gap_analysis:
@@ -491,6 +581,18 @@ class OptimizationService:
                     )
                     self.db.add(metrics_record)
 
+            # Insert personnel assignments and visits in one executemany each
+            if route_personnel_rows:
+                self.db.execute(insert(RoutePersonnel), route_personnel_rows)
+            if visit_rows:
+                self.db.execute(insert(VisitModel), visit_rows)
+
+            # Mark all visited cases as assigned with a single UPDATE
+            if assigned_case_ids:
+                self.db.query(CaseModel).filter(
+                    CaseModel.id.in_(assigned_case_ids)
+                ).update({"status": CaseStatus.ASSIGNED}, synchronize_session=False)
+
             # Also save overall optimization metrics (not linked to specific route)
             # This captures optimization runs even if they fail completely
             if result.skill_gap_analysis:
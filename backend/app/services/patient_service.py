@@ -3,7 +3,7 @@ Patient Service
 Business logic for patient management
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple, Dict, Any
 from sqlalchemy.orm import Session
 import logging
 
@@ -13,28 +13,47 @@ from app.schemas.common import LocationSchema
 from app.models.patient import Patient
 from app.core.exceptions import NotFoundException
 from app.services.audit_service import AuditService
-from app.services.geocoding.geocoding_service import GeocodingService
+from app.services.location_mixin import LocationMixin
+from app.services.geocoding.geocoding_service import get_geocoding_service
+from app.services.geocoding.geocoding_cache import GeocodingCache
+from app.services.geocoding.base_geocoder import GeocodingResult
 
 logger = logging.getLogger(__name__)
 
+# Schema fields that are not copied straight onto the Patient model
+_PATIENT_EXCLUDE = frozenset({"location", "date_of_birth"})
 
-class PatientService:
+
+class PatientService(LocationMixin):
     """Service for Patient business logic"""
 
     def __init__(self, db: Session):
         self.db = db
         self.patient_repo = PatientRepository(db)
         self.audit_service = AuditService(db)
-        self.geocoding_service = GeocodingService()
+        self.geocoding_service = get_geocoding_service()
+        self.geocoding_cache = GeocodingCache(db)
+
+    async def _geocode_address(self, address: str) -> Optional[GeocodingResult]:
+        """
+        Geocode a Chilean address, serving repeated addresses from the cache
+
+        Args:
+            address: Address string to geocode
+
+        Returns:
+            GeocodingResult if successful, None if geocoding failed
+        """
+        cached = self.geocoding_cache.get(address, country="CL")
+        if cached:
+            logger.info(f"Using cached geocoding result for address: {address}")
+            return cached
 
-    def _location_to_wkt(self, location: LocationSchema) -> str:
-        """Convert LocationSchema to WKT Point"""
-        return f"POINT({location.longitude} {location.latitude})"
+        geocoding_result = await self.geocoding_service.geocode_address(address, country="CL")
+        if geocoding_result:
+            self.geocoding_cache.set(address, geocoding_result, country="CL")
 
-    def _wkt_to_location(self, wkt: str) -> LocationSchema:
-        """Convert WKT Point to LocationSchema"""
-        coords = wkt.replace("POINT(", "").replace(")", "").split()
-        return LocationSchema(longitude=float(coords[0]), latitude=float(coords[1]))
+        return geocoding_result
 
     async def create_patient(
         self,
@@ -69,7 +88,7 @@ class PatientService:
         elif patient_in.address:
             # Geocode address to get coordinates
             logger.info(f"Geocoding address for new patient: {patient_in.address}")
-            geocoding_result = await self.geocoding_service.geocode_address(patient_in.address, country="CL")
+            geocoding_result = await self._geocode_address(patient_in.address)
 
             if not geocoding_result:
                 raise Exception(f"No se pudo geocodificar la dirección: {patient_in.address}")
@@ -88,12 +107,104 @@ class PatientService:
             # This should never happen due to model_validator in PatientCreate
             raise ValueError("Debe proporcionar 'location' o 'address'")
 
-        # Convert location to WKT
-        location_wkt = self._location_to_wkt(location_schema)
+        patient_dict = self._build_patient_dict(patient_in, location_schema, geocoded_address)
+        patient = self.patient_repo.create(patient_dict)
+
+        # Log audit
+        self.audit_service.log_create("patient", patient.id, user_id)
+
+        logger.info(f"Created patient {patient.id} with RUT: {patient.rut}")
+
+        return patient
+
+    async def create_patients_bulk(
+        self,
+        patients_in: List[PatientCreate],
+        user_id: Optional[int] = None
+    ) -> Tuple[List[int], List[PatientCreate]]:
+        """
+        Create many patients at once (e.g. imports)
+
+        Addresses not already cached are geocoded concurrently (each distinct
+        normalized address once), and all patients are inserted with a single
+        statement. Patients whose address cannot be geocoded are skipped and
+        returned so the caller can report or retry them.
+
+        Args:
+            patients_in: Patient creation data
+            user_id: ID of user creating the patients
+
+        Returns:
+            Tuple of (created patient IDs, patients that failed geocoding)
+        """
+        # Group addresses by normalized form so spelling variants of the same
+        # address are resolved once, cache first
+        address_by_key: Dict[str, str] = {}
+        for patient_in in patients_in:
+            if not patient_in.location and patient_in.address:
+                key = GeocodingCache.normalize_address(patient_in.address, "CL")
+                address_by_key.setdefault(key, patient_in.address)
+
+        geocoded: Dict[str, Any] = {}
+        pending_keys = []
+        for key, address in address_by_key.items():
+            cached = self.geocoding_cache.get(address, country="CL")
+            if cached:
+                geocoded[key] = cached
+            else:
+                pending_keys.append(key)
+
+        if pending_keys:
+            logger.info(f"Geocoding {len(pending_keys)} distinct addresses for bulk patient creation")
+            pending = [address_by_key[key] for key in pending_keys]
+            results = await self.geocoding_service.geocode_addresses(pending, country="CL")
+            for key, address, geocoding_result in zip(pending_keys, pending, results):
+                if geocoding_result:
+                    geocoded[key] = geocoding_result
+                    self.geocoding_cache.set(address, geocoding_result, country="CL")
+
+        rows = []
+        failed = []
+        for patient_in in patients_in:
+            if patient_in.location:
+                rows.append(self._build_patient_dict(patient_in, patient_in.location, None))
+                continue
+
+            geocoding_result = None
+            if patient_in.address:
+                geocoding_result = geocoded.get(GeocodingCache.normalize_address(patient_in.address, "CL"))
+            if not geocoding_result:
+                failed.append(patient_in)
+                continue
+
+            location_schema = LocationSchema(
+                latitude=geocoding_result.latitude,
+                longitude=geocoding_result.longitude
+            )
+            rows.append(self._build_patient_dict(patient_in, location_schema, geocoding_result.formatted_address))
+
+        patient_ids = self.patient_repo.bulk_create(rows)
+
+        # Log audit
+        if patient_ids:
+            self.audit_service.log_create_bulk("patient", patient_ids, user_id)
+
+        if failed:
+            logger.warning(f"Could not geocode {len(failed)} patient addresses during bulk creation")
+        logger.info(f"Created {len(patient_ids)} patients in bulk")
 
+        return patient_ids, failed
+
+    def _build_patient_dict(
+        self,
+        patient_in: PatientCreate,
+        location_schema: LocationSchema,
+        geocoded_address: Optional[str]
+    ) -> Dict[str, Any]:
+        """Build the patient model attributes from creation data and a resolved location"""
         # Create patient (exclude location and date_of_birth)
-        patient_dict = patient_in.model_dump(exclude={"location", "date_of_birth"})
-        patient_dict["location"] = location_wkt
+        patient_dict = patient_in.model_dump(exclude=_PATIENT_EXCLUDE)
+        patient_dict["location"] = self._location_to_point(location_schema)
 
         # If address was geocoded, store the formatted address
         if geocoded_address and not patient_dict.get("address"):
@@ -103,14 +214,7 @@ class PatientService:
         if "medical_notes" in patient_dict:
             patient_dict["notes"] = patient_dict.pop("medical_notes")
 
-        patient = self.patient_repo.create(patient_dict)
-
-        # Log audit
-        self.audit_service.log_create("patient", patient.id, user_id)
-
-        logger.info(f"Created patient {patient.id} with RUT: {patient.rut}")
-
-        return patient
+        return patient_dict
 
     def get_patient(self, patient_id: int) -> Patient:
         """
@@ -182,21 +286,20 @@ class PatientService:
             NotFoundException: If patient not found
             Exception: If geocoding fails
         """
-        # Check if patient exists
-        patient = self.get_patient(patient_id)
-
-        # Update patient (exclude location and date_of_birth)
-        update_dict = patient_in.model_dump(exclude_unset=True, exclude={"location", "date_of_birth"})
+        # Dump once: the full dump is logged for audit, the filtered copy is
+        # the update (excludes location and date_of_birth)
+        changes = patient_in.model_dump(exclude_unset=True)
+        update_dict = {k: v for k, v in changes.items() if k not in _PATIENT_EXCLUDE}
 
         # Handle location update
         if patient_in.location:
             # Use explicit coordinates
-            update_dict["location"] = self._location_to_wkt(patient_in.location)
+            update_dict["location"] = self._location_to_point(patient_in.location)
             logger.info(f"Updating patient {patient_id} with explicit coordinates")
         elif patient_in.address:
             # Geocode address to get coordinates
             logger.info(f"Geocoding address for patient {patient_id}: {patient_in.address}")
-            geocoding_result = await self.geocoding_service.geocode_address(patient_in.address, country="CL")
+            geocoding_result = await self._geocode_address(patient_in.address)
 
             if not geocoding_result:
                 raise Exception(f"No se pudo geocodificar la dirección: {patient_in.address}")
@@ -205,7 +308,7 @@ class PatientService:
                 latitude=geocoding_result.latitude,
                 longitude=geocoding_result.longitude
             )
-            update_dict["location"] = self._location_to_wkt(location_schema)
+            update_dict["location"] = self._location_to_point(location_schema)
 
             # Store formatted address
             update_dict["address"] = geocoding_result.formatted_address
@@ -219,10 +322,17 @@ class PatientService:
         if "medical_notes" in update_dict:
             update_dict["notes"] = update_dict.pop("medical_notes")
 
+        # Nothing to write (e.g. only excluded fields were sent)
+        if not update_dict:
+            return self.get_patient(patient_id)
+
+        # UPDATE ... RETURNING doubles as the existence check
         updated_patient = self.patient_repo.update(patient_id, update_dict)
+        if updated_patient is None:
+            raise NotFoundException(f"Patient with ID {patient_id} not found")
 
         # Log audit
-        self.audit_service.log_update("patient", patient_id, user_id, patient_in.model_dump(exclude_unset=True))
+        self.audit_service.log_update("patient", patient_id, user_id, changes)
 
         logger.info(f"Updated patient {patient_id}")
 
@@ -246,23 +356,25 @@ class PatientService:
         Raises:
             NotFoundException: If patient not found
         """
-        # Check if patient exists
-        patient = self.get_patient(patient_id)
-
-        # Delete patient
-        result = self.patient_repo.delete(patient_id)
+        # The DELETE's row count doubles as the existence check
+        if not self.patient_repo.delete(patient_id):
+            raise NotFoundException(f"Patient with ID {patient_id} not found")
 
         # Log audit
-        if result:
-            self.audit_service.log_delete("patient", patient_id, user_id)
+        self.audit_service.log_delete("patient", patient_id, user_id)
 
-        return result
+        return True
 
-    def count_patients(self) -> int:
+    def count_patients(self, exact: bool = False) -> int:
         """
         Count patients
 
+        Args:
+            exact: Force an exact COUNT(*) instead of the planner estimate
+
         Returns:
-            Number of patients
+            Number of patients (approximate for large tables unless exact)
         """
-        return self.patient_repo.count()
+        if exact:
+            return self.patient_repo.count()
+        return self.patient_repo.count_estimate()
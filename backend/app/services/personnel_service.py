@@ -3,20 +3,22 @@ Personnel Service
 Business logic for personnel management
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
-from geoalchemy2.elements import WKTElement
 
 from app.repositories.personnel_repository import PersonnelRepository
 from app.schemas.personnel import PersonnelCreate, PersonnelUpdate
-from app.schemas.common import LocationSchema
 from app.models.personnel import Personnel
 from app.core.exceptions import NotFoundException, ValidationException
 from app.services.audit_service import AuditService
+from app.services.location_mixin import LocationMixin
 from app.services.skill_service import SkillService
 
+# Schema fields that are not copied straight onto the Personnel model
+_PERSONNEL_EXCLUDE = frozenset({"skill_ids", "start_location", "email"})
 
-class PersonnelService:
+
+class PersonnelService(LocationMixin):
     """Service for Personnel business logic"""
 
     def __init__(self, db: Session):
@@ -25,32 +27,6 @@ class PersonnelService:
         self.skill_service = SkillService(db)
         self.audit_service = AuditService(db)
 
-    def _location_to_wkt(self, location: LocationSchema) -> str:
-        """
-        Convert LocationSchema to WKT Point
-
-        Args:
-            location: Location schema
-
-        Returns:
-            WKT string
-        """
-        return f"POINT({location.longitude} {location.latitude})"
-
-    def _wkt_to_location(self, wkt: str) -> LocationSchema:
-        """
-        Convert WKT Point to LocationSchema
-
-        Args:
-            wkt: WKT string
-
-        Returns:
-            Location schema
-        """
-        # Parse WKT: "POINT(lon lat)"
-        coords = wkt.replace("POINT(", "").replace(")", "").split()
-        return LocationSchema(longitude=float(coords[0]), latitude=float(coords[1]))
-
     def create_personnel(
         self,
         personnel_in: PersonnelCreate,
@@ -75,12 +51,68 @@ class PersonnelService:
             if len(skills) != len(personnel_in.skill_ids):
                 raise ValidationException("One or more skill IDs are invalid")
 
+        personnel_dict = self._build_personnel_dict(personnel_in)
+
+        # Insert the skill associations in the same flush as the personnel row;
+        # a new record has no existing skills to replace
+        if personnel_in.skill_ids:
+            personnel_dict["skills"] = skills
+
+        personnel = self.personnel_repo.create(personnel_dict)
+
+        # Log audit
+        self.audit_service.log_create("personnel", personnel.id, user_id)
+
+        # Reload with skills (committing expires the skills collection, so this
+        # single eager query is the only read needed to build the response)
+        return self.personnel_repo.get_by_id_with_skills(personnel.id)
+
+    def create_personnel_bulk(
+        self,
+        personnel_in: List[PersonnelCreate],
+        user_id: Optional[int] = None
+    ) -> List[int]:
+        """
+        Create many personnel at once (e.g. imports)
+
+        All skill IDs are validated with one query, and personnel rows and
+        their skill associations are each inserted with a single statement.
+
+        Args:
+            personnel_in: Personnel creation data
+            user_id: ID of user creating the personnel
+
+        Returns:
+            IDs of the created personnel, in input order
+
+        Raises:
+            ValidationException: If any skill ID is invalid
+        """
+        requested_skill_ids = {skill_id for item in personnel_in for skill_id in item.skill_ids or ()}
+        if requested_skill_ids:
+            skills = self.skill_service.get_skills_by_ids(list(requested_skill_ids))
+            if len(skills) != len(requested_skill_ids):
+                raise ValidationException("One or more skill IDs are invalid")
+
+        personnel_ids = self.personnel_repo.bulk_create(
+            [self._build_personnel_dict(item) for item in personnel_in],
+            [item.skill_ids or [] for item in personnel_in]
+        )
+
+        # Log audit
+        if personnel_ids:
+            self.audit_service.log_create_bulk("personnel", personnel_ids, user_id)
+
+        return personnel_ids
+
+    def _build_personnel_dict(self, personnel_in: PersonnelCreate) -> Dict[str, Any]:
+        """Build the personnel model attributes from creation data"""
         # Create personnel (exclude skill_ids, start_location, and email from dict)
-        personnel_dict = personnel_in.model_dump(exclude={"skill_ids", "start_location", "email"})
+        personnel_dict = personnel_in.model_dump(exclude=_PERSONNEL_EXCLUDE)
 
         # Convert location to WKT if provided
         if personnel_in.start_location is not None:
-            personnel_dict["start_location"] = self._location_to_wkt(personnel_in.start_location)
+            personnel_dict["start_location"] = self._location_to_point(personnel_in.start_location)
         else:
             personnel_dict["start_location"] = None
 
@@ -90,17 +122,7 @@ class PersonnelService:
         if "work_hours_end" in personnel_dict:
             personnel_dict["work_end_time"] = personnel_dict.pop("work_hours_end")
 
-        personnel = self.personnel_repo.create(personnel_dict)
-
-        # Add skills
-        if personnel_in.skill_ids:
-            self.personnel_repo.update_skills(personnel.id, personnel_in.skill_ids)
-
-        # Log audit
-        self.audit_service.log_create("personnel", personnel.id, user_id)
-
-        # Reload with skills
-        return self.personnel_repo.get_by_id_with_skills(personnel.id)
+        return personnel_dict
 
     def get_personnel(self, personnel_id: int) -> Personnel:
         """
@@ -194,12 +216,14 @@ class PersonnelService:
             if len(skills) != len(personnel_in.skill_ids):
                 raise ValidationException("One or more skill IDs are invalid")
 
-        # Update personnel (exclude skill_ids, start_location, and email)
-        update_dict = personnel_in.model_dump(exclude_unset=True, exclude={"skill_ids", "start_location", "email"})
+        # Dump once: the full dump is logged for audit, the filtered copy is
+        # the update (excludes skill_ids, start_location, and email)
+        changes = personnel_in.model_dump(exclude_unset=True)
+        update_dict = {k: v for k, v in changes.items() if k not in _PERSONNEL_EXCLUDE}
 
         # Convert location if provided
         if personnel_in.start_location:
-            update_dict["start_location"] = self._location_to_wkt(personnel_in.start_location)
+            update_dict["start_location"] = self._location_to_point(personnel_in.start_location)
 
         # Map field names from schema to model
         if "work_hours_start" in update_dict:
@@ -207,6 +231,10 @@ class PersonnelService:
         if "work_hours_end" in update_dict:
             update_dict["work_end_time"] = update_dict.pop("work_hours_end")
 
+        # Nothing to write: skip the audit entry and reload
+        if not update_dict and personnel_in.skill_ids is None:
+            return personnel
+
         if update_dict:
             self.personnel_repo.update(personnel_id, update_dict)
 
@@ -215,7 +243,7 @@ class PersonnelService:
             self.personnel_repo.update_skills(personnel_id, personnel_in.skill_ids)
 
         # Log audit
-        self.audit_service.log_update("personnel", personnel_id, user_id, personnel_in.model_dump(exclude_unset=True))
+        self.audit_service.log_update("personnel", personnel_id, user_id, changes)
 
         # Reload with skills
         return self.personnel_repo.get_by_id_with_skills(personnel_id)
@@ -254,15 +282,19 @@ class PersonnelService:
 
         return result
 
-    def count_personnel(self, is_active: Optional[bool] = None) -> int:
+    def count_personnel(self, is_active: Optional[bool] = None, exact: bool = False) -> int:
         """
         Count personnel
 
         Args:
             is_active: Filter by active status
+            exact: Force an exact COUNT(*) instead of the planner estimate
 
         Returns:
-            Number of personnel
+            Number of personnel (approximate for large unfiltered tables unless exact)
         """
-        filters = {"is_active": is_active} if is_active is not None else None
-        return self.personnel_repo.count(filters=filters)
+        if is_active is not None:
+            return self.personnel_repo.count(filters={"is_active": is_active})
+        if exact:
+            return self.personnel_repo.count()
+        return self.personnel_repo.count_estimate()
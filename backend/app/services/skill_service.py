@@ -4,6 +4,7 @@ Business logic for skill management
 """
 
 from typing import List, Optional
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.repositories.personnel_repository import SkillRepository
@@ -13,6 +14,11 @@ from app.core.exceptions import NotFoundException, ConflictException
 from app.services.audit_service import AuditService
 
 
+def _is_unique_violation(error: IntegrityError) -> bool:
+    """Whether an IntegrityError was raised by a unique constraint"""
+    return "unique" in str(error.orig).lower()
+
+
 class SkillService:
     """Service for Skill business logic"""
 
@@ -39,14 +45,15 @@ class SkillService:
         Raises:
             ConflictException: If skill name already exists
         """
-        # Check for duplicate name
-        existing = self.skill_repo.get_by_name(skill_in.name)
-        if existing:
-            raise ConflictException(f"Skill with name '{skill_in.name}' already exists")
-
-        # Create skill
+        # Create skill; the unique constraint on skills.name rejects duplicates
         skill_dict = skill_in.model_dump()
-        skill = self.skill_repo.create(skill_dict)
+        try:
+            skill = self.skill_repo.create(skill_dict)
+        except IntegrityError as e:
+            self.db.rollback()
+            if _is_unique_violation(e):
+                raise ConflictException(f"Skill with name '{skill_in.name}' already exists")
+            raise
 
         # Log audit
         self.audit_service.log_create("skill", skill.id, user_id)
@@ -117,18 +124,19 @@ class SkillService:
             NotFoundException: If skill not found
             ConflictException: If new name conflicts with existing skill
         """
-        # Check if skill exists
-        skill = self.get_skill(skill_id)
-
-        # Check for name conflict if name is being updated
-        if skill_in.name and skill_in.name != skill.name:
-            existing = self.skill_repo.get_by_name(skill_in.name)
-            if existing:
+        # Update skill; UPDATE ... RETURNING doubles as the existence check and
+        # the unique constraint on skills.name rejects conflicting names
+        update_dict = skill_in.model_dump(exclude_unset=True)
+        try:
+            updated_skill = self.skill_repo.update(skill_id, update_dict)
+        except IntegrityError as e:
+            self.db.rollback()
+            if _is_unique_violation(e):
                 raise ConflictException(f"Skill with name '{skill_in.name}' already exists")
+            raise
 
-        # Update skill
-        update_dict = skill_in.model_dump(exclude_unset=True)
-        updated_skill = self.skill_repo.update(skill_id, update_dict)
+        if updated_skill is None:
+            raise NotFoundException(f"Skill with ID {skill_id} not found")
 
         # Log audit
         self.audit_service.log_update("skill", skill_id, user_id, update_dict)
@@ -165,11 +173,16 @@ class SkillService:
 
         return result
 
-    def count_skills(self) -> int:
+    def count_skills(self, exact: bool = False) -> int:
         """
         Count total number of skills
 
+        Args:
+            exact: Force an exact COUNT(*) instead of the planner estimate
+
         Returns:
-            Number of skills
+            Number of skills (approximate for large tables unless exact)
         """
-        return self.skill_repo.count()
+        if exact:
+            return self.skill_repo.count()
+        return self.skill_repo.count_estimate()
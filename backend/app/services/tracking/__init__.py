@@ -1,7 +1,7 @@
 """
 Tracking Services Package
 """
-from app.services.tracking.location_tracker import LocationTracker
+from app.services.tracking.location_tracker import LocationTracker, location_log_writer
 from app.services.tracking.route_tracker import RouteTrackerService
 from app.services.tracking.eta_calculator import ETACalculator
 from app.services.tracking.delay_detector import DelayDetector, DelayAlert, DelaySeverity
@@ -9,6 +9,7 @@ from app.services.tracking.websocket_manager import connection_manager, Connecti
 
 __all__ = [
     "LocationTracker",
+    "location_log_writer",
     "RouteTrackerService",
     "ETACalculator",
     "DelayDetector",
@@ -4,13 +4,17 @@ Detects delays by comparing actual vs estimated times and generates alerts
 """
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict
-from sqlalchemy.orm import Session
+import numpy as np
+from sqlalchemy import Float, and_, case, cast, func
+from sqlalchemy.orm import Session, joinedload, selectinload
 from dataclasses import dataclass
 from enum import Enum
 
+from app.models.case import Case
 from app.models.route import Route, Visit, VisitStatus
 from app.services.tracking.eta_calculator import ETACalculator
 from app.core.exceptions import NotFoundError
+from app.utils.ttl_cache import TTLCache
 
 
 class DelaySeverity(str, Enum):
@@ -43,13 +47,34 @@ class DelayDetector:
     MODERATE_THRESHOLD = 15
     SEVERE_THRESHOLD = 30
 
+    # Longest plausible drive to a visit; visits due later than this (minus the
+    # minor threshold) cannot be late yet, so no ETA is calculated for them
+    MAX_PROBABLE_TRAVEL_MINUTES = 120
+
+    # Severity by number of _SEVERITY_BOUNDS a delay reaches (see _calculate_severity)
+    _SEVERITY_BOUNDS = (MODERATE_THRESHOLD, SEVERE_THRESHOLD)
+    _SEVERITY_LEVELS = (DelaySeverity.MINOR, DelaySeverity.MODERATE, DelaySeverity.SEVERE)
+
+    # Visits that can still be delayed
+    ACTIVE_STATUSES = (VisitStatus.PENDING, VisitStatus.EN_ROUTE, VisitStatus.ARRIVED)
+
+    # Alert messages by severity (formatted with the rounded delay in minutes)
+    DELAY_MESSAGES = {
+        DelaySeverity.SEVERE: "Retraso grave: %d minutos de demora. Se requiere acción inmediata.",
+        DelaySeverity.MODERATE: "Retraso moderado: %d minutos de demora. Considere ajustar la ruta.",
+        DelaySeverity.MINOR: "Retraso leve: %d minutos de demora."
+    }
+
     # Check interval to avoid spam (5 minutes)
     CHECK_INTERVAL_MINUTES = 5
+    CHECK_CACHE_MAX_ENTRIES = 10_000
 
     def __init__(self, db: Session):
         self.db = db
         self.eta_calculator = ETACalculator(db)
-        self._last_check = {}  # visit_id -> last_check_time
+        # Per instance, so a new detector (e.g. per request) always reports
+        # current delays; entries expire after the check interval: visit_id -> last_check_time
+        self._last_check = TTLCache(maxsize=self.CHECK_CACHE_MAX_ENTRIES, ttl=self.CHECK_INTERVAL_MINUTES * 60)
 
     def detect_delays_for_route(self, route_id: int) -> List[DelayAlert]:
         """
@@ -61,19 +86,41 @@ class DelayDetector:
         Returns:
             List of DelayAlert instances
         """
-        route = self.db.query(Route).filter(Route.id == route_id).first()
-        if not route:
-            raise NotFoundError(f"Route with id {route_id} not found")
-
-        alerts = []
-        for visit in route.visits:
-            # Only check active visits
-            if visit.status in [VisitStatus.PENDING, VisitStatus.EN_ROUTE, VisitStatus.ARRIVED]:
-                alert = self.check_visit_delay(visit.id, route.vehicle_id)
-                if alert:
-                    alerts.append(alert)
-
-        return alerts
+        route = self._get_route_with_visits(route_id, load_cases=True)
+        now = datetime.utcnow()
+
+        # Active visits that were not checked recently and could already be late
+        candidates = [
+            visit for visit in route.visits
+            if visit.status in self.ACTIVE_STATUSES
+            and visit.id not in self._last_check
+            and visit.estimated_arrival_time
+            and not self._cannot_be_late(visit, now)
+        ]
+
+        # One vehicle location read and one distance call for the whole route
+        etas = self.eta_calculator.calculate_etas_for_route(route, candidates)
+        checked = [(visit, etas[visit.id]) for visit in candidates if visit.id in etas]
+        for visit, _ in checked:
+            self._last_check[visit.id] = now
+
+        if not checked:
+            return []
+
+        # Classify every delay in one vectorized pass; alerts only for late visits
+        delays = np.array([eta_details["delay_minutes"] for _, eta_details in checked], dtype=np.float64)
+        severity_indexes = np.searchsorted(self._SEVERITY_BOUNDS, delays, side="right")
+
+        return [
+            self._build_alert(
+                checked[index][0],
+                route.vehicle_id,
+                checked[index][1],
+                self._SEVERITY_LEVELS[severity_indexes[index]],
+                now
+            )
+            for index in np.flatnonzero(delays >= self.MINOR_THRESHOLD)
+        ]
 
     def check_visit_delay(
         self,
@@ -92,54 +139,138 @@ class DelayDetector:
         Returns:
             DelayAlert if delayed, None otherwise
         """
-        # Check if we recently checked this visit
+        # Check if we recently checked this visit (entries expire after the interval)
         if not force and visit_id in self._last_check:
-            last_check = self._last_check[visit_id]
-            if (datetime.utcnow() - last_check).total_seconds() < (self.CHECK_INTERVAL_MINUTES * 60):
-                return None
+            return None
 
         # Get visit
-        visit = self.db.query(Visit).filter(Visit.id == visit_id).first()
+        visit = (
+            self.db.query(Visit)
+            .options(joinedload(Visit.case).undefer_group("coordinates"))
+            .filter(Visit.id == visit_id)
+            .first()
+        )
         if not visit:
             raise NotFoundError(f"Visit with id {visit_id} not found")
 
+        return self._check_visit_delay_for(visit, vehicle_id, datetime.utcnow())
+
+    def _check_visit_delay_for(
+        self,
+        visit: Visit,
+        vehicle_id: int,
+        now: datetime
+    ) -> Optional[DelayAlert]:
+        """
+        Check if an already loaded visit is delayed (ignores the check interval)
+
+        Args:
+            visit: Visit instance
+            vehicle_id: Vehicle ID
+            now: Current time
+
+        Returns:
+            DelayAlert if delayed, None otherwise
+        """
         # Can't detect delay without estimated arrival time
         if not visit.estimated_arrival_time:
             return None
 
+        if self._cannot_be_late(visit, now):
+            return None
+
         # Get current ETA
-        eta_details = self.eta_calculator.calculate_eta_with_details(visit_id, vehicle_id)
+        eta_details = self.eta_calculator.calculate_eta_details_for_visit(visit, vehicle_id)
         if not eta_details:
             return None
 
+        alert = self._alert_from_eta(visit, vehicle_id, eta_details, now)
+
+        # Update last check time
+        self._last_check[visit.id] = now
+
+        return alert
+
+    def _cannot_be_late(self, visit: Visit, now: datetime) -> bool:
+        """
+        Check if a visit is too far in the future to be delayed yet
+
+        Even the longest plausible drive started now would arrive less than
+        MINOR_THRESHOLD minutes after the estimated arrival time.
+
+        Args:
+            visit: Visit with an estimated arrival time
+            now: Current time
+
+        Returns:
+            True if computing an ETA can be skipped
+        """
+        slack_minutes = (visit.estimated_arrival_time - now).total_seconds() / 60
+        return slack_minutes + self.MINOR_THRESHOLD >= self.MAX_PROBABLE_TRAVEL_MINUTES
+
+    def _alert_from_eta(
+        self,
+        visit: Visit,
+        vehicle_id: int,
+        eta_details: Dict,
+        detected_at: datetime
+    ) -> Optional[DelayAlert]:
+        """
+        Build a delay alert from already calculated ETA details
+
+        Args:
+            visit: Visit instance
+            vehicle_id: Vehicle ID
+            eta_details: Output of ETACalculator.calculate_eta_with_details
+            detected_at: Detection time
+
+        Returns:
+            DelayAlert if delayed, None otherwise
+        """
         delay_minutes = eta_details.get("delay_minutes")
         if delay_minutes is None or delay_minutes < self.MINOR_THRESHOLD:
-            # Update last check time
-            self._last_check[visit_id] = datetime.utcnow()
             return None
 
-        # Determine severity
-        severity = self._calculate_severity(delay_minutes)
+        return self._build_alert(
+            visit, vehicle_id, eta_details, self._calculate_severity(delay_minutes), detected_at
+        )
 
-        # Create alert
-        alert = DelayAlert(
-            visit_id=visit_id,
+    def _build_alert(
+        self,
+        visit: Visit,
+        vehicle_id: int,
+        eta_details: Dict,
+        severity: DelaySeverity,
+        detected_at: datetime
+    ) -> DelayAlert:
+        """
+        Create the alert for a delayed visit
+
+        Args:
+            visit: Visit instance
+            vehicle_id: Vehicle ID
+            eta_details: ETA details with a delay of at least MINOR_THRESHOLD
+            severity: Severity of the delay
+            detected_at: Detection time
+
+        Returns:
+            DelayAlert instance
+        """
+        delay_minutes = eta_details["delay_minutes"]
+
+        return DelayAlert(
+            visit_id=visit.id,
             route_id=visit.route_id,
             vehicle_id=vehicle_id,
             case_id=visit.case_id,
             severity=severity,
             delay_minutes=delay_minutes,
             estimated_arrival=visit.estimated_arrival_time,
-            current_eta=datetime.fromisoformat(eta_details["eta"]),
+            current_eta=eta_details["eta_dt"],
             message=self._generate_delay_message(delay_minutes, severity),
-            detected_at=datetime.utcnow()
+            detected_at=detected_at
         )
 
-        # Update last check time
-        self._last_check[visit_id] = datetime.utcnow()
-
-        return alert
-
     def get_delay_statistics(self, route_id: int) -> Dict:
         """
         Get delay statistics for a route
@@ -154,56 +285,114 @@ class DelayDetector:
         if not route:
             raise NotFoundError(f"Route with id {route_id} not found")
 
+        # Completed visits are classified by the database, not materialized
+        historical = self._historical_delay_stats(route_id)
+
         stats = {
             "route_id": route_id,
-            "total_visits": len(route.visits),
-            "on_time": 0,
-            "minor_delays": 0,
-            "moderate_delays": 0,
-            "severe_delays": 0,
+            "total_visits": historical.total_visits,
+            "on_time": historical.on_time or 0,
+            "minor_delays": historical.minor_delays or 0,
+            "moderate_delays": historical.moderate_delays or 0,
+            "severe_delays": historical.severe_delays or 0,
             "average_delay_minutes": 0,
             "max_delay_minutes": 0
         }
+        delay_count = historical.delay_count
+        delay_total = historical.delay_total or 0.0
+        max_delay = historical.max_delay
+
+        # Predicted delays for all active visits in one batched ETA call
+        active_visits = (
+            self.db.query(Visit)
+            # The ETA only needs the case coordinates
+            .options(selectinload(Visit.case).load_only(Case.latitude, Case.longitude))
+            .filter(Visit.route_id == route_id, Visit.status.in_(self.ACTIVE_STATUSES))
+            .all()
+        )
+        now = datetime.utcnow()
+        etas = self.eta_calculator.calculate_etas_for_route(route, [
+            visit for visit in active_visits
+            if visit.estimated_arrival_time and not self._cannot_be_late(visit, now)
+        ])
+
+        # Only the predicted delay is needed here, so no DelayAlert is built
+        severity_keys = {
+            DelaySeverity.MINOR: "minor_delays",
+            DelaySeverity.MODERATE: "moderate_delays",
+            DelaySeverity.SEVERE: "severe_delays"
+        }
+        for visit in active_visits:
+            eta_details = etas.get(visit.id)
+            delay = eta_details["delay_minutes"] if eta_details else None
+            if delay is None or delay < self.MINOR_THRESHOLD:
+                stats["on_time"] += 1
+                continue
 
-        delays = []
-        for visit in route.visits:
-            if visit.status in [VisitStatus.COMPLETED]:
-                # Check completed visits for historical delay
-                delay = self._calculate_historical_delay(visit)
-                if delay is not None:
-                    delays.append(delay)
-
-                    if delay < self.MINOR_THRESHOLD:
-                        stats["on_time"] += 1
-                    elif delay < self.MODERATE_THRESHOLD:
-                        stats["minor_delays"] += 1
-                    elif delay < self.SEVERE_THRESHOLD:
-                        stats["moderate_delays"] += 1
-                    else:
-                        stats["severe_delays"] += 1
-
-            elif visit.status in [VisitStatus.PENDING, VisitStatus.EN_ROUTE, VisitStatus.ARRIVED]:
-                # Check current visits for predicted delay
-                alert = self.check_visit_delay(visit.id, route.vehicle_id)
-                if alert:
-                    delays.append(alert.delay_minutes)
-
-                    if alert.severity == DelaySeverity.MINOR:
-                        stats["minor_delays"] += 1
-                    elif alert.severity == DelaySeverity.MODERATE:
-                        stats["moderate_delays"] += 1
-                    else:
-                        stats["severe_delays"] += 1
-                else:
-                    stats["on_time"] += 1
+            delay_count += 1
+            delay_total += delay
+            max_delay = delay if max_delay is None else max(max_delay, delay)
+            stats[severity_keys[self._calculate_severity(delay)]] += 1
 
         # Calculate averages
-        if delays:
-            stats["average_delay_minutes"] = round(sum(delays) / len(delays), 1)
-            stats["max_delay_minutes"] = round(max(delays), 1)
+        if delay_count:
+            stats["average_delay_minutes"] = round(delay_total / delay_count, 1)
+            stats["max_delay_minutes"] = round(max_delay, 1)
 
         return stats
 
+    def _historical_delay_stats(self, route_id: int):
+        """
+        Aggregate the delays of a route's completed visits in one query
+
+        Args:
+            route_id: Route ID
+
+        Returns:
+            Row with total_visits (all statuses), on_time, minor_delays,
+            moderate_delays, severe_delays, delay_count, delay_total and
+            max_delay (minutes, over completed visits with both times set)
+        """
+        delay = cast(
+            func.extract("epoch", Visit.actual_arrival_time - Visit.estimated_arrival_time) / 60,
+            Float
+        )
+        # NULL for visits without a historical delay, so aggregates skip them
+        completed_delay = case(
+            (
+                and_(
+                    Visit.status == VisitStatus.COMPLETED,
+                    Visit.actual_arrival_time.isnot(None),
+                    Visit.estimated_arrival_time.isnot(None)
+                ),
+                delay
+            )
+        )
+
+        def bucket(condition):
+            return func.sum(case((condition, 1), else_=0))
+
+        return (
+            self.db.query(
+                func.count(Visit.id).label("total_visits"),
+                bucket(completed_delay < self.MINOR_THRESHOLD).label("on_time"),
+                bucket(and_(
+                    completed_delay >= self.MINOR_THRESHOLD,
+                    completed_delay < self.MODERATE_THRESHOLD
+                )).label("minor_delays"),
+                bucket(and_(
+                    completed_delay >= self.MODERATE_THRESHOLD,
+                    completed_delay < self.SEVERE_THRESHOLD
+                )).label("moderate_delays"),
+                bucket(completed_delay >= self.SEVERE_THRESHOLD).label("severe_delays"),
+                func.count(completed_delay).label("delay_count"),
+                func.sum(completed_delay).label("delay_total"),
+                func.max(completed_delay).label("max_delay")
+            )
+            .filter(Visit.route_id == route_id)
+            .one()
+        )
+
     def check_time_window_violations(self, route_id: int) -> List[Dict]:
         """
         Check if any visits will violate their time windows
@@ -214,47 +403,81 @@ class DelayDetector:
         Returns:
             List of dictionaries with violation details
         """
-        route = self.db.query(Route).filter(Route.id == route_id).first()
-        if not route:
-            raise NotFoundError(f"Route with id {route_id} not found")
+        route = self._get_route_with_visits(route_id, load_patients=True)
 
-        violations = []
+        candidates = [
+            visit for visit in route.visits
+            if visit.status in self.ACTIVE_STATUSES
+            and visit.case.time_window_end and visit.estimated_arrival_time
+        ]
 
-        for visit in route.visits:
-            if visit.status not in [VisitStatus.PENDING, VisitStatus.EN_ROUTE, VisitStatus.ARRIVED]:
-                continue
+        # Calculate current ETAs in one batched call
+        etas = self.eta_calculator.calculate_etas_for_route(route, candidates)
 
-            case = visit.case
-            if not case.time_window_end or not visit.estimated_arrival_time:
-                continue
-
-            # Calculate current ETA
-            eta_details = self.eta_calculator.calculate_eta_with_details(visit.id, route.vehicle_id)
-            if not eta_details:
-                continue
+        rows = []
+        for visit in candidates:
+            eta_details = etas.get(visit.id)
+            if eta_details:
+                # Only the time of day of the window applies, on the route's date
+                time_window_end = datetime.combine(route.route_date, visit.case.time_window_end.time())
+                rows.append((visit, eta_details["eta_dt"], time_window_end))
 
-            current_eta = datetime.fromisoformat(eta_details["eta"])
+        if not rows:
+            return []
 
-            # Compare with time window end
-            time_window_end = datetime.combine(
-                route.route_date,
-                case.time_window_end
-            )
+        # Compare every ETA with its window end in one vectorized pass
+        current_etas = np.array([row[1] for row in rows], dtype="datetime64[us]")
+        window_ends = np.array([row[2] for row in rows], dtype="datetime64[us]")
+        minutes_over_window = (current_etas - window_ends) / np.timedelta64(1, "m")
 
-            if current_eta > time_window_end:
-                minutes_over = (current_eta - time_window_end).total_seconds() / 60
-                violations.append({
-                    "visit_id": visit.id,
-                    "case_id": case.id,
-                    "patient_name": case.patient.name,
-                    "time_window_end": time_window_end.isoformat(),
-                    "current_eta": current_eta.isoformat(),
-                    "minutes_over_window": round(minutes_over, 1),
-                    "severity": "critical" if minutes_over > 30 else "warning"
-                })
+        violations = []
+        for index in np.flatnonzero(minutes_over_window > 0):
+            visit, current_eta, time_window_end = rows[index]
+            minutes_over = float(minutes_over_window[index])
+            violations.append({
+                "visit_id": visit.id,
+                "case_id": visit.case.id,
+                "patient_name": visit.case.patient.name,
+                "time_window_end": time_window_end.isoformat(),
+                "current_eta": current_eta.isoformat(),
+                "minutes_over_window": round(minutes_over, 1),
+                "severity": "critical" if minutes_over > 30 else "warning"
+            })
 
         return violations
 
+    def _get_route_with_visits(
+        self,
+        route_id: int,
+        load_cases: bool = False,
+        load_patients: bool = False
+    ) -> Route:
+        """
+        Load a route with its visits eagerly loaded
+
+        Args:
+            route_id: Route ID
+            load_cases: Also load each visit's case
+            load_patients: Also load each case's patient (implies load_cases)
+
+        Returns:
+            Route instance
+
+        Raises:
+            NotFoundError: If route not found
+        """
+        visits_loader = selectinload(Route.visits)
+        if load_cases or load_patients:
+            # Cases are loaded for ETAs, which read the deferred coordinates
+            visits_loader = visits_loader.selectinload(Visit.case).undefer_group("coordinates")
+        if load_patients:
+            visits_loader = visits_loader.selectinload(Case.patient)
+
+        route = self.db.query(Route).options(visits_loader).filter(Route.id == route_id).first()
+        if not route:
+            raise NotFoundError(f"Route with id {route_id} not found")
+        return route
+
     def _calculate_severity(self, delay_minutes: float) -> DelaySeverity:
         """
         Calculate delay severity based on minutes
@@ -283,14 +506,7 @@ class DelayDetector:
         Returns:
             Delay message string
         """
-        rounded_delay = round(delay_minutes)
-
-        if severity == DelaySeverity.SEVERE:
-            return f"Retraso grave: {rounded_delay} minutos de demora. Se requiere acción inmediata."
-        elif severity == DelaySeverity.MODERATE:
-            return f"Retraso moderado: {rounded_delay} minutos de demora. Considere ajustar la ruta."
-        else:
-            return f"Retraso leve: {rounded_delay} minutos de demora."
+        return self.DELAY_MESSAGES[severity] % round(delay_minutes)
 
     def _calculate_historical_delay(self, visit: Visit) -> Optional[float]:
         """
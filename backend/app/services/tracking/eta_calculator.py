@@ -2,17 +2,101 @@
 ETA Calculator Service
 Calculates estimated time of arrival based on current location and traffic conditions
 """
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, time
-from typing import Optional, Tuple
-from sqlalchemy.orm import Session
-import json
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session, joinedload
 
 from app.services.distance.models import Location, TravelTime
 from app.services.distance.distance_service import DistanceService
-from app.services.tracking.location_tracker import LocationTracker
-from app.models.route import Visit
+from app.services.tracking.location_tracker import LocationTracker, version_counter
+from app.models.route import Route, Visit
 from app.models.case import Case
 from app.core.exceptions import NotFoundError, ValidationError
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+MINUTES_PER_DAY = 24 * 60
+
+# Last write to each route or its visits: route_id -> version
+_route_versions: Dict[int, int] = {}
+
+
+def route_version(route_id: int) -> int:
+    """
+    Get the version of a route, bumped on every write to it or its visits
+
+    Args:
+        route_id: Route ID
+
+    Returns:
+        Version number (0 if never written in this process)
+    """
+    return _route_versions.get(route_id, 0)
+
+
+def _bump_route_version(mapper, connection, target) -> None:
+    """Mapper event hook: mark the route of a written Route or Visit as changed."""
+    route_id = target.route_id if isinstance(target, Visit) else target.id
+    _route_versions[route_id] = next(version_counter)
+
+
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(Visit, _event_name, _bump_route_version)
+event.listen(Route, "after_update", _bump_route_version)
+
+
+def _traffic_period(minute_of_day: int) -> str:
+    """
+    Classify a minute of the day into a traffic period
+
+    Args:
+        minute_of_day: Minutes since midnight (0-1439)
+
+    Returns:
+        Traffic period name
+    """
+    hour = minute_of_day // 60
+
+    # Late night (22:00-6:00)
+    if hour >= 22 or hour < 6:
+        return "late_night"
+
+    # Morning rush hour (7:00-9:00)
+    if 7 * 60 <= minute_of_day < 9 * 60:
+        return "rush_hour_morning"
+
+    # Evening rush hour (17:00-19:00)
+    if 17 * 60 <= minute_of_day < 19 * 60:
+        return "rush_hour_evening"
+
+    # Peak hours (12:00-14:00)
+    if 12 * 60 <= minute_of_day < 14 * 60:
+        return "peak_hours"
+
+    # Normal hours
+    return "normal"
+
+
+def _build_buffer_table(buffers: Dict[str, float]) -> Tuple[Tuple[float, str], ...]:
+    """
+    Precompute (multiplier, period) for every minute of the day
+
+    Args:
+        buffers: Traffic buffer multipliers by period name
+
+    Returns:
+        Tuple of MINUTES_PER_DAY entries indexed by hour * 60 + minute
+    """
+    table = []
+    for minute_of_day in range(MINUTES_PER_DAY):
+        period = _traffic_period(minute_of_day)
+        table.append((buffers[period], period))
+    return tuple(table)
 
 
 class ETACalculator:
@@ -27,17 +111,40 @@ class ETACalculator:
         "late_night": 1.0            # 22:00-6:00
     }
 
-    # ETA cache TTL (5 minutes)
+    # (multiplier, period) by minute of the day
+    _BUFFER_TABLE = _build_buffer_table(TRAFFIC_BUFFERS)
+
+    # ETA cache TTL (5 minutes); older entries are served while a refresh runs,
+    # until they are dropped after CACHE_STALE_TTL_SECONDS
     CACHE_TTL_SECONDS = 300
+    CACHE_STALE_TTL_SECONDS = 900
+    CACHE_MAX_ENTRIES = 10_000
 
     # Significant change threshold (minutes)
     SIGNIFICANT_CHANGE_MINUTES = 10
 
-    def __init__(self, db: Session):
+    # Shared by all instances so ETAs survive across requests:
+    # visit_id -> (eta, timestamp, stamp, details)
+    _eta_cache = TTLCache(maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_STALE_TTL_SECONDS)
+
+    # Background refreshes of stale entries, each with its own session
+    _refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="eta-refresh")
+    _refreshing: Set[int] = set()
+    _refreshing_lock = threading.Lock()
+
+    def __init__(self, db: Session, session_factory=None):
+        """
+        Initialize the calculator
+
+        Args:
+            db: Database session
+            session_factory: Callable returning a new Session for background
+                refreshes (defaults to SessionLocal)
+        """
         self.db = db
+        self._session_factory = session_factory
         self.location_tracker = LocationTracker(db)
         self.distance_service = DistanceService(db)
-        self._eta_cache = {}  # Simple in-memory cache: visit_id -> (eta, timestamp)
 
     def calculate_eta(
         self,
@@ -59,111 +166,304 @@ class ETACalculator:
         Raises:
             NotFoundError: If visit or vehicle not found
         """
-        # Check cache
-        if use_cache and visit_id in self._eta_cache:
-            cached_eta, cached_time = self._eta_cache[visit_id]
-            if (datetime.utcnow() - cached_time).seconds < self.CACHE_TTL_SECONDS:
-                return cached_eta
+        raw = self._get_eta(visit_id, vehicle_id, use_cache)
+        return raw[0] if raw else None
+
+    def calculate_eta_with_details(
+        self,
+        visit_id: int,
+        vehicle_id: int,
+        use_cache: bool = True
+    ) -> Optional[dict]:
+        """
+        Calculate ETA with detailed information
+
+        Shares its cache entry with calculate_eta, so calling one after the
+        other only computes once.
+
+        Args:
+            visit_id: Visit ID
+            vehicle_id: Vehicle ID
+            use_cache: Whether to use cached ETA (default: True)
+
+        Returns:
+            Dictionary with ETA details or None
+        """
+        raw = self._get_eta(visit_id, vehicle_id, use_cache)
+        return raw[1] if raw else None
+
+    def calculate_eta_details_for_visit(
+        self,
+        visit: Visit,
+        vehicle_id: int,
+        use_cache: bool = True
+    ) -> Optional[dict]:
+        """
+        Calculate ETA details for an already loaded visit
+
+        Same as calculate_eta_with_details without looking the visit up again.
+
+        Args:
+            visit: Visit instance
+            vehicle_id: Vehicle ID
+            use_cache: Whether to use cached ETA (default: True)
+
+        Returns:
+            Dictionary with ETA details or None
+        """
+        raw = self._get_cached_eta(visit.id, vehicle_id) if use_cache else None
+        if not raw:
+            raw = self._compute_and_cache_eta(visit, vehicle_id)
+        return raw[1] if raw else None
+
+    def _get_eta(
+        self,
+        visit_id: int,
+        vehicle_id: int,
+        use_cache: bool
+    ) -> Optional[Tuple[datetime, dict]]:
+        """
+        Get the ETA of a visit from the cache or by calculating it
+
+        Args:
+            visit_id: Visit ID
+            vehicle_id: Vehicle ID
+            use_cache: Whether to use cached ETA
+
+        Returns:
+            Tuple of (eta, details) or None if cannot calculate
+
+        Raises:
+            NotFoundError: If visit not found
+        """
+        if use_cache:
+            raw = self._get_cached_eta(visit_id, vehicle_id)
+            if raw:
+                return raw
 
         # Get visit
-        visit = self.db.query(Visit).filter(Visit.id == visit_id).first()
+        visit = (
+            self.db.query(Visit)
+            .options(joinedload(Visit.case).undefer_group("coordinates"))
+            .filter(Visit.id == visit_id)
+            .first()
+        )
         if not visit:
             raise NotFoundError(f"Visit with id {visit_id} not found")
 
-        # Get current vehicle location
-        current_location = self.location_tracker.get_current_location(vehicle_id)
-        if not current_location:
-            return None  # No location data available
+        return self._compute_and_cache_eta(visit, vehicle_id)
 
-        # Extract vehicle coordinates
-        location_dict = self.location_tracker.get_location_as_dict(current_location)
-        vehicle_lat = location_dict["latitude"]
-        vehicle_lng = location_dict["longitude"]
+    def _get_cached_eta(self, visit_id: int, vehicle_id: int) -> Optional[Tuple[datetime, dict]]:
+        """
+        Look up a cached ETA that is still current
 
-        # Get destination from case
-        case = visit.case
-        destination_coords = self._extract_coordinates_from_case(case)
-        if not destination_coords:
+        Entries are unusable as soon as their stamp is outdated. Entries older
+        than CACHE_TTL_SECONDS are still returned, and a background refresh
+        replaces them, so callers never wait on a recompute at expiry.
+
+        Args:
+            visit_id: Visit ID
+            vehicle_id: Vehicle ID
+
+        Returns:
+            Tuple of (eta, details) or None on a miss
+        """
+        cached = self._eta_cache.get(visit_id)
+        if not cached:
+            return None
+
+        cached_eta, computed_at, stamp, details = cached
+        if stamp != self._cache_stamp(vehicle_id, stamp[1]):
             return None
 
-        dest_lat, dest_lng = destination_coords
+        if (datetime.utcnow() - computed_at).total_seconds() >= self.CACHE_TTL_SECONDS:
+            self._schedule_refresh(visit_id, vehicle_id)
 
-        # Calculate travel time using distance service
-        origin = Location(latitude=vehicle_lat, longitude=vehicle_lng)
-        destination = Location(latitude=dest_lat, longitude=dest_lng)
+        return cached_eta, details
 
+    def _schedule_refresh(self, visit_id: int, vehicle_id: int) -> None:
+        """Recompute a stale cache entry in the background, once at a time per visit."""
+        with self._refreshing_lock:
+            if visit_id in self._refreshing:
+                return
+            self._refreshing.add(visit_id)
+
+        self._refresh_executor.submit(self._refresh, visit_id, vehicle_id)
+
+    def _refresh(self, visit_id: int, vehicle_id: int) -> None:
+        """
+        Recompute and cache the ETA of a visit using a new session
+
+        Runs on the refresh executor; errors are logged and the stale entry
+        stays until it expires.
+        """
+        session_factory = self._session_factory
+        if session_factory is None:
+            from app.core.database import SessionLocal
+            session_factory = SessionLocal
+
+        db = session_factory()
         try:
-            travel_time = self.distance_service.get_travel_time(origin, destination)
-        except Exception:
-            # If distance service fails, return None
+            ETACalculator(db, session_factory).calculate_eta(visit_id, vehicle_id, use_cache=False)
+        except Exception as e:
+            logger.warning(f"Background ETA refresh failed for visit {visit_id}: {e}")
+        finally:
+            db.close()
+            with self._refreshing_lock:
+                self._refreshing.discard(visit_id)
+
+    def _compute_and_cache_eta(self, visit: Visit, vehicle_id: int) -> Optional[Tuple[datetime, dict]]:
+        """
+        Calculate the ETA for a loaded visit and store it in the cache
+
+        Args:
+            visit: Visit instance
+            vehicle_id: Vehicle ID
+
+        Returns:
+            Tuple of (eta, details) or None if cannot calculate
+        """
+        now = datetime.utcnow()
+
+        # Taken before computing, so writes that race with it invalidate the result
+        stamp = self._cache_stamp(vehicle_id, visit.route_id)
+
+        raw = self._compute_eta_raw(visit, vehicle_id, now)
+        if not raw:
             return None
 
-        # Apply traffic buffer
-        buffered_duration = self._apply_traffic_buffer(
-            travel_time.duration_seconds,
-            current_location.timestamp or datetime.utcnow()
-        )
+        eta, details = raw
+        self._eta_cache[visit.id] = (eta, now, stamp, details)
 
-        # Calculate ETA
-        eta = (current_location.timestamp or datetime.utcnow()) + timedelta(seconds=buffered_duration)
+        return raw
 
-        # Cache the result
-        self._eta_cache[visit_id] = (eta, datetime.utcnow())
+    def calculate_etas_for_route(
+        self,
+        route: Route,
+        visits: Optional[List[Visit]] = None
+    ) -> Dict[int, dict]:
+        """
+        Calculate ETA details for many visits of a route in one pass
 
-        return eta
+        The vehicle location is read once and travel times to every
+        destination come from a single batched distance call.
 
-    def calculate_eta_with_details(
+        Args:
+            route: Route whose vehicle is travelling
+            visits: Visits to estimate (defaults to all visits of the route)
+
+        Returns:
+            Dictionary of visit_id -> ETA details (see calculate_eta_with_details).
+            Visits whose ETA cannot be calculated are omitted.
+        """
+        if visits is None:
+            visits = route.visits
+
+        return {
+            visit_id: details
+            for visit_id, (_, details) in self._calculate_etas(route.vehicle_id, visits).items()
+        }
+
+    def _compute_eta_raw(
         self,
-        visit_id: int,
-        vehicle_id: int
-    ) -> Optional[dict]:
+        visit: Visit,
+        vehicle_id: int,
+        now: Optional[datetime] = None
+    ) -> Optional[Tuple[datetime, dict]]:
         """
-        Calculate ETA with detailed information
+        Calculate the ETA of one loaded visit
 
         Args:
-            visit_id: Visit ID
+            visit: Visit instance
             vehicle_id: Vehicle ID
+            now: Current time, if the caller already has it
 
         Returns:
-            Dictionary with ETA details or None
+            Tuple of (eta, details) or None if cannot calculate
         """
-        # Get visit
-        visit = self.db.query(Visit).filter(Visit.id == visit_id).first()
-        if not visit:
-            raise NotFoundError(f"Visit with id {visit_id} not found")
+        return self._calculate_etas(vehicle_id, [visit], now).get(visit.id)
+
+    def _calculate_etas(
+        self,
+        vehicle_id: int,
+        visits: List[Visit],
+        now: Optional[datetime] = None
+    ) -> Dict[int, Tuple[datetime, dict]]:
+        """
+        Calculate ETAs for visits served by the same vehicle
+
+        Args:
+            vehicle_id: Vehicle ID
+            visits: Visit instances
+            now: Current time, used when the location has no timestamp
+
+        Returns:
+            Dictionary of visit_id -> (eta, details)
+        """
+        if not visits:
+            return {}
 
         # Get current vehicle location
         current_location = self.location_tracker.get_current_location(vehicle_id)
         if not current_location:
-            return None
+            return {}
 
-        # Extract coordinates
         location_dict = self.location_tracker.get_location_as_dict(current_location)
-        vehicle_lat = location_dict["latitude"]
-        vehicle_lng = location_dict["longitude"]
-
-        case = visit.case
-        destination_coords = self._extract_coordinates_from_case(case)
-        if not destination_coords:
-            return None
+        origin = Location(latitude=location_dict["latitude"], longitude=location_dict["longitude"])
 
-        dest_lat, dest_lng = destination_coords
+        targets = []
+        destinations = []
+        for visit in visits:
+            destination_coords = self._extract_coordinates_from_case(visit.case)
+            if destination_coords:
+                targets.append(visit)
+                destinations.append(Location(latitude=destination_coords[0], longitude=destination_coords[1]))
 
-        # Calculate travel time
-        origin = Location(latitude=vehicle_lat, longitude=vehicle_lng)
-        destination = Location(latitude=dest_lat, longitude=dest_lng)
+        if not targets:
+            return {}
 
         try:
-            travel_time = self.distance_service.get_travel_time(origin, destination)
+            travel_times = self.distance_service.get_travel_times(origin, destinations)
         except Exception:
-            return None
+            return {}
+
+        # Same location and traffic period for every visit of the batch
+        current_time = current_location.timestamp or now or datetime.utcnow()
+        traffic_multiplier, traffic_period = self._get_traffic_buffer(current_time)
+
+        return {
+            visit.id: self._build_eta_details(
+                visit, vehicle_id, travel_time, current_time, traffic_multiplier, traffic_period
+            )
+            for visit, travel_time in zip(targets, travel_times)
+        }
+
+    def _build_eta_details(
+        self,
+        visit: Visit,
+        vehicle_id: int,
+        travel_time: TravelTime,
+        current_time: datetime,
+        traffic_multiplier: float,
+        traffic_period: str
+    ) -> Tuple[datetime, dict]:
+        """
+        Calculate the ETA and its details dictionary for one visit
+
+        Args:
+            visit: Visit instance
+            vehicle_id: Vehicle ID
+            travel_time: Travel time from the vehicle to the visit
+            current_time: Timestamp of the vehicle location
+            traffic_multiplier: Traffic buffer multiplier
+            traffic_period: Traffic period name
 
-        # Get traffic buffer info
-        traffic_multiplier, traffic_period = self._get_traffic_buffer()
+        Returns:
+            Tuple of (eta, dictionary with ETA details)
+        """
         buffered_duration = travel_time.duration_seconds * traffic_multiplier
 
         # Calculate ETA
-        current_time = current_location.timestamp or datetime.utcnow()
         eta = current_time + timedelta(seconds=buffered_duration)
 
         # Check for significant delay vs estimated time
@@ -171,17 +471,17 @@ class ETACalculator:
         if visit.estimated_arrival_time:
             delay_minutes = (eta - visit.estimated_arrival_time).total_seconds() / 60
 
-        return {
-            "visit_id": visit_id,
+        return eta, {
+            "visit_id": visit.id,
             "vehicle_id": vehicle_id,
             "current_location": {
-                "latitude": vehicle_lat,
-                "longitude": vehicle_lng,
+                "latitude": travel_time.origin.latitude,
+                "longitude": travel_time.origin.longitude,
                 "timestamp": current_time.isoformat()
             },
             "destination": {
-                "latitude": dest_lat,
-                "longitude": dest_lng
+                "latitude": travel_time.destination.latitude,
+                "longitude": travel_time.destination.longitude
             },
             "distance_km": round(travel_time.distance_km, 2),
             "base_duration_minutes": round(travel_time.duration_minutes, 1),
@@ -189,6 +489,8 @@ class ETACalculator:
             "traffic_period": traffic_period,
             "buffered_duration_minutes": round(buffered_duration / 60, 1),
             "eta": eta.isoformat(),
+            # Same instant as "eta", for callers that need the datetime
+            "eta_dt": eta,
             "estimated_arrival_time": visit.estimated_arrival_time.isoformat() if visit.estimated_arrival_time else None,
             "delay_minutes": round(delay_minutes, 1) if delay_minutes is not None else None,
             "is_delayed": delay_minutes > 5 if delay_minutes is not None else False
@@ -209,20 +511,31 @@ class ETACalculator:
         Returns:
             Tuple of (has_changed, change_in_minutes)
         """
-        # Get cached ETA
-        if visit_id not in self._eta_cache:
-            # No cached value, calculate new one
-            new_eta = self.calculate_eta(visit_id, vehicle_id, use_cache=False)
-            return (True, None) if new_eta else (False, None)
+        # Previous ETA, whatever it was calculated from
+        cached = self._eta_cache.get(visit_id)
+
+        visit = (
+            self.db.query(Visit)
+            .options(joinedload(Visit.case).undefer_group("coordinates"))
+            .filter(Visit.id == visit_id)
+            .first()
+        )
+        if not visit:
+            raise NotFoundError(f"Visit with id {visit_id} not found")
 
-        cached_eta, _ = self._eta_cache[visit_id]
+        # Calculate new ETA without cache (this also refreshes the cache)
+        raw = self._compute_and_cache_eta(visit, vehicle_id)
+        new_eta = raw[0] if raw else None
 
-        # Calculate new ETA without cache
-        new_eta = self.calculate_eta(visit_id, vehicle_id, use_cache=False)
+        if not cached:
+            # No cached value to compare with
+            return (True, None) if new_eta else (False, None)
 
         if not new_eta:
             return (False, None)
 
+        cached_eta = cached[0]
+
         # Calculate difference
         change_minutes = (new_eta - cached_eta).total_seconds() / 60
 
@@ -231,6 +544,28 @@ class ETACalculator:
 
         return (is_significant, change_minutes)
 
+    def _cache_stamp(self, vehicle_id: int, route_id: int) -> Tuple[int, int, int, int]:
+        """
+        Identify the inputs an ETA was calculated from
+
+        A cached ETA is only reused while its stamp matches, so a new GPS
+        ping for the vehicle or any write to the route or its visits makes
+        it stale immediately instead of after the TTL.
+
+        Args:
+            vehicle_id: Vehicle ID
+            route_id: Route ID of the visit
+
+        Returns:
+            Tuple of (vehicle_id, route_id, location_version, route_version)
+        """
+        return (
+            vehicle_id,
+            route_id,
+            LocationTracker.location_version(vehicle_id),
+            route_version(route_id)
+        )
+
     def invalidate_cache(self, visit_id: Optional[int] = None):
         """
         Invalidate ETA cache
@@ -243,24 +578,6 @@ class ETACalculator:
         else:
             self._eta_cache.clear()
 
-    def _apply_traffic_buffer(
-        self,
-        base_duration_seconds: float,
-        current_time: datetime
-    ) -> float:
-        """
-        Apply traffic buffer based on time of day
-
-        Args:
-            base_duration_seconds: Base travel duration
-            current_time: Current datetime
-
-        Returns:
-            Buffered duration in seconds
-        """
-        multiplier, _ = self._get_traffic_buffer(current_time)
-        return base_duration_seconds * multiplier
-
     def _get_traffic_buffer(
         self,
         current_time: Optional[datetime] = None
@@ -277,28 +594,7 @@ class ETACalculator:
         if not current_time:
             current_time = datetime.utcnow()
 
-        current_hour = current_time.hour
-        current_minute = current_time.minute
-        current_time_minutes = current_hour * 60 + current_minute
-
-        # Late night (22:00-6:00)
-        if current_hour >= 22 or current_hour < 6:
-            return (self.TRAFFIC_BUFFERS["late_night"], "late_night")
-
-        # Morning rush hour (7:00-9:00)
-        if 7 * 60 <= current_time_minutes < 9 * 60:
-            return (self.TRAFFIC_BUFFERS["rush_hour_morning"], "rush_hour_morning")
-
-        # Evening rush hour (17:00-19:00)
-        if 17 * 60 <= current_time_minutes < 19 * 60:
-            return (self.TRAFFIC_BUFFERS["rush_hour_evening"], "rush_hour_evening")
-
-        # Peak hours (12:00-14:00)
-        if 12 * 60 <= current_time_minutes < 14 * 60:
-            return (self.TRAFFIC_BUFFERS["peak_hours"], "peak_hours")
-
-        # Normal hours
-        return (self.TRAFFIC_BUFFERS["normal"], "normal")
+        return self._BUFFER_TABLE[current_time.hour * 60 + current_time.minute]
 
     def _extract_coordinates_from_case(self, case: Case) -> Optional[Tuple[float, float]]:
         """
@@ -310,14 +606,7 @@ class ETACalculator:
         Returns:
             Tuple of (latitude, longitude) or None
         """
-        if not case.location:
+        if case.latitude is None or case.longitude is None:
             return None
 
-        try:
-            # Case location is stored as PostGIS Geography
-            from geoalchemy2.functions import ST_AsGeoJSON
-            geojson = self.db.scalar(ST_AsGeoJSON(case.location))
-            coords = json.loads(geojson)["coordinates"]
-            return (coords[1], coords[0])  # (lat, lng)
-        except Exception:
-            return None
+        return (case.latitude, case.longitude)
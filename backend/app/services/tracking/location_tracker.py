@@ -2,17 +2,193 @@
 Location Tracking Service
 Handles GPS location storage, retrieval, and history management
 """
-from datetime import datetime, timedelta
-from typing import Optional, List
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from itertools import count
+import io
+import logging
+import math
+import re
+import struct
+from typing import Any, Dict, Iterable, Optional, List, Sequence, Set
+import threading
+import time
+import numpy as np
+import shapely
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
-from geoalchemy2.functions import ST_AsGeoJSON, ST_GeogFromText, ST_Distance
-from geoalchemy2.elements import WKTElement
-import json
+from sqlalchemy import and_, delete, desc, event, select, text
+from geoalchemy2.functions import ST_GeogFromText, ST_Distance, ST_DWithin
+from geoalchemy2.elements import WKBElement
 
-from app.models.tracking import LocationLog
+from app.models.tracking import LocationLog, location_logs_staging
 from app.models.vehicle import Vehicle
 from app.core.exceptions import NotFoundError, ValidationError
+from app.utils.batch_writer import BatchInsertWriter
+
+logger = logging.getLogger(__name__)
+
+# Process-wide source of cache versions (next() is atomic under the GIL)
+version_counter = count(1)
+
+
+# Little-endian EWKB layout of a 2D point with an embedded SRID
+_EWKB_POINT = struct.Struct("<BIIdd")
+_EWKB_POINT_WITH_SRID = 0x20000001
+
+# Daily partitions of location_logs are named location_logs_YYYYMMDD
+_PARTITION_NAME = re.compile(r"^location_logs_(\d{8})$")
+
+
+def point_ewkb(longitude: float, latitude: float) -> str:
+    """
+    Encode a WGS84 point as hex EWKB
+
+    PostGIS decodes hex EWKB without parsing coordinate text, so pings are
+    sent in this form rather than as WKT.
+
+    Args:
+        longitude: Longitude coordinate
+        latitude: Latitude coordinate
+
+    Returns:
+        Hex EWKB string with SRID 4326
+    """
+    return _EWKB_POINT.pack(1, _EWKB_POINT_WITH_SRID, 4326, longitude, latitude).hex()
+
+
+def _naive_utc(timestamp: datetime) -> datetime:
+    """Convert an aware timestamp to the naive UTC stored in location_logs"""
+    if timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _copy_text(value: Any) -> str:
+    """Render one value in COPY text format (values never contain tabs or newlines)"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return str(value)
+
+
+def _copy_buffer(records: Iterable[Sequence[Any]]) -> io.StringIO:
+    """Render records as a COPY text-format buffer, positioned at the start"""
+    buffer = io.StringIO()
+    for record in records:
+        buffer.write("\t".join(_copy_text(value) for value in record))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+class LocationLogWriter(BatchInsertWriter):
+    """
+    Background writer that batches GPS ping inserts off the request path.
+
+    Pings are queued by LocationTracker.enqueue_location and loaded with
+    COPY, up to BATCH_SIZE rows at a time, into the unindexed
+    location_logs_staging table. Staged rows are moved into location_logs
+    every MERGE_INTERVAL_SECONDS, and whenever the queue runs dry so that
+    readers never wait long for a quiet vehicle's last ping.
+    """
+
+    BATCH_SIZE = 1000
+    FLUSH_INTERVAL_SECONDS = 0.5
+    MERGE_INTERVAL_SECONDS = 5.0
+
+    model = location_logs_staging
+    thread_name = "location-log-writer"
+
+    # Staging columns in COPY order; created_at is stamped per batch
+    STAGING_COLUMNS = (
+        "vehicle_id", "location", "timestamp", "speed_kmh",
+        "heading_degrees", "accuracy_meters", "created_at"
+    )
+    COPY_SQL = f"COPY location_logs_staging ({', '.join(STAGING_COLUMNS)}) FROM STDIN"
+
+    # Returns the IDs of the vehicles whose pings were moved
+    MERGE_SQL = text("""
+        WITH moved AS (
+            DELETE FROM location_logs_staging
+            RETURNING vehicle_id, location, timestamp, speed_kmh,
+                      heading_degrees, accuracy_meters, created_at
+        ),
+        inserted AS (
+            INSERT INTO location_logs (
+                vehicle_id, location, timestamp, speed_kmh,
+                heading_degrees, accuracy_meters, created_at, updated_at
+            )
+            SELECT vehicle_id, location, timestamp, speed_kmh,
+                   heading_degrees, accuracy_meters, created_at, created_at
+            FROM moved
+            RETURNING vehicle_id
+        )
+        SELECT DISTINCT vehicle_id FROM inserted
+    """)
+
+    def __init__(self, session_factory=None):
+        super().__init__(session_factory)
+        self._last_merge = time.monotonic()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Flush queued rows, move everything staged and stop the background thread"""
+        was_started = self._thread is not None
+        super().stop(timeout)
+        if was_started:
+            self._merge_staged()
+
+    def _write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        """Stage a batch of rows, then merge if due or the queue is empty"""
+        self._copy_to_staging(rows)
+        if self._queue.empty() or time.monotonic() - self._last_merge >= self.MERGE_INTERVAL_SECONDS:
+            self._merge_staged()
+
+    def _copy_to_staging(self, rows: List[Dict[str, Any]]) -> None:
+        """COPY a batch of rows into the staging table; failures are logged, never raised"""
+        created_at = datetime.utcnow()
+        buffer = _copy_buffer(
+            [row.get(column) for column in self.STAGING_COLUMNS[:-1]] + [created_at]
+            for row in rows
+        )
+
+        db = self._session_factory()
+        try:
+            with db.connection().connection.cursor() as cursor:
+                cursor.copy_expert(self.COPY_SQL, buffer)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to stage {len(rows)} location logs: {e}")
+        finally:
+            db.close()
+
+    def _merge_staged(self) -> None:
+        """
+        Move all staged rows into location_logs in one transaction
+
+        Location versions of the moved vehicles are bumped once the pings are
+        committed, so ETAs computed from their previous location go stale.
+        Failures are logged, never raised.
+        """
+        self._last_merge = time.monotonic()
+        db = self._session_factory()
+        try:
+            vehicle_ids = db.execute(self.MERGE_SQL).scalars().all()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to merge staged location logs: {e}")
+            return
+        finally:
+            db.close()
+
+        for vehicle_id in vehicle_ids:
+            LocationTracker._location_versions[vehicle_id] = next(version_counter)
+
+
+# Process-wide writer, started and stopped by the application lifespan
+location_log_writer = LocationLogWriter()
 
 
 class LocationTracker:
@@ -21,6 +197,26 @@ class LocationTracker:
     # Data retention period (90 days)
     RETENTION_DAYS = 90
 
+    # Daily location_logs partitions kept created ahead of today
+    PARTITION_PREMAKE_DAYS = 7
+
+    # Target of record_locations_bulk (latitude/longitude are generated)
+    BULK_COPY_SQL = (
+        "COPY location_logs (vehicle_id, location, timestamp, speed_kmh, "
+        "heading_degrees, accuracy_meters, created_at, updated_at) FROM STDIN"
+    )
+
+    # Seconds between reloads of the known vehicle IDs used to validate pings
+    VEHICLE_IDS_REFRESH_SECONDS = 30.0
+
+    # Last recorded ping per vehicle: vehicle_id -> version
+    _location_versions: Dict[int, int] = {}
+
+    # Known vehicle IDs, reloaded every VEHICLE_IDS_REFRESH_SECONDS
+    _vehicle_ids: Set[int] = set()
+    _vehicle_ids_loaded_at: Optional[float] = None
+    _vehicle_ids_lock = threading.Lock()
+
     def __init__(self, db: Session):
         self.db = db
 
@@ -37,6 +233,10 @@ class LocationTracker:
         """
         Record a new GPS location for a vehicle
 
+        The vehicle is checked against the cached set of known vehicle IDs
+        instead of being fetched per ping. The row is not reloaded after the
+        commit; attributes are only fetched again if the caller reads them.
+
         Args:
             vehicle_id: ID of the vehicle
             latitude: Latitude coordinate (-90 to 90)
@@ -44,7 +244,7 @@ class LocationTracker:
             speed_kmh: Vehicle speed in km/h (optional)
             heading_degrees: Vehicle heading in degrees (0-360, optional)
             accuracy_meters: GPS accuracy in meters (optional)
-            timestamp: Location timestamp (defaults to now)
+            timestamp: Location timestamp (defaults to now, aware values are stored as UTC)
 
         Returns:
             Created LocationLog instance
@@ -53,43 +253,237 @@ class LocationTracker:
             NotFoundError: If vehicle doesn't exist
             ValidationError: If coordinates are invalid
         """
-        # Validate vehicle exists
-        vehicle = self.db.query(Vehicle).filter(Vehicle.id == vehicle_id).first()
-        if not vehicle:
+        location_log = self._add_location(
+            vehicle_id, latitude, longitude,
+            speed_kmh, heading_degrees, accuracy_meters,
+            _naive_utc(timestamp) if timestamp else datetime.utcnow()
+        )
+        self.db.commit()
+
+        self._location_versions[vehicle_id] = next(version_counter)
+
+        return location_log
+
+    def enqueue_location(
+        self,
+        vehicle_id: int,
+        latitude: float,
+        longitude: float,
+        speed_kmh: Optional[float] = None,
+        heading_degrees: Optional[float] = None,
+        accuracy_meters: Optional[float] = None,
+        timestamp: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Validate a GPS ping and queue it for a batched insert
+
+        While location_log_writer is not running the ping is inserted
+        inline, the same way as record_location.
+
+        Args:
+            vehicle_id: ID of the vehicle
+            latitude: Latitude coordinate (-90 to 90)
+            longitude: Longitude coordinate (-180 to 180)
+            speed_kmh: Vehicle speed in km/h (optional)
+            heading_degrees: Vehicle heading in degrees (0-360, optional)
+            accuracy_meters: GPS accuracy in meters (optional)
+            timestamp: Location timestamp (defaults to now, aware values are stored as UTC)
+
+        Returns:
+            Location data dictionary as returned by get_location_as_dict,
+            built from the input ("id" is None when the ping was queued)
+
+        Raises:
+            NotFoundError: If vehicle doesn't exist
+            ValidationError: If coordinates are invalid
+        """
+        timestamp = _naive_utc(timestamp) if timestamp else datetime.utcnow()
+
+        if location_log_writer.is_running:
+            if not self._vehicle_exists(vehicle_id):
+                raise NotFoundError(f"Vehicle with id {vehicle_id} not found")
+
+            self._validate_ping(latitude, longitude, speed_kmh, heading_degrees, accuracy_meters, timestamp)
+
+            location_log_writer.enqueue({
+                "vehicle_id": vehicle_id,
+                "location": point_ewkb(longitude, latitude),
+                "speed_kmh": speed_kmh,
+                "heading_degrees": heading_degrees,
+                "accuracy_meters": accuracy_meters,
+                "timestamp": timestamp
+            })
+            # The version is bumped by the writer once the ping is merged
+            location_id = None
+        else:
+            location_log = self._add_location(
+                vehicle_id, latitude, longitude,
+                speed_kmh, heading_degrees, accuracy_meters, timestamp
+            )
+            # Read before the commit expires it, so nothing is reloaded
+            location_id = location_log.id
+            self.db.commit()
+            self._location_versions[vehicle_id] = next(version_counter)
+
+        return {
+            "id": location_id,
+            "vehicle_id": vehicle_id,
+            "latitude": latitude,
+            "longitude": longitude,
+            "speed_kmh": speed_kmh,
+            "heading_degrees": heading_degrees,
+            "accuracy_meters": accuracy_meters,
+            "timestamp": timestamp.isoformat()
+        }
+
+    def record_locations_bulk(
+        self,
+        vehicle_id: int,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        timestamps: Sequence[datetime],
+        speeds_kmh: Optional[Sequence[float]] = None,
+        headings_degrees: Optional[Sequence[float]] = None,
+        accuracies_meters: Optional[Sequence[float]] = None
+    ) -> int:
+        """
+        Import a vehicle's GPS trace in one COPY (history replays and imports)
+
+        All readings are validated with vectorized comparisons before
+        anything is written; optional readings may use NaN for missing.
+
+        Args:
+            vehicle_id: ID of the vehicle
+            latitudes: Latitude of each ping
+            longitudes: Longitude of each ping
+            timestamps: Timestamp of each ping (aware values are stored as UTC)
+            speeds_kmh: Speed of each ping (optional)
+            headings_degrees: Heading of each ping (optional)
+            accuracies_meters: GPS accuracy of each ping (optional)
+
+        Returns:
+            Number of pings recorded
+
+        Raises:
+            NotFoundError: If vehicle doesn't exist
+            ValidationError: If any reading is invalid (lists the bad row indices)
+        """
+        if not self._vehicle_exists(vehicle_id):
             raise NotFoundError(f"Vehicle with id {vehicle_id} not found")
 
-        # Validate coordinates
-        self._validate_coordinates(latitude, longitude)
+        timestamps = [_naive_utc(timestamp) for timestamp in timestamps]
+        lat = np.asarray(latitudes, dtype=np.float64)
+        lon = np.asarray(longitudes, dtype=np.float64)
+        n = len(lat)
+        if len(lon) != n or len(timestamps) != n:
+            raise ValidationError("latitudes, longitudes and timestamps must have the same length")
+
+        missing = np.full(n, np.nan)
+        speed = missing if speeds_kmh is None else np.asarray(speeds_kmh, dtype=np.float64)
+        heading = missing if headings_degrees is None else np.asarray(headings_degrees, dtype=np.float64)
+        accuracy = missing if accuracies_meters is None else np.asarray(accuracies_meters, dtype=np.float64)
+
+        # NaN coordinates fail the range test; NaN optional readings mean "missing"
+        valid = (lat >= -90) & (lat <= 90) & (lon >= -180) & (lon <= 180)
+        valid &= np.asarray(timestamps, dtype="datetime64[us]") <= np.datetime64(self._latest_valid_timestamp())
+        with np.errstate(invalid="ignore"):
+            valid &= ~(speed < 0) & ~(heading < 0) & ~(heading > 360) & ~(accuracy < 0)
+        if not valid.all():
+            bad = np.flatnonzero(~valid)
+            raise ValidationError(f"Invalid GPS readings at rows {bad[:20].tolist()} ({len(bad)} total)")
+
+        if n == 0:
+            return 0
+
+        points = shapely.set_srid(shapely.points(lon, lat), 4326)
+        locations = shapely.to_wkb(points, hex=True, include_srid=True)
+        created_at = datetime.utcnow()
+
+        buffer = _copy_buffer(zip(
+            [vehicle_id] * n, locations, timestamps,
+            speed.tolist(), heading.tolist(), accuracy.tolist(),
+            [created_at] * n, [created_at] * n
+        ))
+        with self.db.connection().connection.cursor() as cursor:
+            cursor.copy_expert(self.BULK_COPY_SQL, buffer)
+        self.db.commit()
 
-        # Validate optional parameters
-        if speed_kmh is not None and speed_kmh < 0:
-            raise ValidationError("Speed cannot be negative")
+        self._location_versions[vehicle_id] = next(version_counter)
 
-        if heading_degrees is not None and not (0 <= heading_degrees <= 360):
-            raise ValidationError("Heading must be between 0 and 360 degrees")
+        return n
 
-        if accuracy_meters is not None and accuracy_meters < 0:
-            raise ValidationError("Accuracy cannot be negative")
+    def _add_location(
+        self,
+        vehicle_id: int,
+        latitude: float,
+        longitude: float,
+        speed_kmh: Optional[float],
+        heading_degrees: Optional[float],
+        accuracy_meters: Optional[float],
+        timestamp: datetime
+    ) -> LocationLog:
+        """
+        Validate a GPS ping and flush it as a new LocationLog
 
-        # Create WKT Point for PostGIS
-        point_wkt = f"POINT({longitude} {latitude})"
+        The flush's INSERT ... RETURNING assigns the id; committing is left
+        to the caller.
+
+        Raises:
+            NotFoundError: If vehicle doesn't exist
+            ValidationError: If coordinates are invalid
+        """
+        if not self._vehicle_exists(vehicle_id):
+            raise NotFoundError(f"Vehicle with id {vehicle_id} not found")
+
+        self._validate_ping(latitude, longitude, speed_kmh, heading_degrees, accuracy_meters, timestamp)
 
-        # Create location log
         location_log = LocationLog(
             vehicle_id=vehicle_id,
-            location=point_wkt,
+            location=WKBElement(point_ewkb(longitude, latitude), srid=4326, extended=True),
             speed_kmh=speed_kmh,
             heading_degrees=heading_degrees,
             accuracy_meters=accuracy_meters,
-            timestamp=timestamp or datetime.utcnow()
+            timestamp=timestamp
         )
 
         self.db.add(location_log)
-        self.db.commit()
-        self.db.refresh(location_log)
+        self.db.flush()
 
         return location_log
 
+    def _vehicle_exists(self, vehicle_id: int) -> bool:
+        """
+        Check a vehicle ID against the cached set of known vehicle IDs
+
+        The set is reloaded when older than VEHICLE_IDS_REFRESH_SECONDS; an
+        ID missing from a fresh set is looked up once so new vehicles are
+        accepted before the next reload. Deleted vehicles are dropped from
+        the set by a mapper event.
+        """
+        cls = LocationTracker
+        with cls._vehicle_ids_lock:
+            loaded_at = cls._vehicle_ids_loaded_at
+            if loaded_at is None or time.monotonic() - loaded_at >= self.VEHICLE_IDS_REFRESH_SECONDS:
+                cls._vehicle_ids = set(self.db.scalars(select(Vehicle.id)))
+                cls._vehicle_ids_loaded_at = time.monotonic()
+            elif vehicle_id not in cls._vehicle_ids:
+                if self.db.scalar(select(Vehicle.id).where(Vehicle.id == vehicle_id)) is not None:
+                    cls._vehicle_ids.add(vehicle_id)
+            return vehicle_id in cls._vehicle_ids
+
+    @classmethod
+    def location_version(cls, vehicle_id: int) -> int:
+        """
+        Get the version of a vehicle's location, bumped on every recorded ping
+
+        Args:
+            vehicle_id: ID of the vehicle
+
+        Returns:
+            Version number (0 if no ping recorded in this process)
+        """
+        return cls._location_versions.get(vehicle_id, 0)
+
     def get_current_location(self, vehicle_id: int) -> Optional[LocationLog]:
         """
         Get the most recent location for a vehicle
@@ -146,15 +540,11 @@ class LocationTracker:
         Returns:
             Dictionary with location data including lat/lng
         """
-        # Extract coordinates from PostGIS Geography type
-        geojson = self.db.scalar(ST_AsGeoJSON(location_log.location))
-        coords = json.loads(geojson)["coordinates"]
-
         return {
             "id": location_log.id,
             "vehicle_id": location_log.vehicle_id,
-            "latitude": coords[1],
-            "longitude": coords[0],
+            "latitude": location_log.latitude,
+            "longitude": location_log.longitude,
             "speed_kmh": location_log.speed_kmh,
             "heading_degrees": location_log.heading_degrees,
             "accuracy_meters": location_log.accuracy_meters,
@@ -178,7 +568,7 @@ class LocationTracker:
             max_age_minutes: Maximum age of location data in minutes
 
         Returns:
-            List of dictionaries with vehicle IDs and their distances
+            List of dictionaries with vehicle IDs and their distances, nearest first
         """
         self._validate_coordinates(latitude, longitude)
 
@@ -189,32 +579,32 @@ class LocationTracker:
         # Calculate cutoff time
         cutoff_time = datetime.utcnow() - timedelta(minutes=max_age_minutes)
 
-        # Subquery to get most recent location per vehicle
-        from sqlalchemy import func
-        subquery = (
-            self.db.query(
-                LocationLog.vehicle_id,
-                func.max(LocationLog.timestamp).label("max_timestamp")
-            )
+        # Most recent ping per vehicle via DISTINCT ON; ordering both keys
+        # descending lets PostgreSQL walk idx_location_logs_vehicle_timestamp backwards
+        latest_ids = (
+            self.db.query(LocationLog.id, LocationLog.timestamp)
             .filter(LocationLog.timestamp >= cutoff_time)
-            .group_by(LocationLog.vehicle_id)
+            .distinct(LocationLog.vehicle_id)
+            .order_by(desc(LocationLog.vehicle_id), desc(LocationLog.timestamp))
             .subquery()
         )
 
-        # Query for nearby vehicles
+        # Query for nearby vehicles (coordinates come back as LocationLog columns).
+        # ST_DWithin can use the spatial index on location; exact distances are
+        # only computed for the rows it keeps. The join carries the partition
+        # key and the cutoff is repeated so only recent partitions are probed.
+        distance_col = ST_Distance(LocationLog.location, point).label("distance")
         results = (
-            self.db.query(
-                LocationLog,
-                ST_Distance(LocationLog.location, point).label("distance")
+            self.db.query(LocationLog, distance_col)
+            .join(latest_ids, and_(
+                LocationLog.id == latest_ids.c.id,
+                LocationLog.timestamp == latest_ids.c.timestamp
+            ))
+            .filter(
+                LocationLog.timestamp >= cutoff_time,
+                ST_DWithin(LocationLog.location, point, radius_meters)
             )
-            .join(
-                subquery,
-                and_(
-                    LocationLog.vehicle_id == subquery.c.vehicle_id,
-                    LocationLog.timestamp == subquery.c.max_timestamp
-                )
-            )
-            .filter(ST_Distance(LocationLog.location, point) <= radius_meters)
+            .order_by(distance_col)
             .all()
         )
 
@@ -234,19 +624,106 @@ class LocationTracker:
             days: Number of days to retain (defaults to RETENTION_DAYS)
 
         Returns:
-            Number of records deleted
+            Number of records deleted (dropped partitions count with their
+            planner row estimate, so the total may be approximate)
         """
         retention_days = days or self.RETENTION_DAYS
         cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
-
-        deleted = (
-            self.db.query(LocationLog)
-            .filter(LocationLog.timestamp < cutoff_date)
-            .delete()
+        deleted = 0
+
+        # Whole days before the cutoff are dropped as partitions: no row is
+        # deleted one by one, so no WAL per row and nothing left to vacuum
+        for day, partition in self._daily_partitions().items():
+            if datetime.combine(day + timedelta(days=1), datetime.min.time()) > cutoff_date:
+                continue
+            # Counting the rows would scan the table about to be dropped
+            deleted += self.db.execute(
+                text("SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE relname = :partition"),
+                {"partition": partition}
+            ).scalar() or 0
+            self.db.execute(text(f'DROP TABLE IF EXISTS "{partition}"'))
+
+        # Rest of the cutoff day, the default partition, or an unpartitioned
+        # table. Single set-based DELETE; no loaded LocationLog needs syncing
+        result = self.db.execute(
+            delete(LocationLog)
+            .where(LocationLog.timestamp < cutoff_date)
+            .execution_options(synchronize_session=False)
         )
 
         self.db.commit()
-        return deleted
+        return deleted + result.rowcount
+
+    def ensure_partitions(self, days_ahead: Optional[int] = None) -> int:
+        """
+        Create the missing daily location_logs partitions from today on
+
+        No-op when location_logs is not partitioned. Each day is created in
+        its own savepoint, so a day that cannot be created (e.g. because the
+        default partition already holds rows for it) is logged and skipped
+        without losing the others.
+
+        Args:
+            days_ahead: Days after today to cover (defaults to PARTITION_PREMAKE_DAYS)
+
+        Returns:
+            Number of partitions created
+        """
+        if not self._is_partitioned():
+            return 0
+
+        days_ahead = self.PARTITION_PREMAKE_DAYS if days_ahead is None else days_ahead
+        existing = self._daily_partitions()
+        today = datetime.utcnow().date()
+        created = 0
+
+        for offset in range(days_ahead + 1):
+            day = today + timedelta(days=offset)
+            if day in existing:
+                continue
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(text(
+                        f'CREATE TABLE IF NOT EXISTS "location_logs_{day:%Y%m%d}" PARTITION OF location_logs '
+                        f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+                    ))
+            except Exception as e:
+                logger.error(f"Failed to create location_logs partition for {day}: {e}")
+                continue
+            created += 1
+
+        self.db.commit()
+        return created
+
+    def _latest_valid_timestamp(self) -> datetime:
+        """
+        Latest accepted ping timestamp
+
+        Pings must fall within the pre-made daily partitions: rows parked in
+        the default partition for a future day would block creating it.
+        """
+        return datetime.utcnow() + timedelta(days=self.PARTITION_PREMAKE_DAYS)
+
+    def _is_partitioned(self) -> bool:
+        """Whether location_logs is a partitioned table"""
+        return bool(self.db.execute(text(
+            "SELECT relkind = 'p' FROM pg_class WHERE oid = 'location_logs'::regclass"
+        )).scalar())
+
+    def _daily_partitions(self) -> Dict[date, str]:
+        """Daily partitions of location_logs: day -> partition table name"""
+        names = self.db.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'location_logs'::regclass"
+        )).scalars()
+
+        partitions = {}
+        for name in names:
+            match = _PARTITION_NAME.match(name)
+            if match:
+                partitions[datetime.strptime(match.group(1), "%Y%m%d").date()] = name
+        return partitions
 
     def _validate_coordinates(self, latitude: float, longitude: float):
         """
@@ -259,8 +736,95 @@ class LocationTracker:
         Raises:
             ValidationError: If coordinates are out of valid range
         """
+        # One combined test on the valid path (NaN fails it, like any out-of-range value)
+        if -90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0:
+            return
+
         if not (-90 <= latitude <= 90):
             raise ValidationError(f"Latitude must be between -90 and 90, got {latitude}")
 
         if not (-180 <= longitude <= 180):
             raise ValidationError(f"Longitude must be between -180 and 180, got {longitude}")
+
+    def _validate_ping(
+        self,
+        latitude: float,
+        longitude: float,
+        speed_kmh: Optional[float],
+        heading_degrees: Optional[float],
+        accuracy_meters: Optional[float],
+        timestamp: datetime
+    ):
+        """
+        Validate the coordinates, timestamp and optional readings of a GPS ping
+
+        Raises:
+            ValidationError: If any value is out of its valid range
+        """
+        self._validate_coordinates(latitude, longitude)
+
+        if timestamp > self._latest_valid_timestamp():
+            raise ValidationError("Timestamp is too far in the future")
+
+        if speed_kmh is not None and speed_kmh < 0:
+            raise ValidationError("Speed cannot be negative")
+
+        if heading_degrees is not None and not (0 <= heading_degrees <= 360):
+            raise ValidationError("Heading must be between 0 and 360 degrees")
+
+        if accuracy_meters is not None and accuracy_meters < 0:
+            raise ValidationError("Accuracy cannot be negative")
+
+
+def _forget_vehicle_id(mapper, connection, target) -> None:
+    """Mapper event hook: drop a deleted vehicle from the known vehicle IDs."""
+    LocationTracker._vehicle_ids.discard(target.id)
+
+
+event.listen(Vehicle, "after_delete", _forget_vehicle_id)
+
+
+# Seconds between runs of the location_logs partition maintenance
+PARTITION_MAINTENANCE_INTERVAL_SECONDS = 24 * 60 * 60
+
+
+def maintain_location_partitions(session_factory=None) -> None:
+    """
+    Create upcoming daily location_logs partitions and drop expired ones
+
+    Failures are logged, never raised.
+
+    Args:
+        session_factory: Callable returning a new Session (defaults to SessionLocal)
+    """
+    if session_factory is None:
+        from app.core.database import SessionLocal
+        session_factory = SessionLocal
+
+    db = session_factory()
+    try:
+        tracker = LocationTracker(db)
+
+        # Retention must not depend on partition creation succeeding
+        try:
+            created = tracker.ensure_partitions()
+            logger.info(f"location_logs maintenance: {created} partitions created")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"location_logs partition creation failed: {e}")
+
+        try:
+            deleted = tracker.cleanup_old_locations()
+            logger.info(f"location_logs maintenance: {deleted} rows expired")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"location_logs cleanup failed: {e}")
+    finally:
+        db.close()
+
+
+async def partition_maintenance_task():
+    """Background task running partition maintenance at startup and then daily"""
+    while True:
+        await asyncio.to_thread(maintain_location_partitions)
+        await asyncio.sleep(PARTITION_MAINTENANCE_INTERVAL_SECONDS)
@@ -3,13 +3,14 @@ Route Tracker Service
 Handles active route tracking, visit status updates, and completion detection
 """
 from datetime import datetime, date
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, event, func, inspect, or_
 
 from app.models.route import Route, Visit, RouteStatus, VisitStatus
 from app.models.case import Case, CaseStatus
 from app.core.exceptions import NotFoundError, ValidationError
+from app.utils.ttl_cache import TTLCache
 
 
 class RouteTrackerService:
@@ -17,15 +18,25 @@ class RouteTrackerService:
 
     # Valid status transitions for visits
     VALID_VISIT_TRANSITIONS = {
-        VisitStatus.PENDING: [VisitStatus.EN_ROUTE, VisitStatus.CANCELLED],
-        VisitStatus.EN_ROUTE: [VisitStatus.ARRIVED, VisitStatus.CANCELLED],
-        VisitStatus.ARRIVED: [VisitStatus.IN_PROGRESS, VisitStatus.CANCELLED],
-        VisitStatus.IN_PROGRESS: [VisitStatus.COMPLETED, VisitStatus.FAILED],
-        VisitStatus.COMPLETED: [],  # Terminal state
-        VisitStatus.CANCELLED: [],  # Terminal state
-        VisitStatus.FAILED: [],     # Terminal state
+        VisitStatus.PENDING: frozenset({VisitStatus.EN_ROUTE, VisitStatus.CANCELLED}),
+        VisitStatus.EN_ROUTE: frozenset({VisitStatus.ARRIVED, VisitStatus.CANCELLED}),
+        VisitStatus.ARRIVED: frozenset({VisitStatus.IN_PROGRESS, VisitStatus.CANCELLED}),
+        VisitStatus.IN_PROGRESS: frozenset({VisitStatus.COMPLETED, VisitStatus.FAILED}),
+        VisitStatus.COMPLETED: frozenset(),  # Terminal state
+        VisitStatus.CANCELLED: frozenset(),  # Terminal state
+        VisitStatus.FAILED: frozenset(),     # Terminal state
     }
 
+    TERMINAL_VISIT_STATUSES = frozenset({VisitStatus.COMPLETED, VisitStatus.FAILED, VisitStatus.CANCELLED})
+
+    ACTIVE_ROUTE_STATUSES = frozenset({RouteStatus.ACTIVE, RouteStatus.IN_PROGRESS})
+
+    # Active route per vehicle, shared by all instances: vehicle_id -> route_id
+    # (None when the vehicle has none). Route writes in this process evict the
+    # vehicle's entry; the TTL bounds staleness from writes made elsewhere.
+    ACTIVE_ROUTE_TTL_SECONDS = 30
+    _active_route_ids = TTLCache(maxsize=10_000, ttl=ACTIVE_ROUTE_TTL_SECONDS)
+
     def __init__(self, db: Session):
         self.db = db
 
@@ -42,10 +53,10 @@ class RouteTrackerService:
             vehicle_id: Filter by vehicle ID (optional)
 
         Returns:
-            List of active Route instances
+            List of active Route instances (vehicle loaded, visits not loaded)
         """
-        query = self.db.query(Route).filter(
-            Route.status.in_([RouteStatus.ACTIVE, RouteStatus.IN_PROGRESS])
+        query = self.db.query(Route).options(joinedload(Route.vehicle)).filter(
+            Route.status.in_(self.ACTIVE_ROUTE_STATUSES)
         )
 
         if route_date:
@@ -84,16 +95,28 @@ class RouteTrackerService:
         Returns:
             Active Route instance or None
         """
-        return (
+        if vehicle_id in self._active_route_ids:
+            route_id = self._active_route_ids[vehicle_id]
+            if route_id is None:
+                return None
+            # Primary-key load (served from the session when already present);
+            # re-checked in case another process changed the route
+            route = self.db.get(Route, route_id)
+            if route is not None and route.vehicle_id == vehicle_id and route.status in self.ACTIVE_ROUTE_STATUSES:
+                return route
+
+        route = (
             self.db.query(Route)
             .filter(
                 and_(
                     Route.vehicle_id == vehicle_id,
-                    Route.status.in_([RouteStatus.ACTIVE, RouteStatus.IN_PROGRESS])
+                    Route.status.in_(self.ACTIVE_ROUTE_STATUSES)
                 )
             )
             .first()
         )
+        self._active_route_ids[vehicle_id] = route.id if route else None
+        return route
 
     def update_visit_status(
         self,
@@ -116,8 +139,13 @@ class RouteTrackerService:
             NotFoundError: If visit not found
             ValidationError: If status transition is invalid
         """
-        # Get visit
-        visit = self.db.query(Visit).filter(Visit.id == visit_id).first()
+        # Get visit with its route and case in the same SELECT
+        visit = (
+            self.db.query(Visit)
+            .options(joinedload(Visit.route), joinedload(Visit.case))
+            .filter(Visit.id == visit_id)
+            .first()
+        )
         if not visit:
             raise NotFoundError(f"Visit with id {visit_id} not found")
 
@@ -143,21 +171,21 @@ class RouteTrackerService:
             if not visit.actual_departure_time:
                 visit.actual_departure_time = now
 
-        self.db.commit()
-        self.db.refresh(visit)
-
         # Update associated case status
         self._update_case_status_from_visit(visit)
 
         # Check if route should be updated
-        self._check_route_completion(visit.route_id)
+        self._check_route_completion(visit.route)
 
         # Mark route as in_progress if first visit started
         if new_status == VisitStatus.EN_ROUTE:
             route = visit.route
             if route.status == RouteStatus.ACTIVE:
                 route.status = RouteStatus.IN_PROGRESS
-                self.db.commit()
+
+        # Visit, case and route changes are committed as one transaction
+        self.db.commit()
+        self.db.refresh(visit)
 
         return visit
 
@@ -218,15 +246,26 @@ class RouteTrackerService:
 
         Returns:
             Dictionary with progress statistics
+
+        Raises:
+            NotFoundError: If route not found
         """
-        route = self.get_route_by_id(route_id)
-        visits = route.visits
+        counts = dict(
+            self.db.query(Visit.status, func.count(Visit.id))
+            .filter(Visit.route_id == route_id)
+            .group_by(Visit.status)
+            .all()
+        )
+
+        total_visits = sum(counts.values())
+        if total_visits == 0:
+            # Distinguish an empty route from a missing one
+            self.get_route_by_id(route_id)
 
-        total_visits = len(visits)
-        completed = sum(1 for v in visits if v.status == VisitStatus.COMPLETED)
-        in_progress = sum(1 for v in visits if v.status == VisitStatus.IN_PROGRESS)
-        failed = sum(1 for v in visits if v.status == VisitStatus.FAILED)
-        cancelled = sum(1 for v in visits if v.status == VisitStatus.CANCELLED)
+        completed = counts.get(VisitStatus.COMPLETED, 0)
+        in_progress = counts.get(VisitStatus.IN_PROGRESS, 0)
+        failed = counts.get(VisitStatus.FAILED, 0)
+        cancelled = counts.get(VisitStatus.CANCELLED, 0)
 
         return {
             "route_id": route_id,
@@ -239,6 +278,33 @@ class RouteTrackerService:
             "completion_percentage": round((completed / total_visits * 100), 2) if total_visits > 0 else 0
         }
 
+    def get_visit_status_counts(self, route_ids: Iterable[int]) -> Dict[int, Dict[VisitStatus, int]]:
+        """
+        Count visits per status for many routes in one grouped query
+
+        Args:
+            route_ids: Route IDs
+
+        Returns:
+            Dictionary of route_id -> {VisitStatus: count}; routes without
+            visits are omitted
+        """
+        route_ids = list(route_ids)
+        if not route_ids:
+            return {}
+
+        rows = (
+            self.db.query(Visit.route_id, Visit.status, func.count(Visit.id))
+            .filter(Visit.route_id.in_(route_ids))
+            .group_by(Visit.route_id, Visit.status)
+            .all()
+        )
+
+        counts: Dict[int, Dict[VisitStatus, int]] = {}
+        for route_id, visit_status, visit_count in rows:
+            counts.setdefault(route_id, {})[visit_status] = visit_count
+        return counts
+
     def _is_valid_transition(
         self,
         current_status: VisitStatus,
@@ -254,15 +320,14 @@ class RouteTrackerService:
         Returns:
             True if transition is valid
         """
-        if current_status == new_status:
-            return True
-
-        allowed_transitions = self.VALID_VISIT_TRANSITIONS.get(current_status, [])
-        return new_status in allowed_transitions
+        return (
+            current_status == new_status
+            or new_status in self.VALID_VISIT_TRANSITIONS.get(current_status, frozenset())
+        )
 
     def _update_case_status_from_visit(self, visit: Visit):
         """
-        Update case status based on visit status
+        Update case status based on visit status (committed by the caller)
 
         Args:
             visit: Visit instance
@@ -278,30 +343,28 @@ class RouteTrackerService:
         elif visit.status in [VisitStatus.EN_ROUTE, VisitStatus.ARRIVED, VisitStatus.IN_PROGRESS]:
             case.status = CaseStatus.IN_PROGRESS
 
-        self.db.commit()
-
-    def _check_route_completion(self, route_id: int):
+    def _check_route_completion(self, route: Route):
         """
         Check if all visits in route are complete and update route status
+        (committed by the caller)
 
         Args:
-            route_id: Route ID
+            route: Route instance
         """
-        route = self.get_route_by_id(route_id)
+        # Only an in-progress route can complete
+        if route.status != RouteStatus.IN_PROGRESS:
+            return
 
-        # Check if all visits are in terminal state
-        all_complete = all(
-            visit.status in [
-                VisitStatus.COMPLETED,
-                VisitStatus.FAILED,
-                VisitStatus.CANCELLED
-            ]
-            for visit in route.visits
-        )
+        # Pending status changes must reach the probe (sessions run with autoflush=False)
+        self.db.flush()
 
-        if all_complete and route.status == RouteStatus.IN_PROGRESS:
+        # Probe for any visit not yet in a terminal state instead of loading them all
+        open_visits = self.db.query(Visit).filter(
+            Visit.route_id == route.id,
+            Visit.status.notin_(self.TERMINAL_VISIT_STATUSES)
+        )
+        if not self.db.query(open_visits.exists()).scalar():
             route.status = RouteStatus.COMPLETED
-            self.db.commit()
 
     def cancel_route(self, route_id: int, reason: Optional[str] = None) -> Route:
         """
@@ -323,15 +386,34 @@ class RouteTrackerService:
         if route.status == RouteStatus.COMPLETED:
             raise ValidationError("Cannot cancel a completed route")
 
-        # Cancel all non-terminal visits
-        for visit in route.visits:
-            if visit.status not in [VisitStatus.COMPLETED, VisitStatus.FAILED, VisitStatus.CANCELLED]:
-                visit.status = VisitStatus.CANCELLED
-                if reason:
-                    visit.notes = f"Route cancelled: {reason}"
+        # Cancel all non-terminal visits with one UPDATE (the commit expires
+        # any loaded visits, so no session synchronization is needed)
+        values = {Visit.status: VisitStatus.CANCELLED}
+        if reason:
+            values[Visit.notes] = f"Route cancelled: {reason}"
+
+        (
+            self.db.query(Visit)
+            .filter(
+                Visit.route_id == route_id,
+                Visit.status.notin_(self.TERMINAL_VISIT_STATUSES)
+            )
+            .update(values, synchronize_session=False)
+        )
 
         route.status = RouteStatus.CANCELLED
         self.db.commit()
         self.db.refresh(route)
 
         return route
+
+
+def _forget_active_route(mapper, connection, target) -> None:
+    """Mapper event hook: evict cached active routes of the vehicles a Route write touches."""
+    vehicle_ids = {target.vehicle_id, *inspect(target).attrs.vehicle_id.history.deleted}
+    for vehicle_id in vehicle_ids:
+        RouteTrackerService._active_route_ids.pop(vehicle_id, None)
+
+
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(Route, _event_name, _forget_active_route)
@@ -2,16 +2,34 @@
 WebSocket Manager for Real-Time Tracking
 Handles WebSocket connections, authentication, subscriptions, and broadcasts
 """
-from typing import Dict, Set, Optional, List
+from typing import Collection, Dict, Set, Optional, List
 from fastapi import WebSocket, WebSocketDisconnect, status
 from datetime import datetime
-import json
 import asyncio
+import time
+import orjson
 from collections import defaultdict
 
 from app.core.security import verify_access_token
 from app.core.exceptions import AuthenticationError
 
+# Seconds a formatted message timestamp is reused
+TIMESTAMP_RESOLUTION_SECONDS = 0.1
+
+# (time.monotonic() when formatted, ISO timestamp)
+_timestamp_cache = (float("-inf"), "")
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time in ISO format, reformatted at most every TIMESTAMP_RESOLUTION_SECONDS"""
+    global _timestamp_cache
+    formatted_at, timestamp = _timestamp_cache
+    now = time.monotonic()
+    if now - formatted_at >= TIMESTAMP_RESOLUTION_SECONDS:
+        timestamp = datetime.utcnow().isoformat()
+        _timestamp_cache = (now, timestamp)
+    return timestamp
+
 
 class ConnectionManager:
     """Manages WebSocket connections for real-time tracking"""
@@ -80,7 +98,7 @@ class ConnectionManager:
             {
                 "type": "connection_established",
                 "connection_id": connection_id,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _utc_timestamp()
             }
         )
 
@@ -129,7 +147,7 @@ class ConnectionManager:
                     "type": "subscription_confirmed",
                     "subscription_type": "vehicle",
                     "vehicle_id": vehicle_id,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": _utc_timestamp()
                 }
             )
 
@@ -153,7 +171,7 @@ class ConnectionManager:
                     "type": "subscription_confirmed",
                     "subscription_type": "route",
                     "route_id": route_id,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": _utc_timestamp()
                 }
             )
 
@@ -177,7 +195,7 @@ class ConnectionManager:
                     "type": "unsubscribed",
                     "subscription_type": "vehicle",
                     "vehicle_id": vehicle_id,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": _utc_timestamp()
                 }
             )
 
@@ -193,30 +211,18 @@ class ConnectionManager:
             vehicle_id: Vehicle ID
             location_data: Location data dictionary
         """
-        subscribers = self.vehicle_subscriptions.get(vehicle_id, set())
+        subscribers = self.vehicle_subscriptions.get(vehicle_id)
+        if not subscribers:
+            return
 
         message = {
             "type": "location_update",
             "vehicle_id": vehicle_id,
             "data": location_data,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _utc_timestamp()
         }
 
-        # Send to all subscribers
-        disconnected = []
-        for connection_id in subscribers:
-            websocket = self.active_connections.get(connection_id)
-            if websocket:
-                try:
-                    await self._send_message(websocket, message)
-                except Exception:
-                    disconnected.append(connection_id)
-            else:
-                disconnected.append(connection_id)
-
-        # Clean up disconnected clients
-        for connection_id in disconnected:
-            self.disconnect(connection_id)
+        await self._broadcast(subscribers, message)
 
     async def broadcast_visit_status_update(
         self,
@@ -232,31 +238,19 @@ class ConnectionManager:
             visit_id: Visit ID
             status_data: Status data dictionary
         """
-        subscribers = self.route_subscriptions.get(route_id, set())
+        subscribers = self.route_subscriptions.get(route_id)
+        if not subscribers:
+            return
 
         message = {
             "type": "visit_status_update",
             "route_id": route_id,
             "visit_id": visit_id,
             "data": status_data,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _utc_timestamp()
         }
 
-        # Send to all subscribers
-        disconnected = []
-        for connection_id in subscribers:
-            websocket = self.active_connections.get(connection_id)
-            if websocket:
-                try:
-                    await self._send_message(websocket, message)
-                except Exception:
-                    disconnected.append(connection_id)
-            else:
-                disconnected.append(connection_id)
-
-        # Clean up disconnected clients
-        for connection_id in disconnected:
-            self.disconnect(connection_id)
+        await self._broadcast(subscribers, message)
 
     async def broadcast_eta_update(
         self,
@@ -272,31 +266,19 @@ class ConnectionManager:
             visit_id: Visit ID
             eta_data: ETA data dictionary
         """
-        subscribers = self.route_subscriptions.get(route_id, set())
+        subscribers = self.route_subscriptions.get(route_id)
+        if not subscribers:
+            return
 
         message = {
             "type": "eta_update",
             "route_id": route_id,
             "visit_id": visit_id,
             "data": eta_data,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _utc_timestamp()
         }
 
-        # Send to all subscribers
-        disconnected = []
-        for connection_id in subscribers:
-            websocket = self.active_connections.get(connection_id)
-            if websocket:
-                try:
-                    await self._send_message(websocket, message)
-                except Exception:
-                    disconnected.append(connection_id)
-            else:
-                disconnected.append(connection_id)
-
-        # Clean up disconnected clients
-        for connection_id in disconnected:
-            self.disconnect(connection_id)
+        await self._broadcast(subscribers, message)
 
     async def broadcast_delay_alert(
         self,
@@ -310,30 +292,18 @@ class ConnectionManager:
             route_id: Route ID
             alert_data: Alert data dictionary
         """
-        subscribers = self.route_subscriptions.get(route_id, set())
+        subscribers = self.route_subscriptions.get(route_id)
+        if not subscribers:
+            return
 
         message = {
             "type": "delay_alert",
             "route_id": route_id,
             "data": alert_data,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _utc_timestamp()
         }
 
-        # Send to all subscribers
-        disconnected = []
-        for connection_id in subscribers:
-            websocket = self.active_connections.get(connection_id)
-            if websocket:
-                try:
-                    await self._send_message(websocket, message)
-                except Exception:
-                    disconnected.append(connection_id)
-            else:
-                disconnected.append(connection_id)
-
-        # Clean up disconnected clients
-        for connection_id in disconnected:
-            self.disconnect(connection_id)
+        await self._broadcast(subscribers, message)
 
     async def send_personal_message(self, connection_id: str, message: dict):
         """
@@ -367,25 +337,56 @@ class ConnectionManager:
             websocket: WebSocket instance
             message: Message dictionary
         """
-        try:
-            await websocket.send_text(json.dumps(message))
-        except Exception as e:
-            # Connection may be closed
-            raise e
+        await websocket.send_text(orjson.dumps(message).decode())
 
     async def ping_all(self):
         """Send ping to all connections to keep them alive"""
+        if not self.active_connections:
+            return
+
         message = {
             "type": "ping",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _utc_timestamp()
         }
 
+        await self._broadcast(self.active_connections, message)
+
+    async def _broadcast(self, connection_ids: Collection[str], message: dict):
+        """
+        Send a message to many connections concurrently
+
+        Sends run together, so a slow client no longer holds up the others.
+        Connections that are gone or whose send fails are disconnected
+        afterwards.
+
+        Args:
+            connection_ids: Connection identifiers
+            message: Message dictionary
+        """
+        # One lookup per connection, and a snapshot: the subscription sets may
+        # change while sends are awaited
+        active = self.active_connections
+        targets = [
+            (connection_id, websocket)
+            for connection_id in connection_ids
+            if (websocket := active.get(connection_id)) is not None
+        ]
+
         disconnected = []
-        for connection_id, websocket in self.active_connections.items():
-            try:
-                await self._send_message(websocket, message)
-            except Exception:
-                disconnected.append(connection_id)
+        if len(targets) != len(connection_ids):
+            disconnected = [connection_id for connection_id in connection_ids if connection_id not in active]
+
+        # Encoded once for all recipients rather than once per send
+        payload = orjson.dumps(message).decode()
+        results = await asyncio.gather(
+            *(websocket.send_text(payload) for _, websocket in targets),
+            return_exceptions=True
+        )
+        disconnected.extend(
+            connection_id
+            for (connection_id, _), result in zip(targets, results)
+            if isinstance(result, BaseException)
+        )
 
         # Clean up disconnected clients
         for connection_id in disconnected:
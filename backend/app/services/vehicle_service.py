@@ -8,13 +8,13 @@ from sqlalchemy.orm import Session
 
 from app.repositories.vehicle_repository import VehicleRepository
 from app.schemas.vehicle import VehicleCreate, VehicleUpdate, VehicleStatus
-from app.schemas.common import LocationSchema
 from app.models.vehicle import Vehicle
 from app.core.exceptions import NotFoundException, ConflictException, ValidationException
 from app.services.audit_service import AuditService
+from app.services.location_mixin import LocationMixin
 
 
-class VehicleService:
+class VehicleService(LocationMixin):
     """Service for Vehicle business logic"""
 
     def __init__(self, db: Session):
@@ -22,15 +22,6 @@ class VehicleService:
         self.vehicle_repo = VehicleRepository(db)
         self.audit_service = AuditService(db)
 
-    def _location_to_wkt(self, location: LocationSchema) -> str:
-        """Convert LocationSchema to WKT Point"""
-        return f"POINT({location.longitude} {location.latitude})"
-
-    def _wkt_to_location(self, wkt: str) -> LocationSchema:
-        """Convert WKT Point to LocationSchema"""
-        coords = wkt.replace("POINT(", "").replace(")", "").split()
-        return LocationSchema(longitude=float(coords[0]), latitude=float(coords[1]))
-
     def create_vehicle(
         self,
         vehicle_in: VehicleCreate,
@@ -55,7 +46,7 @@ class VehicleService:
             raise ConflictException(f"Vehicle with identifier '{vehicle_in.identifier}' already exists")
 
         # Convert location to WKT
-        location_wkt = self._location_to_wkt(vehicle_in.base_location)
+        location_wkt = self._location_to_point(vehicle_in.base_location)
 
         # Create vehicle
         vehicle_dict = vehicle_in.model_dump(exclude={"base_location"})
@@ -164,7 +155,7 @@ class VehicleService:
 
         # Convert location if provided
         if vehicle_in.base_location:
-            update_dict["base_location"] = self._location_to_wkt(vehicle_in.base_location)
+            update_dict["base_location"] = self._location_to_point(vehicle_in.base_location)
 
         # Map field names from schema to model
         if "capacity" in update_dict:
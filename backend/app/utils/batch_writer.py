@@ -0,0 +1,99 @@
+"""
+Background writer that batches row inserts off the request path.
+"""
+import logging
+import queue
+import threading
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+logger = logging.getLogger(__name__)
+
+
+class BatchInsertWriter:
+    """
+    Daemon thread that inserts queued rows into one table in batches.
+
+    Rows are written with their own session, up to BATCH_SIZE rows per
+    INSERT, flushing at least every FLUSH_INTERVAL_SECONDS. Subclasses set
+    model to the mapped class or Table to insert into.
+    """
+
+    BATCH_SIZE = 100
+    FLUSH_INTERVAL_SECONDS = 0.05
+
+    model: Any = None
+    thread_name = "batch-insert-writer"
+
+    def __init__(self, session_factory=None):
+        """
+        Initialize batch writer
+
+        Args:
+            session_factory: Callable returning a new Session (defaults to SessionLocal)
+        """
+        self._session_factory = session_factory
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background thread is accepting rows"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the background thread (no-op if already running)"""
+        if self.is_running:
+            return
+        if self._session_factory is None:
+            from app.core.database import SessionLocal
+            self._session_factory = SessionLocal
+        self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Flush queued rows and stop the background thread"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def enqueue(self, row: Dict[str, Any]) -> None:
+        """Queue one row (column name -> value) for insertion"""
+        self._queue.put(row)
+
+    def _run(self) -> None:
+        """Drain the queue in batches until a stop sentinel is received"""
+        stopping = False
+        while not stopping:
+            row = self._queue.get()
+            if row is None:
+                break
+
+            batch = [row]
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    row = self._queue.get(timeout=self.FLUSH_INTERVAL_SECONDS)
+                except queue.Empty:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+
+            self._write_batch(batch)
+
+    def _write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert a batch of rows; failures are logged, never raised"""
+        stmt = insert(self.model)
+        db = self._session_factory()
+        try:
+            db.execute(stmt, rows)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to write {len(rows)} {stmt.table.name} rows: {e}")
+        finally:
+            db.close()
@@ -57,6 +57,25 @@ def create_point(latitude: float, longitude: float, srid: int = 4326) -> WKTElem
     return WKTElement(point_wkt, srid=srid)
 
 
+def point_ewkt(latitude: float, longitude: float, srid: int = 4326) -> str:
+    """
+    Format a point as an EWKT string for a Geography/Geometry column.
+
+    GeoAlchemy2 binds plain strings unchanged, so this skips building a
+    WKTElement and having it re-formatted at bind time. Coordinates are not
+    validated; use create_point for unvalidated input.
+
+    Args:
+        latitude: Latitude value
+        longitude: Longitude value
+        srid: Spatial Reference System Identifier (default: 4326 for WGS 84)
+
+    Returns:
+        EWKT string, e.g. 'SRID=4326;POINT(-70.65 -33.45)'
+    """
+    return f'SRID={srid};POINT({longitude} {latitude})'
+
+
 def extract_coordinates(geom) -> Tuple[float, float]:
     """
     Extract latitude and longitude from a PostGIS geometry.
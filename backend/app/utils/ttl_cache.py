@@ -0,0 +1,85 @@
+"""
+Bounded in-process cache with per-entry expiry.
+"""
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Hashable, Iterator, Tuple
+
+
+class TTLCache(MutableMapping):
+    """
+    Thread-safe mapping whose entries expire after ttl seconds.
+
+    At most maxsize entries are kept; inserting past that evicts the least
+    recently used one. Expired entries behave as missing and are dropped
+    when touched.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries
+            ttl: Time-to-live of each entry in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expires_at, value), expires_at on the time.monotonic clock
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self._lock:
+            expires_at, value = self._data[key]
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                raise KeyError(key)
+            self._data.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            del self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False
+            if entry[0] <= time.monotonic():
+                del self._data[key]
+                return False
+            return True
+
+    def __iter__(self) -> Iterator[Hashable]:
+        self.expire()
+        with self._lock:
+            return iter(list(self._data))
+
+    def __len__(self) -> int:
+        self.expire()
+        with self._lock:
+            return len(self._data)
+
+    def expire(self) -> None:
+        """Drop every expired entry."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (expires_at, _) in self._data.items() if expires_at <= now]
+            for key in expired:
+                del self._data[key]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
@@ -154,3 +154,26 @@ class TestDistanceService:
 
         stats = await service.get_cache_statistics()
         assert stats == {"cache_enabled": False}
+
+    def test_get_travel_times_matches_matrix(self, service_with_haversine_only):
+        """Test batched travel times agree with the Haversine matrix row."""
+        origin = Location(latitude=-33.45, longitude=-70.66)
+        destinations = [
+            Location(latitude=-33.40, longitude=-70.60),
+            Location(latitude=-33.50, longitude=-70.70),
+            Location(latitude=-33.45, longitude=-70.66)
+        ]
+        provider = service_with_haversine_only.providers[-1]
+
+        travel_times = service_with_haversine_only.get_travel_times(origin, destinations)
+
+        assert [t.destination for t in travel_times] == destinations
+        for travel_time, destination in zip(travel_times, destinations):
+            expected = provider._haversine_distance(origin, destination)
+            assert travel_time.distance_meters == pytest.approx(expected)
+            assert travel_time.duration_seconds == pytest.approx(expected / provider.average_speed_ms)
+        assert travel_times[2].distance_meters == pytest.approx(0.0)
+
+        single = service_with_haversine_only.get_travel_time(origin, destinations[0])
+        assert single.distance_meters == pytest.approx(travel_times[0].distance_meters)
+        assert service_with_haversine_only.get_travel_times(origin, []) == []
@@ -0,0 +1,106 @@
+"""
+Unit tests for Google Maps distance provider.
+"""
+import pytest
+from unittest.mock import patch
+from app.services.distance import Location
+from app.services.distance.providers import GoogleMapsProvider
+
+
+class FakeResponse:
+    """Fake aiohttp response that returns a Distance Matrix payload."""
+
+    def __init__(self, payload):
+        self.status = 200
+        self.payload = payload
+
+    async def json(self):
+        return self.payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class FakeSession:
+    """
+    Fake aiohttp session.
+
+    Encodes each location index in its latitude, and answers every request with
+    distance = 1000 * origin + destination so blocks can be checked by position.
+    """
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, params=None):
+        origins = [int(round(float(c.split(",")[0]) * 100)) for c in params["origins"].split("|")]
+        destinations = [int(round(float(c.split(",")[0]) * 100)) for c in params["destinations"].split("|")]
+        self.requests.append((origins, destinations))
+
+        rows = [
+            {
+                "elements": [
+                    {
+                        "status": "OK",
+                        "distance": {"value": 1000 * o + d},
+                        "duration": {"value": o + d},
+                        "duration_in_traffic": {"value": 2 * (o + d)},
+                    }
+                    for d in destinations
+                ]
+            }
+            for o in origins
+        ]
+        return FakeResponse({"status": "OK", "rows": rows})
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class TestGoogleMapsProvider:
+    """Tests for GoogleMapsProvider with a mocked HTTP session."""
+
+    @pytest.fixture
+    def provider(self):
+        """Create a Google Maps provider with a dummy API key."""
+        return GoogleMapsProvider(api_key="test-key")
+
+    @pytest.fixture
+    def locations(self):
+        """Locations whose index is encoded in the latitude."""
+        return [Location(latitude=i / 100, longitude=0.0) for i in range(23)]
+
+    @pytest.mark.asyncio
+    async def test_large_matrix_is_requested_in_blocks(self, provider, locations):
+        """Test that matrices above the element limit are split and reassembled."""
+        session = FakeSession()
+
+        with patch("aiohttp.ClientSession", return_value=session):
+            matrix = await provider.calculate_with_traffic(locations, departure_time=1)
+
+        n = len(locations)
+        # 23 locations -> 3 x 3 blocks of at most 10 x 10 elements
+        assert len(session.requests) == 9
+        for origins, destinations in session.requests:
+            assert len(origins) * len(destinations) <= 100
+
+        for i in range(n):
+            for j in range(n):
+                assert matrix.distances_meters[i][j] == 1000 * i + j
+                assert matrix.durations_seconds[i][j] == 2 * (i + j)
+        assert matrix.provider == "google_maps_traffic"
+
+    @pytest.mark.asyncio
+    async def test_calculate_matrix_ignores_traffic_duration(self, provider, locations):
+        """Test that the plain matrix uses duration, not duration_in_traffic."""
+        with patch("aiohttp.ClientSession", return_value=FakeSession()):
+            matrix = await provider.calculate_matrix(locations[:4])
+
+        assert matrix.durations_seconds[1][3] == 4
+        assert matrix.distances_meters[3][1] == 3001
@@ -115,6 +115,26 @@ class TestHaversineProvider:
         expected_distance = 111_195  # meters
         assert abs(distance - expected_distance) < 100
 
+    @pytest.mark.asyncio
+    async def test_matrix_matches_pairwise_formula(self, provider):
+        """Test that the vectorized matrix matches the per-pair Haversine formula."""
+        locations = [
+            Location(latitude=-33.4489, longitude=-70.6693, label="Santiago"),
+            Location(latitude=-33.0472, longitude=-71.6127, label="Valparaiso"),
+            Location(latitude=-36.8201, longitude=-73.0444, label="Concepcion"),
+            Location(latitude=40.7128, longitude=-74.0060, label="NYC"),
+        ]
+
+        matrix = await provider.calculate_matrix(locations)
+
+        for i, origin in enumerate(locations):
+            for j, destination in enumerate(locations):
+                expected = 0.0 if i == j else provider._haversine_distance(origin, destination)
+                assert matrix.distances_meters[i][j] == pytest.approx(expected, abs=1e-3)
+                assert matrix.durations_seconds[i][j] == pytest.approx(
+                    expected / provider.average_speed_ms, abs=1e-3
+                )
+
     def test_speed_configuration(self):
         """Test average speed configuration."""
         provider = HaversineProvider(average_speed_kmh=60.0)
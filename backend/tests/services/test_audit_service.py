@@ -0,0 +1,99 @@
+"""
+Unit tests for audit logging and the background audit writer.
+"""
+import pytest
+from unittest.mock import MagicMock
+
+from app.models.audit import AuditLog
+from app.services.audit_service import AuditLogWriter, AuditService, audit_log_writer
+
+
+class TestAuditLogWriter:
+    """Tests for AuditLogWriter with a mocked session factory."""
+
+    @pytest.fixture
+    def session(self):
+        """Create a mock database session."""
+        return MagicMock()
+
+    @pytest.fixture
+    def writer(self, session):
+        """Create a writer whose sessions are the mock session."""
+        writer = AuditLogWriter(session_factory=lambda: session)
+        yield writer
+        writer.stop()
+
+    def test_rows_are_batched_and_flushed_on_stop(self, writer, session):
+        """Test that queued rows are written in a single insert."""
+        writer.BATCH_SIZE = 10
+        writer.FLUSH_INTERVAL_SECONDS = 5.0
+        writer.start()
+
+        for entity_id in range(3):
+            writer.enqueue({"entity_type": "patient", "entity_id": entity_id, "action": "create"})
+        writer.stop()
+
+        assert session.execute.call_count == 1
+        rows = session.execute.call_args.args[1]
+        assert [row["entity_id"] for row in rows] == [0, 1, 2]
+        session.commit.assert_called_once()
+        session.close.assert_called_once()
+
+    def test_batch_size_limit(self, writer, session):
+        """Test that batches never exceed BATCH_SIZE rows."""
+        writer.BATCH_SIZE = 2
+        for entity_id in range(5):
+            writer.enqueue({"entity_type": "patient", "entity_id": entity_id, "action": "create"})
+        writer.start()
+        writer.stop()
+
+        batch_sizes = [len(call.args[1]) for call in session.execute.call_args_list]
+        assert batch_sizes == [2, 2, 1]
+
+    def test_write_failure_is_swallowed(self, writer, session):
+        """Test that a failed insert rolls back without killing the thread."""
+        session.execute.side_effect = [Exception("db down"), None]
+        writer.BATCH_SIZE = 1
+        writer.start()
+
+        writer.enqueue({"entity_type": "patient", "entity_id": 1, "action": "create"})
+        writer.enqueue({"entity_type": "patient", "entity_id": 2, "action": "create"})
+        writer.stop()
+
+        session.rollback.assert_called_once()
+        assert session.execute.call_count == 2
+        session.commit.assert_called_once()
+
+
+class TestAuditService:
+    """Tests for AuditService inline and queued paths."""
+
+    @pytest.fixture
+    def mock_db(self):
+        """Create a mock database session."""
+        return MagicMock()
+
+    def test_logs_inline_when_writer_stopped(self, mock_db):
+        """Test that the caller's session is used when no writer is running."""
+        assert not audit_log_writer.is_running
+
+        audit_log = AuditService(mock_db).log_create("patient", 1, user_id=2)
+
+        assert isinstance(audit_log, AuditLog)
+        assert audit_log.action == "create"
+        mock_db.add.assert_called_once_with(audit_log)
+        mock_db.commit.assert_called_once()
+
+    def test_queues_when_writer_running(self, mock_db, monkeypatch):
+        """Test that entries are queued instead of committed inline."""
+        queued = []
+        monkeypatch.setattr(AuditLogWriter, "is_running", property(lambda self: True))
+        monkeypatch.setattr(audit_log_writer, "enqueue", queued.append)
+
+        result = AuditService(mock_db).log_update("patient", 1, 2, {"name": "Ana"})
+
+        assert result is None
+        assert queued[0]["action"] == "update"
+        assert queued[0]["changes"] == '{"name": "Ana"}'
+        mock_db.add.assert_not_called()
+        mock_db.commit.assert_not_called()
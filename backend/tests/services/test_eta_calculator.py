@@ -0,0 +1,415 @@
+"""
+Unit tests for batched ETA calculation and delay detection.
+"""
+import pytest
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.core.exceptions import NotFoundError
+from app.models.case import Case
+from app.models.route import Visit, VisitStatus
+from app.services.tracking.delay_detector import DelayDetector, DelaySeverity
+from app.services.tracking.eta_calculator import ETACalculator, _bump_route_version
+from app.services.tracking.location_tracker import (
+    LocationLogWriter,
+    LocationTracker,
+    location_log_writer,
+    version_counter
+)
+
+
+LOCATION_TIME = datetime(2025, 1, 6, 10, 0)
+
+
+def make_visit(visit_id, estimated_offset_minutes, lat, lng, status=VisitStatus.PENDING):
+    """Create a visit-like object whose case carries its coordinates."""
+    return SimpleNamespace(
+        id=visit_id,
+        route_id=1,
+        case_id=100 + visit_id,
+        status=status,
+        estimated_arrival_time=LOCATION_TIME + timedelta(minutes=estimated_offset_minutes),
+        actual_arrival_time=None,
+        case=SimpleNamespace(latitude=lat, longitude=lng, time_window_end=None)
+    )
+
+
+@pytest.fixture
+def calculator():
+    """Create an ETA calculator with a mocked location tracker."""
+    calculator = ETACalculator(MagicMock())
+    calculator.location_tracker = MagicMock()
+    calculator.location_tracker.get_current_location.return_value = SimpleNamespace(timestamp=LOCATION_TIME)
+    calculator.location_tracker.get_location_as_dict.return_value = {"latitude": -33.45, "longitude": -70.66}
+    calculator._get_traffic_buffer = lambda current_time=None: (1.0, "normal")
+    return calculator
+
+
+class TestCalculateEtasForRoute:
+    """Tests for ETACalculator.calculate_etas_for_route."""
+
+    def test_single_location_lookup_and_distance_call(self, calculator):
+        """Test that a route needs one location read and one distance call."""
+        visits = [make_visit(1, 5, -33.40, -70.60), make_visit(2, 30, -33.50, -70.70)]
+        route = SimpleNamespace(vehicle_id=7, visits=visits)
+        get_travel_times = MagicMock(wraps=calculator.distance_service.get_travel_times)
+        calculator.distance_service.get_travel_times = get_travel_times
+
+        etas = calculator.calculate_etas_for_route(route)
+
+        assert set(etas) == {1, 2}
+        calculator.location_tracker.get_current_location.assert_called_once_with(7)
+        get_travel_times.assert_called_once()
+        assert len(get_travel_times.call_args.args[1]) == 2
+        assert etas[1]["vehicle_id"] == 7
+        assert etas[1]["destination"] == {"latitude": -33.40, "longitude": -70.60}
+
+    def test_matches_single_visit_details(self, calculator):
+        """Test that batched details equal the per-visit calculation."""
+        visit = make_visit(1, 5, -33.40, -70.60)
+        calculator.db.query.return_value.options.return_value.filter.return_value.first.return_value = visit
+        route = SimpleNamespace(vehicle_id=7, visits=[visit])
+
+        assert calculator.calculate_etas_for_route(route)[1] == calculator.calculate_eta_with_details(1, 7)
+
+    def test_skips_visits_without_coordinates(self, calculator):
+        """Test that visits without a destination are omitted."""
+        visits = [make_visit(1, 5, -33.40, -70.60), make_visit(2, 5, -33.50, -70.70)]
+        visits[1].case.latitude = None
+
+        etas = calculator.calculate_etas_for_route(SimpleNamespace(vehicle_id=7, visits=visits))
+
+        assert set(etas) == {1}
+
+    def test_no_vehicle_location(self, calculator):
+        """Test that no ETAs are returned without a vehicle location."""
+        calculator.location_tracker.get_current_location.return_value = None
+        route = SimpleNamespace(vehicle_id=7, visits=[make_visit(1, 5, -33.40, -70.60)])
+
+        assert calculator.calculate_etas_for_route(route) == {}
+
+    def test_coordinates_do_not_query(self, calculator):
+        """Test that case coordinates come from the loaded row."""
+        visit = make_visit(1, 5, -33.40, -70.60)
+
+        assert calculator._extract_coordinates_from_case(visit.case) == (-33.40, -70.60)
+        calculator.db.scalar.assert_not_called()
+
+
+class TestSingleVisitEta:
+    """Tests for the single-visit ETA entry points."""
+
+    @pytest.fixture
+    def visit(self, calculator):
+        """Make the mocked session return one visit."""
+        visit = make_visit(1, 5, -33.40, -70.60)
+        calculator.db.query.return_value.options.return_value.filter.return_value.first.return_value = visit
+        yield visit
+        ETACalculator._eta_cache.clear()
+
+    def test_calculate_eta_matches_details(self, calculator, visit):
+        """Test that calculate_eta returns the same ETA as the details."""
+        eta = calculator.calculate_eta(1, 7, use_cache=False)
+
+        assert eta.isoformat() == calculator.calculate_eta_with_details(1, 7)["eta"]
+        assert ETACalculator._eta_cache[1][0] == eta
+
+    def test_details_reuse_cached_eta(self, calculator, visit):
+        """Test that calculate_eta and calculate_eta_with_details share a cache entry."""
+        eta = calculator.calculate_eta(1, 7)
+        calculator.db.query.reset_mock()
+
+        details = calculator.calculate_eta_with_details(1, 7)
+
+        assert details["eta"] == eta.isoformat()
+        calculator.db.query.assert_not_called()
+        calculator.location_tracker.get_current_location.assert_called_once_with(7)
+
+    def test_case_coordinates_are_loaded_with_the_visit(self, calculator, visit):
+        """Test that the deferred case coordinates are only selected by the ETA query."""
+        calculator.calculate_eta(1, 7, use_cache=False)
+        options = calculator.db.query.return_value.options.call_args.args
+        dialect = postgresql.dialect()
+
+        assert "ST_Y" not in str(select(Case).compile(dialect=dialect))
+        assert "ST_Y" in str(select(Visit).options(*options).compile(dialect=dialect))
+
+    def test_significant_change_computes_once(self, calculator, visit):
+        """Test that change detection loads the visit and location once."""
+        ETACalculator._eta_cache[1] = (LOCATION_TIME, LOCATION_TIME, calculator._cache_stamp(7, 1), {})
+
+        is_significant, change_minutes = calculator.check_significant_eta_change(1, 7)
+
+        assert is_significant
+        assert change_minutes > calculator.SIGNIFICANT_CHANGE_MINUTES
+        assert calculator.db.query.call_count == 1
+        calculator.location_tracker.get_current_location.assert_called_once_with(7)
+
+
+class TestDelayStatistics:
+    """Tests for DelayDetector.get_delay_statistics using batched ETAs."""
+
+    def test_statistics_combine_history_and_batch(self, calculator):
+        """Test that SQL history and one batched ETA call feed the statistics."""
+        active_visits = [
+            # ~6 km away at 40 km/h: about 9 minutes, so 9 minutes late
+            make_visit(1, 0, -33.40, -70.62),
+            # Plenty of slack
+            make_visit(2, 60, -33.40, -70.62),
+        ]
+        route = SimpleNamespace(id=1, vehicle_id=7)
+        # One completed visit 40 minutes late
+        historical = SimpleNamespace(
+            total_visits=3, on_time=0, minor_delays=0, moderate_delays=0, severe_delays=1,
+            delay_count=1, delay_total=40.0, max_delay=40.0
+        )
+
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = route
+        db.query.return_value.options.return_value.filter.return_value.all.return_value = active_visits
+        detector = DelayDetector(db)
+        detector.eta_calculator = calculator
+        detector._historical_delay_stats = MagicMock(return_value=historical)
+        calculator.calculate_eta_with_details = MagicMock()
+
+        stats = detector.get_delay_statistics(1)
+
+        calculator.calculate_eta_with_details.assert_not_called()
+        calculator.location_tracker.get_current_location.assert_called_once_with(7)
+        assert stats["total_visits"] == 3
+        assert stats["on_time"] == 1
+        assert stats["minor_delays"] == 1
+        assert stats["severe_delays"] == 1
+        assert stats["max_delay_minutes"] == 40
+        assert 20 < stats["average_delay_minutes"] < 30
+
+
+class TestTrafficBuffer:
+    """Tests for the precomputed traffic buffer table."""
+
+    @pytest.mark.parametrize("hour,minute,period", [
+        (5, 59, "late_night"),
+        (6, 0, "normal"),
+        (7, 0, "rush_hour_morning"),
+        (8, 59, "rush_hour_morning"),
+        (9, 0, "normal"),
+        (12, 0, "peak_hours"),
+        (14, 0, "normal"),
+        (17, 30, "rush_hour_evening"),
+        (19, 0, "normal"),
+        (22, 0, "late_night"),
+    ])
+    def test_period_boundaries(self, hour, minute, period):
+        """Test that table lookups match the traffic period windows."""
+        calculator = ETACalculator(MagicMock())
+
+        multiplier, result = calculator._get_traffic_buffer(LOCATION_TIME.replace(hour=hour, minute=minute))
+
+        assert result == period
+        assert multiplier == ETACalculator.TRAFFIC_BUFFERS[period]
+
+    def test_table_covers_every_minute(self):
+        """Test that the table has one entry per minute of the day."""
+        assert len(ETACalculator._BUFFER_TABLE) == 24 * 60
+
+
+class TestSharedCaches:
+    """Tests for caches shared across service instances."""
+
+    @pytest.fixture
+    def cached_eta(self):
+        """Cache an ETA for visit 42 of route 3 served by vehicle 7."""
+        calculator = ETACalculator(MagicMock())
+        eta = LOCATION_TIME + timedelta(minutes=20)
+        calculator._eta_cache[42] = (eta, LOCATION_TIME, calculator._cache_stamp(7, 3), {"eta": eta.isoformat()})
+        yield eta
+        ETACalculator._eta_cache.clear()
+
+    def test_eta_cache_survives_new_instance(self, cached_eta):
+        """Test that a cached ETA is reused by a later calculator."""
+        db = MagicMock()
+
+        assert ETACalculator(db).calculate_eta(42, 7) == cached_eta
+        db.query.assert_not_called()
+
+    def test_stale_eta_is_served_while_refreshing(self, cached_eta, monkeypatch):
+        """Test that an entry past the TTL is returned and refreshed in the background."""
+        submitted = []
+        monkeypatch.setattr(ETACalculator, "_refresh_executor", SimpleNamespace(
+            submit=lambda fn, *args: submitted.append((fn, args))
+        ))
+        entry = ETACalculator._eta_cache[42]
+        stale_at = datetime.utcnow() - timedelta(seconds=ETACalculator.CACHE_TTL_SECONDS + 1)
+        ETACalculator._eta_cache[42] = (entry[0], stale_at) + entry[2:]
+        db = MagicMock()
+        calculator = ETACalculator(db, session_factory=MagicMock())
+
+        assert calculator.calculate_eta(42, 7) == cached_eta
+        # A second read does not schedule another refresh
+        assert calculator.calculate_eta(42, 7) == cached_eta
+        db.query.assert_not_called()
+        assert len(submitted) == 1
+
+        refresh, args = submitted[0]
+        refresh(*args)
+        assert 42 not in ETACalculator._refreshing
+        calculator._session_factory.return_value.close.assert_called_once()
+
+    def test_new_ping_invalidates_cached_eta(self, cached_eta):
+        """Test that a recorded location makes the cached ETA stale."""
+        LocationTracker._location_versions[7] = next(version_counter)
+        db = MagicMock()
+        db.query.return_value.options.return_value.filter.return_value.first.return_value = None
+
+        with pytest.raises(NotFoundError):
+            ETACalculator(db).calculate_eta(42, 7)
+
+    def test_eta_cached_before_merge_is_not_reused_after(self, monkeypatch):
+        """Test that an ETA computed while a ping is still queued goes stale once it is merged."""
+        monkeypatch.setattr(LocationLogWriter, "is_running", property(lambda self: True))
+        monkeypatch.setattr(location_log_writer, "enqueue", lambda row: None)
+        monkeypatch.setattr(LocationTracker, "_vehicle_ids", {7})
+        monkeypatch.setattr(LocationTracker, "_vehicle_ids_loaded_at", time.monotonic())
+        LocationTracker(MagicMock()).enqueue_location(vehicle_id=7, latitude=-33.45, longitude=-70.66)
+
+        # Computed from the previous location while the ping waits in the writer
+        calculator = ETACalculator(MagicMock())
+        eta = LOCATION_TIME + timedelta(minutes=20)
+        calculator._eta_cache[42] = (eta, datetime.utcnow(), calculator._cache_stamp(7, 3), {})
+        try:
+            assert calculator.calculate_eta(42, 7) == eta
+
+            session = MagicMock()
+            session.execute.return_value.scalars.return_value.all.return_value = [7]
+            LocationLogWriter(session_factory=lambda: session)._merge_staged()
+
+            db = MagicMock()
+            db.query.return_value.options.return_value.filter.return_value.first.return_value = None
+            with pytest.raises(NotFoundError):
+                ETACalculator(db).calculate_eta(42, 7)
+        finally:
+            ETACalculator._eta_cache.clear()
+
+    def test_route_write_invalidates_cached_eta(self, cached_eta):
+        """Test that writing a visit of the route makes the cached ETA stale."""
+        _bump_route_version(None, None, SimpleNamespace(id=3))
+        db = MagicMock()
+        db.query.return_value.options.return_value.filter.return_value.first.return_value = None
+
+        with pytest.raises(NotFoundError):
+            ETACalculator(db).calculate_eta(42, 7)
+
+    def test_last_check_is_not_shared_across_instances(self):
+        """Test that a recent check on one detector does not hide the visit from another."""
+        DelayDetector(MagicMock())._last_check[42] = datetime.utcnow()
+        db = MagicMock()
+        db.query.return_value.options.return_value.filter.return_value.first.return_value = None
+
+        with pytest.raises(NotFoundError):
+            DelayDetector(db).check_visit_delay(42, 7)
+
+
+class TestCheckVisitDelay:
+    """Tests for DelayDetector.check_visit_delay."""
+
+    def test_alert_uses_eta_datetime(self, calculator):
+        """Test that the alert carries the calculated ETA datetime."""
+        visit = make_visit(1, 0, -33.40, -70.62)
+        db = MagicMock()
+        db.query.return_value.options.return_value.filter.return_value.first.return_value = visit
+        calculator.db = db
+        detector = DelayDetector(db)
+        detector.eta_calculator = calculator
+
+        try:
+            alert = detector.check_visit_delay(1, 7, force=True)
+            eta = calculator.calculate_eta(1, 7)
+        finally:
+            ETACalculator._eta_cache.clear()
+
+        assert alert.current_eta == eta
+        assert alert.message.startswith("Retraso leve")
+
+    def test_route_loop_reuses_loaded_visits(self, calculator):
+        """Test that detecting route delays does not query visits one by one."""
+        visits = [make_visit(1, 0, -33.40, -70.62), make_visit(2, 60, -33.40, -70.62)]
+        route = SimpleNamespace(id=1, vehicle_id=7, visits=visits)
+        db = MagicMock()
+        calculator.db = db
+        detector = DelayDetector(db)
+        detector.eta_calculator = calculator
+        detector._get_route_with_visits = MagicMock(return_value=route)
+
+        try:
+            alerts = detector.detect_delays_for_route(1)
+            assert set(detector._last_check) == {1, 2}
+            # Throttled on the next pass
+            assert detector.detect_delays_for_route(1) == []
+        finally:
+            ETACalculator._eta_cache.clear()
+
+        assert [alert.visit_id for alert in alerts] == [1]
+        db.query.assert_not_called()
+
+    def test_route_severities_from_one_distance_call(self, calculator):
+        """Test that route detection classifies every visit from one batch."""
+        visits = [make_visit(visit_id, offset, -33.40, -70.62)
+                  for visit_id, offset in [(1, 0), (2, -10), (3, -25), (4, 60)]]
+        route = SimpleNamespace(id=1, vehicle_id=7, visits=visits)
+        get_travel_times = MagicMock(wraps=calculator.distance_service.get_travel_times)
+        calculator.distance_service.get_travel_times = get_travel_times
+        detector = DelayDetector(MagicMock())
+        detector.eta_calculator = calculator
+        detector._get_route_with_visits = MagicMock(return_value=route)
+
+        alerts = detector.detect_delays_for_route(1)
+
+        get_travel_times.assert_called_once()
+        assert [(alert.visit_id, alert.severity) for alert in alerts] == [
+            (1, DelaySeverity.MINOR), (2, DelaySeverity.MODERATE), (3, DelaySeverity.SEVERE)
+        ]
+        for alert in alerts:
+            assert alert.severity == detector._calculate_severity(alert.delay_minutes)
+            assert alert.message == detector._generate_delay_message(alert.delay_minutes, alert.severity)
+
+    def test_far_future_visit_skips_eta(self, calculator):
+        """Test that a visit due far in the future is not estimated."""
+        visit = make_visit(1, 0, -33.40, -70.62)
+        visit.estimated_arrival_time = datetime.utcnow() + timedelta(hours=3)
+        detector = DelayDetector(MagicMock())
+        detector.eta_calculator = MagicMock()
+
+        assert detector._check_visit_delay_for(visit, 7, datetime.utcnow()) is None
+        detector.eta_calculator.calculate_eta_details_for_visit.assert_not_called()
+
+
+class TestTimeWindowViolations:
+    """Tests for DelayDetector.check_time_window_violations."""
+
+    def test_only_late_visits_are_reported(self, calculator):
+        """Test that ETAs past the window end are reported with their overrun."""
+        late = make_visit(1, 0, -33.40, -70.62)
+        late.case.time_window_end = datetime(2025, 1, 1, 10, 5)
+        on_time = make_visit(2, 0, -33.40, -70.62)
+        on_time.case.time_window_end = datetime(2025, 1, 1, 11, 0)
+        for visit in (late, on_time):
+            visit.case.id = visit.case_id
+            visit.case.patient = SimpleNamespace(name=f"Paciente {visit.id}")
+        route = SimpleNamespace(id=1, vehicle_id=7, route_date=LOCATION_TIME.date(), visits=[late, on_time])
+
+        detector = DelayDetector(MagicMock())
+        detector.eta_calculator = calculator
+        detector._get_route_with_visits = MagicMock(return_value=route)
+
+        violations = detector.check_time_window_violations(1)
+
+        eta = calculator.calculate_etas_for_route(route, [late])[1]["eta_dt"]
+        assert [v["visit_id"] for v in violations] == [1]
+        assert violations[0]["patient_name"] == "Paciente 1"
+        assert violations[0]["time_window_end"] == "2025-01-06T10:05:00"
+        assert violations[0]["minutes_over_window"] == round((eta - datetime(2025, 1, 6, 10, 5)).total_seconds() / 60, 1)
+        assert violations[0]["severity"] == "warning"
@@ -0,0 +1,79 @@
+"""
+Unit tests for the geocoding cache.
+"""
+import pytest
+from unittest.mock import MagicMock
+
+from app.services.geocoding.geocoding_cache import GeocodingCache
+from app.services.geocoding.base_geocoder import GeocodingResult
+
+
+class TestGeocodingCache:
+    """Tests for GeocodingCache with a mocked database session."""
+
+    @pytest.fixture(autouse=True)
+    def clear_memory(self):
+        """Isolate the process-wide in-memory tier between tests."""
+        GeocodingCache.clear_memory()
+        yield
+        GeocodingCache.clear_memory()
+
+    @pytest.fixture
+    def mock_db(self):
+        """Create a mock database session with an empty cache table."""
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = None
+        return db
+
+    @pytest.fixture
+    def result(self):
+        """Sample geocoding result."""
+        return GeocodingResult(
+            latitude=-33.4372,
+            longitude=-70.6506,
+            formatted_address="Av. Providencia 1234, Providencia, Chile",
+            place_id="abc123"
+        )
+
+    def test_normalize_address(self):
+        """Test that case, accents and whitespace do not change the key."""
+        a = GeocodingCache.normalize_address("  Avenida  Libertador Bernardo O'Higgins 1234, Santiago ")
+        b = GeocodingCache.normalize_address("avenida libertador bernardo o'higgins 1234, santiago")
+        c = GeocodingCache.normalize_address("Avenida Libertador Bernardo O'Higgins 1234, Santiago", country="ar")
+
+        assert a == b
+        assert a.endswith("|CL")
+        assert c != a
+        assert GeocodingCache.normalize_address("Ñuñoa, Peñalolén") == "nunoa, penalolen|CL"
+
+    def test_cache_key_length(self):
+        """Test that cache keys fit the 64-character column."""
+        key = GeocodingCache.generate_cache_key(GeocodingCache.normalize_address("Santiago"))
+        assert len(key) == 64
+
+    def test_miss_returns_none(self, mock_db):
+        """Test lookup of an unknown address."""
+        cache = GeocodingCache(mock_db)
+        assert cache.get("Calle Falsa 123") is None
+
+    def test_set_then_get_from_memory(self, mock_db, result):
+        """Test that a stored result is served without querying the database."""
+        cache = GeocodingCache(mock_db)
+        cache.set("Av. Providencia 1234", result)
+        mock_db.add.assert_called_once()
+        mock_db.commit.assert_called_once()
+
+        mock_db.query.reset_mock()
+        cached = GeocodingCache(mock_db).get("av.  providencia 1234")
+
+        assert cached is result
+        mock_db.query.assert_not_called()
+
+    def test_database_error_does_not_raise(self, mock_db, result):
+        """Test that a failing cache write is rolled back and swallowed."""
+        mock_db.commit.side_effect = Exception("db down")
+        cache = GeocodingCache(mock_db)
+
+        cache.set("Av. Providencia 1234", result)
+
+        mock_db.rollback.assert_called_once()
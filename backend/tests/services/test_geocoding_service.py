@@ -0,0 +1,141 @@
+"""
+Unit tests for batch geocoding and provider rate limiting in GeocodingService.
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from app.services.geocoding.geocoding_service import (
+    GeocodingService,
+    ProviderRequestLimiter,
+    get_geocoding_service,
+)
+from app.services.geocoding.base_geocoder import GeocodingResult, GeocodingRateLimitError
+
+
+class TestGeocodeAddresses:
+    """Tests for GeocodingService.geocode_addresses with a mocked provider."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a geocoding service with a dummy API key."""
+        return GeocodingService(api_key="test-key")
+
+    @pytest.mark.asyncio
+    async def test_results_keep_input_order(self, service):
+        """Test that results are aligned with the input addresses."""
+        async def geocode(address, country):
+            return GeocodingResult(latitude=len(address), longitude=0.0, formatted_address=address)
+
+        service.geocode_address = AsyncMock(side_effect=geocode)
+
+        results = await service.geocode_addresses(["a", "bbb", "cc"])
+
+        assert [r.formatted_address for r in results] == ["a", "bbb", "cc"]
+
+    @pytest.mark.asyncio
+    async def test_errors_map_to_none_without_retry(self, service):
+        """Test that failed addresses become None and are not retried here."""
+        ok = GeocodingResult(latitude=-33.4, longitude=-70.6, formatted_address="ok")
+
+        async def geocode(address, country):
+            if address == "broken":
+                raise Exception("API request denied")
+            return ok
+
+        service.geocode_address = AsyncMock(side_effect=geocode)
+
+        results = await service.geocode_addresses(["ok", "broken"])
+
+        assert results == [ok, None]
+        assert service.geocode_address.await_count == 2
+
+
+class TestProviderRateLimiting:
+    """Tests for the shared provider limiter and rate-limit retries."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a geocoding service with a dummy API key and no backoff."""
+        service = GeocodingService(api_key="test-key")
+        service.RATE_LIMIT_INITIAL_BACKOFF_SECONDS = 0
+        return service
+
+    @pytest.mark.asyncio
+    async def test_limiter_caps_inflight_requests(self):
+        """Test that no more than max_inflight requests run at once."""
+        limiter = ProviderRequestLimiter(max_inflight=2, requests_per_second=1000)
+        state = {"inflight": 0, "peak": 0}
+
+        async def request():
+            async with limiter:
+                state["inflight"] += 1
+                state["peak"] = max(state["peak"], state["inflight"])
+                await asyncio.sleep(0.01)
+                state["inflight"] -= 1
+
+        await asyncio.gather(*[request() for _ in range(6)])
+
+        assert state["peak"] == 2
+
+    @pytest.mark.asyncio
+    async def test_limiter_is_shared_between_instances(self, service):
+        """Test that all service instances on a loop share one limiter."""
+        assert GeocodingService(api_key="other-key").limiter is service.limiter
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_request_is_retried(self, service):
+        """Test that a rate-limit rejection is retried and then succeeds."""
+        ok = GeocodingResult(latitude=-33.4, longitude=-70.6, formatted_address="ok")
+        service.primary_provider.geocode = AsyncMock(side_effect=[GeocodingRateLimitError("429"), ok])
+
+        assert await service.geocode_address("Santiago") is ok
+        assert service.primary_provider.geocode.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_gives_up_after_max_attempts(self, service):
+        """Test that persistent rate limiting is raised after the last attempt."""
+        service.primary_provider.geocode = AsyncMock(side_effect=GeocodingRateLimitError("429"))
+
+        with pytest.raises(GeocodingRateLimitError):
+            await service.geocode_address("Santiago")
+        assert service.primary_provider.geocode.await_count == service.RATE_LIMIT_MAX_ATTEMPTS
+
+    @pytest.mark.asyncio
+    async def test_batch_rate_limit_is_retried_once_per_layer(self, service):
+        """Test that a persistently rate-limited address in a batch is only retried by the backoff layer."""
+        service.primary_provider.geocode = AsyncMock(side_effect=GeocodingRateLimitError("429"))
+
+        assert await service.geocode_addresses(["Santiago"]) == [None]
+        assert service.primary_provider.geocode.await_count == service.RATE_LIMIT_MAX_ATTEMPTS
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_not_retried(self, service):
+        """Test that non rate-limit provider errors propagate immediately."""
+        service.primary_provider.geocode = AsyncMock(side_effect=Exception("API request denied"))
+
+        with pytest.raises(Exception, match="denied"):
+            await service.geocode_address("Santiago")
+        assert service.primary_provider.geocode.await_count == 1
+
+
+class TestGeocodingServiceSingleton:
+    """Tests for the shared GeocodingService and its pooled HTTP client."""
+
+    def test_singleton(self):
+        """Test that the dependency returns one instance per process."""
+        assert get_geocoding_service() is get_geocoding_service()
+
+    @pytest.mark.asyncio
+    async def test_http_client_is_reused(self):
+        """Test that the provider keeps one HTTP client between requests."""
+        service = GeocodingService(api_key="test-key")
+        provider = service.primary_provider
+
+        client = provider._get_client()
+        assert provider._get_client() is client
+
+        await service.aclose()
+        assert client.is_closed
+        assert provider._get_client() is not client
+        await service.aclose()
@@ -2,12 +2,25 @@
 Tests for Location Tracker Service
 """
 import pytest
-from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-
-from app.services.tracking.location_tracker import LocationTracker
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+from geoalchemy2.elements import WKBElement
+from geoalchemy2.shape import to_shape
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query, Session
+
+from app.services.tracking.location_tracker import (
+    LocationLogWriter,
+    LocationTracker,
+    _forget_vehicle_id,
+    location_log_writer,
+    maintain_location_partitions,
+    point_ewkb
+)
 from app.models.vehicle import Vehicle
 from app.models.tracking import LocationLog
+from app.schemas.tracking import LocationUpload
 from app.core.exceptions import NotFoundError, ValidationError
 
 
@@ -261,3 +274,467 @@ def test_get_nearby_vehicles(db: Session, test_vehicle: Vehicle, db_session: Ses
     assert len(nearby) >= 1
     vehicle_ids = [v["vehicle_id"] for v in nearby]
     assert test_vehicle.id in vehicle_ids
+
+
+class TestLocationLogWriter:
+    """Tests for staging and merging pings with a mocked session factory."""
+
+    @pytest.fixture
+    def session(self):
+        """Create a mock database session."""
+        return MagicMock()
+
+    @pytest.fixture
+    def writer(self, session):
+        """Create a writer whose sessions are the mock session."""
+        writer = LocationLogWriter(session_factory=lambda: session)
+        yield writer
+        writer.stop()
+
+    def test_batch_is_copied_then_merged(self, writer, session):
+        """Test that a drained queue COPYs the batch and moves it into location_logs."""
+        copied = []
+        cursor = session.connection.return_value.connection.cursor.return_value.__enter__.return_value
+        cursor.copy_expert.side_effect = lambda sql, buffer: copied.append(buffer.getvalue())
+        timestamp = datetime(2025, 1, 15, 10, 30)
+
+        writer.FLUSH_INTERVAL_SECONDS = 5.0
+        writer.start()
+        for vehicle_id in range(3):
+            writer.enqueue({
+                "vehicle_id": vehicle_id,
+                "location": "POINT(-70.66 -33.45)",
+                "speed_kmh": None,
+                "timestamp": timestamp
+            })
+        writer.stop()
+
+        lines = copied[0].splitlines()
+        assert len(lines) == 3
+        assert lines[0].split("\t")[:4] == ["0", "POINT(-70.66 -33.45)", "2025-01-15 10:30:00", "\\N"]
+        assert session.execute.call_args_list[0].args[0] is LocationLogWriter.MERGE_SQL
+
+    def test_merge_waits_while_queue_is_busy(self, writer, session):
+        """Test that batches are only merged when the queue is empty or the interval passed."""
+        writer.MERGE_INTERVAL_SECONDS = 3600
+        row = {"vehicle_id": 1, "location": "POINT(-70.66 -33.45)"}
+
+        writer._queue.put(row)
+        writer._write_batch([row])
+        session.execute.assert_not_called()
+
+        writer._queue.get()
+        writer._write_batch([row])
+        session.execute.assert_called_once_with(LocationLogWriter.MERGE_SQL)
+
+    def test_merge_bumps_moved_vehicles(self, writer, session):
+        """Test that location versions change only after the merge commits."""
+        session.execute.return_value.scalars.return_value.all.return_value = [5]
+        before = LocationTracker.location_version(5)
+        untouched = LocationTracker.location_version(6)
+
+        writer._merge_staged()
+
+        assert LocationTracker.location_version(5) > before
+        assert LocationTracker.location_version(6) == untouched
+        session.commit.assert_called_once()
+
+    def test_failed_merge_keeps_versions(self, writer, session):
+        """Test that a rolled back merge does not invalidate anything."""
+        session.execute.side_effect = Exception("db down")
+        before = LocationTracker.location_version(5)
+
+        writer._merge_staged()
+
+        assert LocationTracker.location_version(5) == before
+        session.rollback.assert_called_once()
+
+
+class TestEnqueueLocation:
+    """Unit tests for the queued ingestion path with a mocked session."""
+
+    @pytest.fixture
+    def mock_db(self):
+        """Create a mock session that knows vehicles 1 and 2."""
+        db = MagicMock()
+        db.scalars.return_value = [1, 2]
+        db.scalar.return_value = None
+        return db
+
+    @pytest.fixture
+    def queued(self, monkeypatch):
+        """Pretend the writer is running and capture queued rows."""
+        rows = []
+        monkeypatch.setattr(LocationLogWriter, "is_running", property(lambda self: True))
+        monkeypatch.setattr(location_log_writer, "enqueue", rows.append)
+        monkeypatch.setattr(LocationTracker, "_vehicle_ids", set())
+        monkeypatch.setattr(LocationTracker, "_vehicle_ids_loaded_at", None)
+        return rows
+
+    def test_ping_is_queued_without_insert(self, mock_db, queued):
+        """Test that a valid ping is queued and nothing is written inline."""
+        timestamp = datetime(2025, 1, 15, 10, 30)
+        before = LocationTracker.location_version(1)
+
+        result = LocationTracker(mock_db).enqueue_location(
+            vehicle_id=1, latitude=-33.45, longitude=-70.66,
+            speed_kmh=30.0, timestamp=timestamp
+        )
+
+        assert queued == [{
+            "vehicle_id": 1,
+            "location": point_ewkb(-70.66, -33.45),
+            "speed_kmh": 30.0,
+            "heading_degrees": None,
+            "accuracy_meters": None,
+            "timestamp": timestamp
+        }]
+        assert result["id"] is None
+        assert result["latitude"] == -33.45
+        assert result["timestamp"] == timestamp.isoformat()
+        # Not readable until merged, so cached ETAs must stay valid until then
+        assert LocationTracker.location_version(1) == before
+        mock_db.add.assert_not_called()
+        mock_db.commit.assert_not_called()
+
+    def test_point_is_encoded_as_ewkb(self):
+        """Test that pings are sent as hex EWKB carrying SRID 4326."""
+        element = WKBElement(point_ewkb(-70.66, -33.45), srid=4326, extended=True)
+
+        point = to_shape(element)
+        assert (point.x, point.y) == (-70.66, -33.45)
+        assert point_ewkb(-70.66, -33.45).startswith("0101000020e6100000")
+
+    def test_vehicle_ids_are_cached(self, mock_db, queued):
+        """Test that known vehicle IDs are loaded once for many pings."""
+        tracker = LocationTracker(mock_db)
+        for _ in range(3):
+            tracker.enqueue_location(vehicle_id=2, latitude=-33.45, longitude=-70.66)
+
+        assert len(queued) == 3
+        mock_db.scalars.assert_called_once()
+        mock_db.scalar.assert_not_called()
+
+    def test_unknown_vehicle_is_rejected(self, mock_db, queued):
+        """Test that a vehicle missing from the cache and the table raises."""
+        tracker = LocationTracker(mock_db)
+        tracker.enqueue_location(vehicle_id=1, latitude=-33.45, longitude=-70.66)
+
+        with pytest.raises(NotFoundError):
+            tracker.enqueue_location(vehicle_id=99, latitude=-33.45, longitude=-70.66)
+
+        mock_db.scalar.assert_called_once()
+        assert len(queued) == 1
+
+    def test_inline_insert_is_not_reloaded(self, mock_db, monkeypatch):
+        """Test that the inline path returns the flushed id without a refresh."""
+        monkeypatch.setattr(LocationTracker, "_vehicle_ids", {1})
+        monkeypatch.setattr(LocationTracker, "_vehicle_ids_loaded_at", time.monotonic())
+        mock_db.flush.side_effect = lambda: setattr(mock_db.add.call_args.args[0], "id", 42)
+        assert not location_log_writer.is_running
+
+        result = LocationTracker(mock_db).enqueue_location(vehicle_id=1, latitude=-33.45, longitude=-70.66)
+
+        assert result["id"] == 42
+        assert result["latitude"] == -33.45
+        mock_db.commit.assert_called_once()
+        mock_db.refresh.assert_not_called()
+
+    def test_far_future_ping_is_rejected(self, mock_db, queued):
+        """Test that pings beyond the pre-made partitions are not queued."""
+        timestamp = datetime.utcnow() + timedelta(days=LocationTracker.PARTITION_PREMAKE_DAYS + 1)
+
+        with pytest.raises(ValidationError, match="future"):
+            LocationTracker(mock_db).enqueue_location(
+                vehicle_id=1, latitude=-33.45, longitude=-70.66, timestamp=timestamp
+            )
+
+        assert queued == []
+
+    def test_utc_timestamp_is_stored_naive(self, mock_db, queued):
+        """Test that a posted "Z" timestamp is queued as naive UTC."""
+        location = LocationUpload(latitude=-33.45, longitude=-70.66, timestamp="2025-01-15T10:30:00Z")
+        assert location.timestamp.tzinfo is not None
+
+        result = LocationTracker(mock_db).enqueue_location(
+            vehicle_id=1, latitude=location.latitude, longitude=location.longitude,
+            timestamp=location.timestamp
+        )
+
+        assert queued[0]["timestamp"] == datetime(2025, 1, 15, 10, 30)
+        assert result["timestamp"] == "2025-01-15T10:30:00"
+
+    def test_offset_timestamp_is_converted_to_utc(self, mock_db, monkeypatch):
+        """Test that the inline insert stores an offset timestamp in UTC."""
+        monkeypatch.setattr(LocationTracker, "_vehicle_ids", {1})
+        monkeypatch.setattr(LocationTracker, "_vehicle_ids_loaded_at", time.monotonic())
+        timestamp = datetime(2025, 1, 15, 7, 30, tzinfo=timezone(timedelta(hours=-3)))
+
+        LocationTracker(mock_db).enqueue_location(
+            vehicle_id=1, latitude=-33.45, longitude=-70.66, timestamp=timestamp
+        )
+
+        assert mock_db.add.call_args.args[0].timestamp == datetime(2025, 1, 15, 10, 30)
+
+    def test_invalid_ping_is_rejected(self, mock_db, queued):
+        """Test that out-of-range readings are not queued."""
+        with pytest.raises(ValidationError):
+            LocationTracker(mock_db).enqueue_location(vehicle_id=1, latitude=91.0, longitude=-70.66)
+
+        assert queued == []
+
+
+class TestLocationAsDict:
+    """Unit tests for LocationLog serialization with a mocked session."""
+
+    def test_uses_loaded_coordinates(self):
+        """Test that coordinates come from the row without another query."""
+        mock_db = MagicMock()
+        location_log = LocationLog(id=7, vehicle_id=1, speed_kmh=12.0, timestamp=datetime(2025, 1, 15, 10, 30))
+        location_log.latitude = -33.45
+        location_log.longitude = -70.66
+
+        result = LocationTracker(mock_db).get_location_as_dict(location_log)
+
+        assert result["latitude"] == -33.45
+        assert result["longitude"] == -70.66
+        assert result["id"] == 7
+        mock_db.scalar.assert_not_called()
+        mock_db.execute.assert_not_called()
+
+
+class TestRecordLocationVehicleCheck:
+    """Unit tests for the cached vehicle check in record_location."""
+
+    @pytest.fixture(autouse=True)
+    def known_vehicles(self, monkeypatch):
+        """Start every test with vehicle 1 cached as known."""
+        monkeypatch.setattr(LocationTracker, "_vehicle_ids", {1})
+        monkeypatch.setattr(LocationTracker, "_vehicle_ids_loaded_at", time.monotonic())
+
+    def test_known_vehicle_is_not_fetched(self):
+        """Test that a cached vehicle ID skips the Vehicle query."""
+        mock_db = MagicMock()
+
+        location = LocationTracker(mock_db).record_location(vehicle_id=1, latitude=-33.45, longitude=-70.66)
+
+        mock_db.query.assert_not_called()
+        mock_db.scalar.assert_not_called()
+        mock_db.add.assert_called_once_with(location)
+        mock_db.commit.assert_called_once()
+        mock_db.refresh.assert_not_called()
+
+    def test_deleted_vehicle_is_forgotten(self):
+        """Test that deleting a vehicle removes it from the cached IDs."""
+        _forget_vehicle_id(None, None, Vehicle(id=1))
+
+        mock_db = MagicMock()
+        mock_db.scalar.return_value = None
+        with pytest.raises(NotFoundError):
+            LocationTracker(mock_db).record_location(vehicle_id=1, latitude=-33.45, longitude=-70.66)
+
+
+class TestValidateCoordinates:
+    """Unit tests for coordinate range validation."""
+
+    @pytest.mark.parametrize("latitude,longitude", [(90.0, 180.0), (-90.0, -180.0), (-33.45, -70.66)])
+    def test_valid(self, latitude, longitude):
+        """Test that in-range and boundary coordinates pass."""
+        LocationTracker(MagicMock())._validate_coordinates(latitude, longitude)
+
+    @pytest.mark.parametrize("latitude,longitude,field", [
+        (90.5, 0.0, "Latitude"),
+        (0.0, -180.5, "Longitude"),
+        (float("nan"), 0.0, "Latitude"),
+        (0.0, float("nan"), "Longitude"),
+    ])
+    def test_invalid(self, latitude, longitude, field):
+        """Test that out-of-range and NaN coordinates name the offending field."""
+        with pytest.raises(ValidationError, match=field):
+            LocationTracker(MagicMock())._validate_coordinates(latitude, longitude)
+
+
+class TestRecordLocationsBulk:
+    """Unit tests for vectorized trace imports with a mocked session."""
+
+    @pytest.fixture(autouse=True)
+    def known_vehicles(self, monkeypatch):
+        """Start every test with vehicle 1 cached as known."""
+        monkeypatch.setattr(LocationTracker, "_vehicle_ids", {1})
+        monkeypatch.setattr(LocationTracker, "_vehicle_ids_loaded_at", time.monotonic())
+
+    @pytest.fixture
+    def mock_db(self):
+        """Create a mock session whose COPY payloads are captured."""
+        db = MagicMock()
+        db.copied = []
+        cursor = db.connection.return_value.connection.cursor.return_value.__enter__.return_value
+        cursor.copy_expert.side_effect = lambda sql, buffer: db.copied.append(buffer.getvalue())
+        return db
+
+    def test_trace_is_copied_in_one_statement(self, mock_db):
+        """Test that every ping goes out in a single COPY."""
+        timestamps = [datetime(2025, 1, 15, 10, minute) for minute in range(3)]
+
+        count = LocationTracker(mock_db).record_locations_bulk(
+            1, [-33.45, -33.46, -33.47], [-70.66, -70.67, -70.68], timestamps,
+            speeds_kmh=[10.0, float("nan"), 30.0]
+        )
+
+        assert count == 3
+        rows = [line.split("\t") for line in mock_db.copied[0].splitlines()]
+        assert len(rows) == 3
+        assert rows[0][:3] == ["1", point_ewkb(-70.66, -33.45).upper(), "2025-01-15 10:00:00"]
+        assert rows[1][3] == "\\N"
+        assert rows[2][3] == "30.0"
+        mock_db.commit.assert_called_once()
+
+    def test_aware_timestamps_are_copied_as_utc(self, mock_db):
+        """Test that aware timestamps are validated and copied as naive UTC."""
+        timestamps = [datetime(2025, 1, 15, 10, minute, tzinfo=timezone.utc) for minute in range(2)]
+
+        LocationTracker(mock_db).record_locations_bulk(1, [-33.45, -33.46], [-70.66, -70.67], timestamps)
+
+        rows = [line.split("\t") for line in mock_db.copied[0].splitlines()]
+        assert [row[2] for row in rows] == ["2025-01-15 10:00:00", "2025-01-15 10:01:00"]
+
+    def test_invalid_rows_are_reported_together(self, mock_db):
+        """Test that all bad rows are listed and nothing is written."""
+        timestamps = [datetime(2025, 1, 15, 10, minute) for minute in range(4)]
+
+        with pytest.raises(ValidationError, match=r"\[1, 3\]"):
+            LocationTracker(mock_db).record_locations_bulk(
+                1, [-33.45, 91.0, -33.47, float("nan")], [-70.66] * 4, timestamps,
+                headings_degrees=[0.0, 90.0, 360.0, 10.0]
+            )
+
+        assert mock_db.copied == []
+        mock_db.commit.assert_not_called()
+
+
+class TestLocationPartitions:
+    """Unit tests for daily partition maintenance with a mocked session."""
+
+    @pytest.fixture
+    def mock_db(self):
+        """Create a mock session answering the catalog queries."""
+        mock_db = MagicMock()
+        mock_db.statements = []
+        today = datetime.utcnow().date()
+        partitions = [
+            f"location_logs_{today - timedelta(days=days):%Y%m%d}" for days in (100, 92, 90, 0, -1)
+        ] + ["location_logs_default"]
+
+        def execute(statement, *args):
+            sql = str(statement)
+            mock_db.statements.append(sql)
+            result = MagicMock()
+            if "pg_inherits" in sql:
+                result.scalars.return_value = iter(partitions)
+            elif "relkind" in sql:
+                result.scalar.return_value = True
+            elif "reltuples" in sql:
+                result.scalar.return_value = 5
+            else:
+                result.rowcount = 2
+            return result
+
+        mock_db.execute.side_effect = execute
+        return mock_db
+
+    def test_cleanup_drops_expired_partitions(self, mock_db):
+        """Test that whole expired days are dropped and the rest is deleted."""
+        today = datetime.utcnow().date()
+
+        deleted = LocationTracker(mock_db).cleanup_old_locations()
+
+        dropped = [sql for sql in mock_db.statements if sql.startswith("DROP TABLE")]
+        assert dropped == [
+            f'DROP TABLE IF EXISTS "location_logs_{today - timedelta(days=days):%Y%m%d}"'
+            for days in (100, 92)
+        ]
+        assert mock_db.statements[-1].startswith("DELETE FROM location_logs")
+        assert deleted == 5 + 5 + 2
+        mock_db.commit.assert_called_once()
+
+    def test_ensure_partitions_creates_missing_days(self, mock_db):
+        """Test that only the missing upcoming days are created."""
+        created = LocationTracker(mock_db).ensure_partitions(days_ahead=3)
+
+        day = datetime.utcnow().date() + timedelta(days=2)
+        created_sql = [sql for sql in mock_db.statements if sql.startswith("CREATE TABLE")]
+        assert created == 2
+        assert created_sql[0] == (
+            f'CREATE TABLE IF NOT EXISTS "location_logs_{day:%Y%m%d}" PARTITION OF location_logs '
+            f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+        )
+        mock_db.commit.assert_called_once()
+
+    def test_ensure_partitions_skips_unpartitioned_table(self):
+        """Test that nothing is created when location_logs is a plain table."""
+        mock_db = MagicMock()
+        mock_db.execute.return_value.scalar.return_value = False
+
+        assert LocationTracker(mock_db).ensure_partitions() == 0
+        mock_db.commit.assert_not_called()
+
+    def test_failed_day_does_not_undo_others(self, mock_db, caplog):
+        """Test that a day blocked by rows in the default partition is skipped alone."""
+        blocked_day = datetime.utcnow().date() + timedelta(days=2)
+        blocked = f"location_logs_{blocked_day:%Y%m%d}"
+        execute = mock_db.execute.side_effect
+
+        def execute_or_fail(statement, *args):
+            if blocked in str(statement):
+                raise Exception("updated partition constraint for default partition would be violated")
+            return execute(statement, *args)
+
+        mock_db.execute.side_effect = execute_or_fail
+
+        created = LocationTracker(mock_db).ensure_partitions(days_ahead=3)
+
+        assert created == 1
+        assert mock_db.begin_nested.call_count == 2
+        assert blocked_day.isoformat() in caplog.text
+        mock_db.commit.assert_called_once()
+
+    def test_cleanup_runs_when_creation_fails(self, monkeypatch):
+        """Test that retention is applied even if partitions cannot be created."""
+        cleaned = []
+        session = MagicMock()
+        monkeypatch.setattr(LocationTracker, "ensure_partitions", MagicMock(side_effect=Exception("db down")))
+        monkeypatch.setattr(LocationTracker, "cleanup_old_locations", lambda self: cleaned.append(self) or 0)
+
+        maintain_location_partitions(session_factory=lambda: session)
+
+        assert len(cleaned) == 1
+        session.rollback.assert_called_once()
+        session.close.assert_called_once()
+
+    def test_bulk_far_future_rows_are_rejected(self, monkeypatch):
+        """Test that imported pings beyond the pre-made partitions are reported."""
+        monkeypatch.setattr(LocationTracker, "_vehicle_ids", {1})
+        monkeypatch.setattr(LocationTracker, "_vehicle_ids_loaded_at", time.monotonic())
+        now = datetime.utcnow()
+        timestamps = [now, now + timedelta(days=LocationTracker.PARTITION_PREMAKE_DAYS + 1)]
+
+        with pytest.raises(ValidationError, match=r"\[1\]"):
+            LocationTracker(MagicMock()).record_locations_bulk(1, [-33.45] * 2, [-70.66] * 2, timestamps)
+
+
+class TestNearbyVehiclesQuery:
+    """Unit tests for the SQL built by get_nearby_vehicles."""
+
+    def test_outer_query_is_bounded_by_cutoff(self, monkeypatch):
+        """Test that the outer query can be pruned to recent partitions."""
+        statements = []
+        monkeypatch.setattr(Query, "all", lambda self: statements.append(self.statement) or [])
+        mock_db = MagicMock()
+        mock_db.query.side_effect = lambda *entities: Query(entities)
+
+        assert LocationTracker(mock_db).get_nearby_vehicles(-33.45, -70.66) == []
+
+        sql = str(statements[0].compile(dialect=postgresql.dialect()))
+        outer = sql[sql.rindex(") AS anon_1"):]
+        assert "location_logs.id = anon_1.id AND location_logs.timestamp = anon_1.timestamp" in outer
+        assert "location_logs.timestamp >= " in outer
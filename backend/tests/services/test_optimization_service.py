@@ -0,0 +1,34 @@
+"""
+Unit tests for the optimization service database queries.
+"""
+from datetime import datetime
+
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy.dialects import postgresql
+
+from app.services.optimization.service import OptimizationService
+
+
+class TestCoordinateQueries:
+    """Tests for the coordinates selected alongside cases, vehicles and personnel."""
+
+    @pytest.mark.asyncio
+    async def test_geography_columns_are_cast_to_geometry(self):
+        """Test that ST_X/ST_Y only ever receive geometry, never geography."""
+        db = MagicMock()
+        # Cases and personnel are queried with options(), vehicles without
+        db.query.return_value.options.return_value.filter.return_value.all.side_effect = [
+            [(MagicMock(id=1), -33.45, -70.66)],
+            []
+        ]
+        db.query.return_value.filter.return_value.all.return_value = [(MagicMock(id=2), -33.44, -70.65)]
+
+        result = await OptimizationService(db).optimize_routes([1], [2], datetime(2025, 1, 15))
+
+        assert result.message == "No personnel available"
+        assert db.query.call_count == 3
+        for call in db.query.call_args_list:
+            for expression in call.args[1:]:
+                sql = str(expression.compile(dialect=postgresql.dialect()))
+                assert "AS geometry(POINT,4326))" in sql, sql
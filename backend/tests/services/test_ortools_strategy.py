@@ -2,6 +2,7 @@
 Unit tests for OR-Tools VRP optimization strategy
 """
 import pytest
+import numpy as np
 from datetime import datetime, time
 from app.services.optimization.ortools_strategy import ORToolsVRPStrategy
 from app.services.optimization.models import (
@@ -157,6 +158,45 @@ class TestORToolsVRPStrategy:
         assert len(strategy.distance_matrix) > 0
         assert len(strategy.time_matrix) > 0
 
+    def test_build_matrices_with_array_matrices(
+        self,
+        sample_cases,
+        sample_vehicle,
+        sample_personnel_list,
+        simple_distance_matrix,
+        simple_time_matrix
+    ):
+        """Test that NumPy matrices produce the same result as dict matrices"""
+        size = len(sample_cases) + 1
+        distance_array = np.zeros((size, size))
+        time_array = np.zeros((size, size), dtype=np.int32)
+        for (i, j), value in simple_distance_matrix.items():
+            distance_array[i, j] = value
+        for (i, j), value in simple_time_matrix.items():
+            time_array[i, j] = value
+
+        strategies = []
+        for distance_matrix, time_matrix in (
+            (simple_distance_matrix, simple_time_matrix),
+            (distance_array, time_array),
+        ):
+            request = OptimizationRequest(
+                cases=sample_cases,
+                vehicles=[sample_vehicle],
+                personnel=sample_personnel_list,
+                date=datetime(2025, 11, 15),
+                distance_matrix=distance_matrix,
+                time_matrix=time_matrix
+            )
+            strategy = ORToolsVRPStrategy()
+            strategy.request = request
+            strategy._build_data_model()
+            strategies.append(strategy)
+
+        from_dict, from_array = strategies
+        np.testing.assert_array_equal(from_dict.distance_matrix, from_array.distance_matrix)
+        np.testing.assert_array_equal(from_dict.time_matrix, from_array.time_matrix)
+
     def test_build_matrices_without_provided_matrices(
         self,
         sample_case_nurse,
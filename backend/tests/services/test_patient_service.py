@@ -0,0 +1,112 @@
+"""
+Unit tests for bulk patient creation, updates and deletes.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.exceptions import NotFoundException
+from app.schemas.patient import PatientCreate, PatientUpdate
+from app.services.geocoding.base_geocoder import GeocodingResult
+from app.services.geocoding.geocoding_service import GeocodingService
+from app.services.patient_service import PatientService
+
+
+class TestCreatePatientsBulk:
+    """Tests for PatientService.create_patients_bulk with mocked geocoding."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a patient service with an empty cache and mocked provider."""
+        service = PatientService(MagicMock())
+        # Replace the shared singleton so mocks do not leak between tests
+        service.geocoding_service = GeocodingService(api_key="test-key")
+        service.geocoding_cache = MagicMock()
+        service.geocoding_cache.get.return_value = None
+        service.audit_service = MagicMock()
+        service.patient_repo.bulk_create = MagicMock(side_effect=lambda rows: list(range(1, len(rows) + 1)))
+        return service
+
+    @pytest.mark.asyncio
+    async def test_duplicate_addresses_geocoded_once(self, service):
+        """Test that spelling variants of one address share a single provider call."""
+        async def geocode_addresses(addresses, country):
+            return [
+                GeocodingResult(latitude=-33.4, longitude=-70.6, formatted_address=address)
+                for address in addresses
+            ]
+
+        service.geocoding_service.geocode_addresses = AsyncMock(side_effect=geocode_addresses)
+
+        ids, failed = await service.create_patients_bulk([
+            PatientCreate(name="Ana", address="Av. Providencia 1234, Santiago"),
+            PatientCreate(name="Luis", address="av. providencia  1234, santiago"),
+            PatientCreate(name="Rosa", address="Calle Ñuble 55, Santiago"),
+        ])
+
+        assert ids == [1, 2, 3]
+        assert failed == []
+        service.geocoding_service.geocode_addresses.assert_awaited_once_with(
+            ["Av. Providencia 1234, Santiago", "Calle Ñuble 55, Santiago"],
+            country="CL"
+        )
+        assert service.geocoding_cache.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_address_fans_out(self, service):
+        """Test that every patient sharing an ungeocodable address is reported."""
+        service.geocoding_service.geocode_addresses = AsyncMock(return_value=[None])
+        patients = [
+            PatientCreate(name="Ana", address="Dirección inexistente 1"),
+            PatientCreate(name="Luis", address="DIRECCIÓN INEXISTENTE 1"),
+        ]
+
+        ids, failed = await service.create_patients_bulk(patients)
+
+        assert ids == []
+        assert failed == patients
+
+
+class TestUpdatePatient:
+    """Tests for PatientService update and delete round trips."""
+
+    @pytest.mark.asyncio
+    async def test_empty_update_skips_write_and_audit(self):
+        """Test that an update with no writable fields returns the patient as is."""
+        service = PatientService(MagicMock())
+        patient = MagicMock()
+        service.get_patient = MagicMock(return_value=patient)
+        service.patient_repo.update = MagicMock()
+        service.audit_service = MagicMock()
+
+        result = await service.update_patient(1, PatientUpdate())
+
+        assert result is patient
+        service.patient_repo.update.assert_not_called()
+        service.audit_service.log_update.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_update_uses_returning_for_existence(self):
+        """Test that a missing patient is detected from the UPDATE itself."""
+        service = PatientService(MagicMock())
+        service.get_patient = MagicMock()
+        service.patient_repo.update = MagicMock(return_value=None)
+        service.audit_service = MagicMock()
+
+        with pytest.raises(NotFoundException):
+            await service.update_patient(1, PatientUpdate(name="Ana"))
+
+        service.get_patient.assert_not_called()
+        service.audit_service.log_update.assert_not_called()
+
+    def test_delete_missing_patient(self):
+        """Test that deleting a missing patient raises without a prior SELECT."""
+        service = PatientService(MagicMock())
+        service.get_patient = MagicMock()
+        service.patient_repo.delete = MagicMock(return_value=False)
+        service.audit_service = MagicMock()
+
+        with pytest.raises(NotFoundException):
+            service.delete_patient(1)
+
+        service.get_patient.assert_not_called()
+        service.audit_service.log_delete.assert_not_called()
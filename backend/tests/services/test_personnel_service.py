@@ -0,0 +1,73 @@
+"""
+Unit tests for bulk personnel creation.
+"""
+import pytest
+from datetime import time
+from unittest.mock import MagicMock
+
+from app.core.exceptions import ValidationException
+from app.schemas.personnel import PersonnelCreate
+from app.services.personnel_service import PersonnelService
+
+
+def make_personnel(name: str, skill_ids):
+    """Build personnel creation data."""
+    return PersonnelCreate(
+        name=name,
+        skill_ids=skill_ids,
+        work_hours_start=time(8, 0),
+        work_hours_end=time(17, 0)
+    )
+
+
+class TestCreatePersonnelBulk:
+    """Tests for PersonnelService.create_personnel_bulk with a mocked session."""
+
+    @pytest.fixture
+    def mock_db(self):
+        """Create a mock database session returning generated IDs."""
+        db = MagicMock()
+        db.scalars.return_value.all.return_value = [10, 11]
+        return db
+
+    @pytest.fixture
+    def service(self, mock_db):
+        """Create a personnel service with mocked skill lookups."""
+        service = PersonnelService(mock_db)
+        service.skill_service.get_skills_by_ids = MagicMock(
+            side_effect=lambda ids: [MagicMock(id=skill_id) for skill_id in ids]
+        )
+        service.audit_service = MagicMock()
+        return service
+
+    def test_single_insert_per_table(self, service, mock_db):
+        """Test that personnel and skills are inserted with one statement each."""
+        ids = service.create_personnel_bulk([
+            make_personnel("Ana", [1, 2, 2]),
+            make_personnel("Luis", [2])
+        ], user_id=7)
+
+        assert ids == [10, 11]
+        personnel_rows = mock_db.scalars.call_args.args[1]
+        assert [row["name"] for row in personnel_rows] == ["Ana", "Luis"]
+        assert personnel_rows[0]["work_start_time"] == time(8, 0)
+        assert "skill_ids" not in personnel_rows[0]
+
+        skill_rows = mock_db.execute.call_args.args[1]
+        assert skill_rows == [
+            {"personnel_id": 10, "skill_id": 1},
+            {"personnel_id": 10, "skill_id": 2},
+            {"personnel_id": 11, "skill_id": 2}
+        ]
+        service.skill_service.get_skills_by_ids.assert_called_once()
+        mock_db.commit.assert_called_once()
+        service.audit_service.log_create_bulk.assert_called_once_with("personnel", [10, 11], 7)
+
+    def test_invalid_skill_rejects_whole_batch(self, service, mock_db):
+        """Test that an unknown skill ID fails before anything is inserted."""
+        service.skill_service.get_skills_by_ids = MagicMock(return_value=[MagicMock(id=1)])
+
+        with pytest.raises(ValidationException):
+            service.create_personnel_bulk([make_personnel("Ana", [1, 99])])
+
+        mock_db.scalars.assert_not_called()
@@ -3,9 +3,10 @@ Tests for Route Tracker Service
 """
 import pytest
 from datetime import datetime, date
+from unittest.mock import MagicMock
 from sqlalchemy.orm import Session
 
-from app.services.tracking.route_tracker import RouteTrackerService
+from app.services.tracking.route_tracker import RouteTrackerService, _forget_active_route
 from app.models.route import Route, Visit, RouteStatus, VisitStatus
 from app.models.case import CaseStatus
 from app.core.exceptions import NotFoundError, ValidationError
@@ -216,6 +217,23 @@ def test_route_completion_detection(db: Session, test_active_route: Route):
     assert test_active_route.status == RouteStatus.COMPLETED
 
 
+def test_route_completion_without_autoflush(db: Session, test_active_route: Route):
+    """Test route completion with the production autoflush=False session setting"""
+    db.autoflush = False
+    tracker = RouteTrackerService(db)
+
+    test_active_route.status = RouteStatus.IN_PROGRESS
+    for visit in test_active_route.visits:
+        visit.status = VisitStatus.IN_PROGRESS
+    db.commit()
+
+    for visit in test_active_route.visits:
+        tracker.update_visit_status(visit.id, VisitStatus.COMPLETED)
+
+    db.refresh(test_active_route)
+    assert test_active_route.status == RouteStatus.COMPLETED
+
+
 def test_cancel_route(db: Session, test_active_route: Route):
     """Test cancelling a route"""
     tracker = RouteTrackerService(db)
@@ -267,3 +285,205 @@ def test_route_status_updates_to_in_progress(db: Session, test_active_route: Rou
         # Route should now be IN_PROGRESS
         db.refresh(test_active_route)
         assert test_active_route.status == RouteStatus.IN_PROGRESS
+
+
+class TestRouteProgressCounts:
+    """Unit tests for get_route_progress with a mocked session."""
+
+    def _tracker(self, rows):
+        db = MagicMock()
+        db.query.return_value.filter.return_value.group_by.return_value.all.return_value = rows
+        return RouteTrackerService(db), db
+
+    def test_counts_come_from_grouped_query(self):
+        """Test that progress is built from per-status counts."""
+        tracker, db = self._tracker([
+            (VisitStatus.COMPLETED, 3),
+            (VisitStatus.IN_PROGRESS, 1),
+            (VisitStatus.PENDING, 4),
+        ])
+
+        progress = tracker.get_route_progress(5)
+
+        assert progress["total_visits"] == 8
+        assert progress["completed"] == 3
+        assert progress["in_progress"] == 1
+        assert progress["failed"] == 0
+        assert progress["pending"] == 4
+        assert progress["completion_percentage"] == 37.5
+        db.query.assert_called_once()
+
+    def test_missing_route_raises(self):
+        """Test that a route without visits is checked for existence."""
+        tracker, db = self._tracker([])
+        db.query.return_value.filter.return_value.first.return_value = None
+
+        with pytest.raises(NotFoundError):
+            tracker.get_route_progress(99999)
+
+
+class TestVisitStatusCounts:
+    """Unit tests for get_visit_status_counts with a mocked session."""
+
+    def test_counts_are_grouped_per_route(self):
+        """Test that one grouped query yields counts for every route."""
+        db = MagicMock()
+        db.query.return_value.filter.return_value.group_by.return_value.all.return_value = [
+            (1, VisitStatus.COMPLETED, 2),
+            (1, VisitStatus.PENDING, 3),
+            (2, VisitStatus.PENDING, 1),
+        ]
+
+        counts = RouteTrackerService(db).get_visit_status_counts(route_id for route_id in (1, 2, 3))
+
+        assert counts == {
+            1: {VisitStatus.COMPLETED: 2, VisitStatus.PENDING: 3},
+            2: {VisitStatus.PENDING: 1},
+        }
+        db.query.assert_called_once()
+
+    def test_no_routes_skips_query(self):
+        """Test that an empty route list issues no query."""
+        db = MagicMock()
+
+        assert RouteTrackerService(db).get_visit_status_counts([]) == {}
+        db.query.assert_not_called()
+
+
+class TestUpdateVisitStatusTransaction:
+    """Unit tests for the update_visit_status commit pattern."""
+
+    def test_single_commit(self):
+        """Test that visit, case and route changes share one commit."""
+        db = MagicMock()
+        route = Route(id=1, status=RouteStatus.ACTIVE)
+        visit = Visit(id=2, route_id=1, status=VisitStatus.PENDING)
+        visit.case = MagicMock()
+        visit.route = route
+        route.visits = [visit]
+        db.query.return_value.options.return_value.filter.return_value.first.return_value = visit
+
+        RouteTrackerService(db).update_visit_status(2, VisitStatus.EN_ROUTE)
+
+        assert visit.case.status == CaseStatus.IN_PROGRESS
+        assert route.status == RouteStatus.IN_PROGRESS
+        db.query.assert_called_once_with(Visit)
+        db.commit.assert_called_once()
+        db.refresh.assert_called_once_with(visit)
+
+    def test_route_completes_from_loaded_route(self):
+        """Test that the eager-loaded route completes when no open visit exists."""
+        db = MagicMock()
+        route = Route(id=1, status=RouteStatus.IN_PROGRESS)
+        visit = Visit(id=2, route_id=1, status=VisitStatus.IN_PROGRESS)
+        visit.case = MagicMock()
+        visit.route = route
+        db.query.return_value.options.return_value.filter.return_value.first.return_value = visit
+        db.query.return_value.scalar.return_value = False
+
+        RouteTrackerService(db).update_visit_status(2, VisitStatus.COMPLETED)
+
+        assert route.status == RouteStatus.COMPLETED
+        assert db.query.call_args_list[1].args == (Visit,)
+        db.commit.assert_called_once()
+
+    def test_route_stays_open_with_pending_visits(self):
+        """Test that the route is left in progress while an open visit exists."""
+        db = MagicMock()
+        route = Route(id=1, status=RouteStatus.IN_PROGRESS)
+        visit = Visit(id=2, route_id=1, status=VisitStatus.IN_PROGRESS)
+        visit.case = MagicMock()
+        visit.route = route
+        db.query.return_value.options.return_value.filter.return_value.first.return_value = visit
+        db.query.return_value.scalar.return_value = True
+
+        RouteTrackerService(db).update_visit_status(2, VisitStatus.COMPLETED)
+
+        assert route.status == RouteStatus.IN_PROGRESS
+
+    def test_status_change_flushed_before_probe(self):
+        """Test that the new visit status is flushed before the open-visit probe."""
+        db = MagicMock()
+        route = Route(id=1, status=RouteStatus.IN_PROGRESS)
+        visit = Visit(id=2, route_id=1, status=VisitStatus.IN_PROGRESS)
+        visit.case = MagicMock()
+        visit.route = route
+        db.query.return_value.options.return_value.filter.return_value.first.return_value = visit
+        db.query.return_value.scalar.return_value = False
+
+        RouteTrackerService(db).update_visit_status(2, VisitStatus.COMPLETED)
+
+        calls = [name for name, _, _ in db.mock_calls if name in ("flush", "query().scalar")]
+        assert calls == ["flush", "query().scalar"]
+
+
+class TestCancelRouteBulkUpdate:
+    """Unit tests for cancel_route with a mocked session."""
+
+    def test_open_visits_cancelled_in_one_update(self):
+        """Test that open visits are cancelled with a single UPDATE."""
+        db = MagicMock()
+        route = Route(id=1, status=RouteStatus.IN_PROGRESS)
+        db.query.return_value.filter.return_value.first.return_value = route
+
+        RouteTrackerService(db).cancel_route(1, reason="vehicle breakdown")
+
+        values = db.query.return_value.filter.return_value.update.call_args.args[0]
+        assert values[Visit.status] == VisitStatus.CANCELLED
+        assert values[Visit.notes] == "Route cancelled: vehicle breakdown"
+        assert route.status == RouteStatus.CANCELLED
+        db.commit.assert_called_once()
+
+
+class TestActiveRouteCache:
+    """Unit tests for the cached active route lookup."""
+
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        """Start and end every test with an empty cache."""
+        RouteTrackerService._active_route_ids.clear()
+        yield
+        RouteTrackerService._active_route_ids.clear()
+
+    def test_vehicle_without_route_is_cached(self):
+        """Test that a miss is remembered so the next lookup runs no query."""
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = None
+        tracker = RouteTrackerService(db)
+
+        assert tracker.get_active_route_for_vehicle(3) is None
+        assert tracker.get_active_route_for_vehicle(3) is None
+
+        db.query.assert_called_once()
+
+    def test_cached_route_is_loaded_by_primary_key(self):
+        """Test that a hit loads the route by id instead of filtering."""
+        route = Route(id=7, vehicle_id=3, status=RouteStatus.ACTIVE)
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = route
+        db.get.return_value = route
+        tracker = RouteTrackerService(db)
+
+        tracker.get_active_route_for_vehicle(3)
+        assert tracker.get_active_route_for_vehicle(3) is route
+
+        db.query.assert_called_once()
+        db.get.assert_called_once_with(Route, 7)
+
+    def test_route_that_stopped_being_active_is_requeried(self):
+        """Test that a cached route no longer active falls back to the query."""
+        db = MagicMock()
+        db.get.return_value = Route(id=7, vehicle_id=3, status=RouteStatus.COMPLETED)
+        db.query.return_value.filter.return_value.first.return_value = None
+        RouteTrackerService._active_route_ids[3] = 7
+
+        assert RouteTrackerService(db).get_active_route_for_vehicle(3) is None
+        db.query.assert_called_once()
+
+    def test_route_write_evicts_vehicle(self):
+        """Test that the mapper hook evicts the written route's vehicle."""
+        RouteTrackerService._active_route_ids[3] = None
+
+        _forget_active_route(None, None, Route(id=7, vehicle_id=3, status=RouteStatus.ACTIVE))
+
+        assert 3 not in RouteTrackerService._active_route_ids
@@ -0,0 +1,77 @@
+"""
+Unit tests for skill creation and updates.
+"""
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy.exc import IntegrityError
+
+from app.core.exceptions import ConflictException, NotFoundException
+from app.schemas.skill import SkillCreate, SkillUpdate
+from app.services.skill_service import SkillService
+
+
+def integrity_error(message: str) -> IntegrityError:
+    """Build an IntegrityError as raised by the driver."""
+    return IntegrityError("INSERT INTO skills ...", {}, Exception(message))
+
+
+class TestSkillService:
+    """Tests for SkillService relying on the unique constraint on skills.name."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a skill service with a mocked session and audit log."""
+        service = SkillService(MagicMock())
+        service.audit_service = MagicMock()
+        return service
+
+    def test_create_does_not_query_by_name(self, service):
+        """Test that the happy path is a single INSERT."""
+        service.skill_repo.get_by_name = MagicMock()
+        service.skill_repo.create = MagicMock(return_value=MagicMock(id=3))
+
+        skill = service.create_skill(SkillCreate(name="Curaciones"))
+
+        assert skill.id == 3
+        service.skill_repo.get_by_name.assert_not_called()
+        service.audit_service.log_create.assert_called_once_with("skill", 3, None)
+
+    def test_create_duplicate_name_conflicts(self, service):
+        """Test that a unique violation becomes a ConflictException."""
+        service.skill_repo.create = MagicMock(side_effect=integrity_error(
+            'duplicate key value violates unique constraint "skills_name_key"'
+        ))
+
+        with pytest.raises(ConflictException):
+            service.create_skill(SkillCreate(name="Curaciones"))
+
+        service.db.rollback.assert_called_once()
+        service.audit_service.log_create.assert_not_called()
+
+    def test_create_other_integrity_errors_propagate(self, service):
+        """Test that non-unique integrity errors are not reported as conflicts."""
+        service.skill_repo.create = MagicMock(side_effect=integrity_error(
+            'null value in column "name" violates not-null constraint'
+        ))
+
+        with pytest.raises(IntegrityError):
+            service.create_skill(SkillCreate(name="Curaciones"))
+
+    def test_update_missing_skill(self, service):
+        """Test that a missing skill is detected from the UPDATE itself."""
+        service.skill_repo.get_by_id = MagicMock()
+        service.skill_repo.update = MagicMock(return_value=None)
+
+        with pytest.raises(NotFoundException):
+            service.update_skill(9, SkillUpdate(name="Curaciones"))
+
+        service.skill_repo.get_by_id.assert_not_called()
+
+    def test_update_duplicate_name_conflicts(self, service):
+        """Test that renaming onto an existing name becomes a ConflictException."""
+        service.skill_repo.update = MagicMock(side_effect=integrity_error(
+            'duplicate key value violates unique constraint "skills_name_key"'
+        ))
+
+        with pytest.raises(ConflictException):
+            service.update_skill(9, SkillUpdate(name="Curaciones"))
@@ -0,0 +1,131 @@
+"""
+Unit tests for WebSocket broadcasts.
+"""
+import asyncio
+
+import orjson
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.tracking import websocket_manager
+from app.services.tracking.websocket_manager import ConnectionManager, _utc_timestamp
+
+
+def _connect(manager: ConnectionManager, connection_id: str, websocket: AsyncMock, vehicle_id: int = 1) -> None:
+    """Register a connection subscribed to a vehicle without the handshake."""
+    manager.active_connections[connection_id] = websocket
+    manager.vehicle_subscriptions[vehicle_id].add(connection_id)
+    manager.subscriptions[connection_id]["vehicles"].add(vehicle_id)
+
+
+class TestUtcTimestamp:
+    """Tests for the coarse cached message timestamp."""
+
+    def test_reused_within_resolution(self, monkeypatch):
+        """Test that the formatted timestamp is reused inside the window."""
+        monkeypatch.setattr(websocket_manager, "TIMESTAMP_RESOLUTION_SECONDS", 60.0)
+        monkeypatch.setattr(websocket_manager, "_timestamp_cache", (float("-inf"), ""))
+
+        first = _utc_timestamp()
+
+        assert first
+        assert _utc_timestamp() is first
+
+    def test_reformatted_after_resolution(self, monkeypatch):
+        """Test that a stale timestamp is formatted again."""
+        monkeypatch.setattr(websocket_manager, "_timestamp_cache", (float("-inf"), "stale"))
+
+        assert _utc_timestamp() != "stale"
+
+
+class TestBroadcast:
+    """Tests for concurrent fan-out to subscribers."""
+
+    @pytest.mark.asyncio
+    async def test_sends_to_all_subscribers(self):
+        """Test that every subscriber receives the message."""
+        manager = ConnectionManager()
+        sockets = {f"c{i}": AsyncMock() for i in range(3)}
+        for connection_id, websocket in sockets.items():
+            _connect(manager, connection_id, websocket)
+
+        await manager.broadcast_location_update(1, {"latitude": -33.45})
+
+        for websocket in sockets.values():
+            message = orjson.loads(websocket.send_text.call_args.args[0])
+            assert message["type"] == "location_update"
+            assert message["data"] == {"latitude": -33.45}
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_does_not_block_others(self):
+        """Test that sends run concurrently rather than one after another."""
+        manager = ConnectionManager()
+        release = asyncio.Event()
+        sent = []
+
+        async def slow_send(payload):
+            await release.wait()
+
+        async def fast_send(payload):
+            sent.append(payload)
+            release.set()
+
+        _connect(manager, "slow", AsyncMock(send_text=AsyncMock(side_effect=slow_send)))
+        _connect(manager, "fast", AsyncMock(send_text=AsyncMock(side_effect=fast_send)))
+
+        await asyncio.wait_for(manager.broadcast_location_update(1, {}), timeout=1)
+
+        assert len(sent) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_and_stale_connections_are_dropped(self):
+        """Test that failing sends and missing sockets are disconnected."""
+        manager = ConnectionManager()
+        _connect(manager, "ok", AsyncMock())
+        _connect(manager, "broken", AsyncMock(send_text=AsyncMock(side_effect=RuntimeError("closed"))))
+        _connect(manager, "stale", AsyncMock())
+        del manager.active_connections["stale"]
+
+        await manager.broadcast_location_update(1, {})
+
+        assert manager.vehicle_subscriptions[1] == {"ok"}
+        assert "broken" not in manager.active_connections
+
+    @pytest.mark.asyncio
+    async def test_ping_all(self):
+        """Test that pings reach every active connection."""
+        manager = ConnectionManager()
+        sockets = [AsyncMock(), AsyncMock()]
+        manager.active_connections.update({"a": sockets[0], "b": sockets[1]})
+
+        await manager.ping_all()
+
+        for websocket in sockets:
+            assert orjson.loads(websocket.send_text.call_args.args[0])["type"] == "ping"
+
+    @pytest.mark.asyncio
+    async def test_message_is_encoded_once(self):
+        """Test that one encoded payload is shared by all subscribers."""
+        manager = ConnectionManager()
+        sockets = [AsyncMock() for _ in range(3)]
+        for index, websocket in enumerate(sockets):
+            _connect(manager, f"c{index}", websocket)
+
+        with patch("app.services.tracking.websocket_manager.orjson.dumps", wraps=orjson.dumps) as dumps:
+            await manager.broadcast_location_update(1, {})
+
+        dumps.assert_called_once()
+        payloads = {websocket.send_text.call_args.args[0] for websocket in sockets}
+        assert len(payloads) == 1
+
+    @pytest.mark.asyncio
+    async def test_no_subscribers_skips_encoding(self):
+        """Test that a broadcast without subscribers builds no payload."""
+        manager = ConnectionManager()
+
+        with patch("app.services.tracking.websocket_manager.orjson.dumps") as dumps:
+            await manager.broadcast_location_update(1, {})
+            await manager.broadcast_delay_alert(2, {})
+
+        dumps.assert_not_called()
+        assert 1 not in manager.vehicle_subscriptions
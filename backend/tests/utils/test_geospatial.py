@@ -5,6 +5,7 @@ import pytest
 from app.utils.geospatial import (
     validate_coordinates,
     create_point,
+    point_ewkt,
     calculate_bounding_box,
     format_coordinates_for_display,
     parse_coordinates,
@@ -81,6 +82,22 @@ class TestCreatePoint:
         assert point.srid == 3857
 
 
+class TestPointEwkt:
+    """Tests for formatting points as EWKT strings."""
+
+    def test_point_ewkt_lon_lat_order(self):
+        """Test that longitude comes first and the SRID prefix is included."""
+        assert point_ewkt(-33.45, -70.65) == "SRID=4326;POINT(-70.65 -33.45)"
+
+    def test_point_ewkt_matches_create_point_binding(self):
+        """Test that the string binds like the equivalent WKTElement."""
+        from sqlalchemy.dialects import postgresql
+        from geoalchemy2 import Geography
+
+        process = Geography(geometry_type="POINT", srid=4326).bind_processor(postgresql.dialect())
+        assert process(point_ewkt(45.0, -122.0)) == process(create_point(45.0, -122.0))
+
+
 class TestBoundingBox:
     """Tests for bounding box calculation."""
 
@@ -0,0 +1,75 @@
+"""
+Unit tests for the bounded TTL cache.
+"""
+import pytest
+
+from app.utils import ttl_cache
+from app.utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+    """Controllable replacement for time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Patch the cache clock."""
+    clock = FakeClock()
+    monkeypatch.setattr(ttl_cache.time, "monotonic", clock)
+    return clock
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    def test_entries_expire(self, clock):
+        """Test that entries disappear after the TTL."""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache["a"] = 1
+
+        clock.now += 59
+        assert cache["a"] == 1
+        assert "a" in cache
+
+        clock.now += 1
+        assert "a" not in cache
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self, clock):
+        """Test that the size bound evicts the least recently used entry."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache["a"] = 1
+        cache["b"] = 2
+        assert cache["a"] == 1
+
+        cache["c"] = 3
+
+        assert set(cache) == {"a", "c"}
+
+    def test_overwrite_refreshes_expiry(self, clock):
+        """Test that setting a key again restarts its TTL."""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache["a"] = 1
+        clock.now += 50
+        cache["a"] = 2
+        clock.now += 50
+
+        assert cache["a"] == 2
+
+    def test_pop_and_clear(self, clock):
+        """Test the mapping helpers used for invalidation."""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache["a"] = 1
+        cache["b"] = 2
+
+        assert cache.pop("a") == 1
+        assert cache.pop("missing", None) is None
+        cache.clear()
+        assert len(cache) == 0